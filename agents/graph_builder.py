@@ -1,7 +1,27 @@
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
+import uuid
+from itertools import islice
 from services.graph_service import graphdb, CYAN, GREEN, YELLOW, RED, RESET
+from services.cypher_templates import (
+    node_key, uniqueness_constraint, heuristic_node_query, heuristic_relationship_query, warm_templates,
+    is_text_source, wrap_in_transactions, with_row_count, load_csv_to_unwind, streamed_node_query,
+    streamed_relationship_query, file_import_query, stale_nodes_query, stale_relationships_query,
+    create_nodes_query, create_relationships_query, range_index, AWAIT_INDEXES, is_split_rule,
+    SPLIT_COLUMN, SPLIT_DELIMITER
+)
+from core.build_plan import build_import_dag, group_rules_by_file, match_key_indexes, run_import_dag
+from core.csv_stream import TransformedRows, iter_csv_rows, prefetch_rows
+from core.fast_load import fast_load_labels, node_rows, relationship_rows, seen_key
+from core.side_tables import normalize_column, prune_side_tables, side_table_dir
+from core.llm_query_cache import LLMQueryCache
+from core.query_audit import audit_plan
+from core.build_report import build_report, diff_reports, load_previous_report, render_report, save_report
+from core.build_manifest import BuildManifest, file_fingerprint, plan_delta, rule_fingerprint, rule_id
+from core.build_checkpoint import BuildCheckpoint
 from agents.schema_agent import BaseAgent
 
 class GraphBuilderAgent(BaseAgent):
@@ -10,15 +30,75 @@ class GraphBuilderAgent(BaseAgent):
     based on the Construction Plan.
     Now supports Interactive Mode (Heuristic vs LLM).
     """
-    def __init__(self, api_key=None, verbose=True, context=None):
+    # Longest wait for new indexes to populate before imports start
+    INDEX_WAIT_SECONDS = 600
+
+    def __init__(self, api_key=None, verbose=True, context=None, warm_queries=True, import_batch_size=10000,
+                 max_workers=4, ingest_mode='load_csv', stream_queue_batches=4, single_pass=True,
+                 regenerate_llm=None, fast_initial_load=False, normalize_multi_valued=True, llm_concurrency=4):
         """
         Initialize the Graph Builder.
+
+        Args:
+            warm_queries (bool): Plan every heuristic import with EXPLAIN before importing.
+            import_batch_size (int): Rows per periodic commit (CALL {} IN TRANSACTIONS) for
+                LOAD CSV imports. A rule's `import_batch_size` overrides it; 0 runs each
+                import as a single transaction.
+            max_workers (int): Concurrent import rules (see `run_imports`). 1 imports sequentially.
+            ingest_mode (str): 'load_csv' lets the server read files from its import mount;
+                'stream' parses them here and sends `UNWIND $rows` batches of
+                `import_batch_size`, so sources can live anywhere.
+            stream_queue_batches (int): Parsed batches buffered ahead of the writer in stream mode.
+            single_pass (bool): Import all heuristic rules reading the same file in one scan
+                (see `plan_import_tasks`).
+            regenerate_llm (iterable, optional): Labels, relationship types or rule ids whose
+                cached LLM Cypher is ignored and regenerated; 'all' for every rule.
+            fast_initial_load (bool): On full builds (empty database after the nuke), stream
+                heuristic rules from Python, drop duplicate keys and pairs client-side and
+                write them with CREATE instead of MERGE (see core/fast_load.py).
+                Incremental builds always MERGE.
+            normalize_multi_valued (bool): Import split (multi-valued) columns from
+                pre-normalized side tables (see `normalize_sources`).
+            llm_concurrency (int): LLM Cypher generations in flight at once with the LLM
+                strategy (see `prefetch_llm_queries`).
         """
         super().__init__(api_key=api_key, module_name="GraphBuilderAgent") 
         self.verbose = verbose
+        self.warm_queries = warm_queries
+        self.import_batch_size = import_batch_size
+        self.max_workers = max_workers
+        self.ingest_mode = ingest_mode
+        self.stream_queue_batches = stream_queue_batches
+        self.single_pass = single_pass
+        self.fast_initial_load = fast_initial_load
+        self.normalize_multi_valued = normalize_multi_valued
+        # rule id -> (rule as imported, side table path); see normalize_sources
+        self.normalized = {}
+        self.global_strategy = 'H'
+        self.import_stats = []
+        # Set per build_graph run; imported entities are stamped with them
+        self.build_id = None
+        self.incremental = False
+        # Fast initial load state: active for this run, eligible labels, seen keys per label/pair set
+        self.fast_load = False
+        self.fast_labels = set()
+        self._fast_seen = {}
+        self.manifest = None
+        self.checkpoint = None
+        self.file_fingerprints = {}
+        self._manifest_lock = threading.Lock()
+        self._log_lock = threading.Lock()
         self.context = context
         self.data_dir = context.data_dir if context else 'data'
         self.base_dir = context.base_path if context else 'data'
+        # LLM-generated import Cypher survives rebuilds (see core/llm_query_cache.py)
+        self.llm_cache = LLMQueryCache(self.base_dir)
+        self.regenerate_llm = set(regenerate_llm or [])
+        self.llm_cache_keys = {}
+        self.llm_rules_used = set()
+        self.llm_concurrency = llm_concurrency
+        # rule id -> Future of its prefetched LLM Cypher
+        self._llm_futures = {}
         
         # Use new logging utils via BaseAgent but ensure we point to the right place if needed
         if self.context:
@@ -33,16 +113,18 @@ class GraphBuilderAgent(BaseAgent):
     def log_step(self, step_name, details, status="INFO"):
         """Logs a step to the markdown file with a timestamp."""
         timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        icon = "✅" if status == "SUCCESS" else ("❌" if status == "ERROR" else "ℹ️")
+        icon = {"SUCCESS": "✅", "ERROR": "❌", "WARNING": "⚠️"}.get(status, "ℹ️")
         
         entry = f"\n### {icon} {step_name} ({timestamp})\n```text\n{details}\n```\n"
         
         os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
-        with open(self.log_path, 'a') as f:
-            f.write(entry)
+        # Import tasks log from worker threads
+        with self._log_lock:
+            with open(self.log_path, 'a') as f:
+                f.write(entry)
             
         if self.verbose:
-            color = GREEN if status == "SUCCESS" else (RED if status == "ERROR" else CYAN)
+            color = {"SUCCESS": GREEN, "ERROR": RED, "WARNING": YELLOW}.get(status, CYAN)
             print(f"{color}[{step_name}] {status}{RESET}")
 
     def load_construction_plan(self):
@@ -56,51 +138,220 @@ class GraphBuilderAgent(BaseAgent):
         with open(path, 'r') as f:
             return json.load(f)
 
-    def create_constraints(self, nodes):
+    def create_constraints(self, nodes, relationships=()):
+        """
+        Creates the uniqueness constraint of every node rule plus a range index on each
+        relationship match key they do not cover (see `match_key_indexes`) and waits for
+        every index to come online before imports start.
+        The DDL runs one statement at a time in managed write transactions, so the driver
+        retries transient schema-lock errors. Match-key indexes only speed imports up:
+        one that fails (e.g. on keys too long for a range index) is a warning.
+        """
         self.log_step("Constraint Creation", "Starting uniqueness constraints checks...")
-        for node in nodes:
-            label = node['label']
-            unique_id = node.get('unique_column_name', node.get('unique_id', 'id'))
-            query = f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{label}) REQUIRE n.{unique_id} IS UNIQUE"
-            result = graphdb.send_query(query)
-            status = "ERROR" if isinstance(result, dict) and "error" in result else "SUCCESS"
-            self.log_step(f"Constraint for {label}", f"Property: {unique_id}\nQuery: {query}", status)
+        relationships = [self.normalized.get(rule_id(r), (r, None))[0] for r in relationships]
+        ddl = [(f"Constraint for {node['label']}", node_key(node), uniqueness_constraint(node['label'], node_key(node)), "ERROR")
+               for node in nodes]
+        ddl += [(f"Index for {label}", prop, range_index(label, prop), "WARNING")
+                for label, prop in match_key_indexes(nodes, relationships)]
 
-    def _get_heuristic_node_query(self, node, filename):
-        label = node['label']
-        unique_id = node.get('unique_column_name', node.get('unique_id', 'id'))
-        props = node.get('properties', [])
-        rule = node.get('transformation_rule', '')
-        
-        if "split" in rule.lower() and "ingredients" in rule.lower():
-            source_col = "ingredients" 
-            return f"""
-            LOAD CSV WITH HEADERS FROM 'file:///{filename}' AS row
-            UNWIND split(row['{source_col}'], ',') AS item
-            WITH trim(item) as cleaned_item
-            WHERE cleaned_item IS NOT NULL AND cleaned_item <> ''
-            MERGE (n:{label} {{ {unique_id}: cleaned_item }})
-            """
-        elif filename.endswith('.txt'):
-            text_prop = next((p for p in props if 'text' in p or 'content' in p), 'text')
-            return f"""
-            LOAD CSV FROM 'file:///{filename}' AS line
-            WITH line, linenumber() AS ln
-            WHERE line[0] IS NOT NULL
-            MERGE (n:{label} {{ {unique_id}: toString(ln) }})
-            SET n.{text_prop} = line[0]
-            """
+        for name, prop, query, failure in ddl:
+            result = graphdb.execute_write(query)
+            failed = not isinstance(result, list)
+            details = f"Property: {prop}\nQuery: {query}"
+            if failed and isinstance(result, dict):
+                details += f"\nError: {result.get('message', '')}"
+            self.log_step(name, details, failure if failed else "SUCCESS")
+
+        result = graphdb.send_query(AWAIT_INDEXES, {"timeout": self.INDEX_WAIT_SECONDS})
+        if isinstance(result, dict) and result.get("status") == "error":
+            # A failed match-key index leaves imports on label scans; they still run
+            self.log_step("Await Indexes", result.get("message", ""), "WARNING")
         else:
-            base = f"""
-            LOAD CSV WITH HEADERS FROM 'file:///{filename}' AS row
-            MERGE (n:{label} {{ {unique_id}: row['{unique_id}'] }})
-            """
-            set_parts = [f"n.{p} = row['{p}']" for p in props if p != unique_id]
-            if set_parts: base += f"\nSET {', '.join(set_parts)}"
-            return base
-
-    def _generate_llm_query(self, task_desc, context_json):
-        print(f"{CYAN}🤖 Generating Cypher via LLM...", end="", flush=True) 
+            self.log_step("Await Indexes", f"{len(ddl)} constraints and indexes online", "SUCCESS")
+
+    def _batch_size(self, rule):
+        return rule.get('import_batch_size', self.import_batch_size)
+
+    def _provenance(self, rule):
+        return (rule_id(rule), self.build_id) if self.build_id else None
+
+    def _is_fast(self, rule):
+        """Whether a heuristic rule is written with CREATE in this run (see `fast_initial_load`)."""
+        # LLM-imported rules MERGE rows the dedup filters never see
+        if not self.fast_load or self.global_strategy != 'H':
+            return False
+        return rule['label'] in self.fast_labels if 'label' in rule else True
+
+    def _fast_transform(self, rule, filename):
+        """Row filter dropping keys (or pairs) already created by this build."""
+        seen = self._fast_seen.setdefault(seen_key(rule), set())
+        if 'label' in rule:
+            return lambda rows: node_rows(rows, rule, filename, seen)
+        return lambda rows: relationship_rows(rows, rule, seen)
+
+    def _normalized_rule(self, rule, filename):
+        """
+        (rule, filename) a heuristic import reads. Rules on a normalized multi-valued
+        column read its side table instead (see `normalize_sources`); the filename is
+        then relative to the data directory, the LOAD CSV root.
+        """
+        if rule_id(rule) not in self.normalized:
+            return rule, filename
+        normalized_rule, path = self.normalized[rule_id(rule)]
+        return normalized_rule, os.path.relpath(path, self.data_dir)
+
+    def _get_heuristic_node_query(self, node, filename):
+        """Returns (query, params) for the heuristic node import in the current ingest mode."""
+        node, filename = self._normalized_rule(node, filename)
+        if self._is_fast(node):
+            return create_nodes_query(node, provenance=self._provenance(node))
+        if self.ingest_mode == 'stream':
+            return streamed_node_query(node, filename, provenance=self._provenance(node))
+        return heuristic_node_query(node, filename, batch_size=self._batch_size(node), provenance=self._provenance(node))
+
+    def _get_heuristic_relationship_query(self, rel, filename):
+        """Returns (query, params) for the heuristic relationship import in the current ingest mode."""
+        rel, filename = self._normalized_rule(rel, filename)
+        if self._is_fast(rel):
+            return create_relationships_query(rel, provenance=self._provenance(rel))
+        if self.ingest_mode == 'stream':
+            return streamed_relationship_query(rel, provenance=self._provenance(rel))
+        return heuristic_relationship_query(rel, filename, batch_size=self._batch_size(rel),
+                                            provenance=self._provenance(rel))
+
+    def _source_path(self, source_file):
+        """
+        Local path of a rule's source file: as given when it is absolute and exists, else
+        relative to the data directory (keeping subdirectories), else the file of that
+        name at the top of the data directory (flat layout).
+        """
+        if os.path.isabs(source_file) and os.path.exists(source_file):
+            return source_file
+        if not os.path.isabs(source_file):
+            path = os.path.normpath(os.path.join(self.data_dir, source_file))
+            inside = os.path.relpath(path, self.data_dir).split(os.sep)[0] != os.pardir
+            if inside and os.path.exists(path):
+                return path
+        return os.path.join(self.data_dir, os.path.basename(source_file))
+
+    def _load_csv_filename(self, source_file):
+        """Name LOAD CSV reads a source file by: its path relative to the data directory (the import root)."""
+        path = os.path.relpath(self._source_path(source_file), self.data_dir)
+        if path.split(os.sep)[0] == os.pardir:
+            return os.path.basename(source_file)
+        return path.replace(os.sep, '/')
+
+    def _stream_source(self, source_file, batch_size, headers=True, text_rows=False, path=None):
+        """
+        Row source read by `_execute_import` in stream mode; None with LOAD CSV.
+        `path` is a local path that is already resolved (e.g. a side table).
+        """
+        if self.ingest_mode != 'stream':
+            return None
+        return {"path": path or self._source_path(source_file), "headers": headers, "text_rows": text_rows,
+                "batch_size": batch_size or 10000}
+
+    def _heuristic_stream(self, rule, source_file):
+        """Row source of a heuristic rule; fast-loaded rules always stream, through their dedup filter."""
+        path = None
+        if rule_id(rule) in self.normalized:
+            # Side tables are stored by their local path already
+            rule, path = self.normalized[rule_id(rule)]
+            source_file = path
+        text_rows = is_text_source(source_file)
+        if not self._is_fast(rule):
+            return self._stream_source(source_file, self._batch_size(rule), text_rows=text_rows, path=path)
+        return {"path": path or self._source_path(source_file), "headers": True, "text_rows": text_rows,
+                "batch_size": self._batch_size(rule) or 10000,
+                "transform": self._fast_transform(rule, os.path.basename(source_file))}
+
+    def _prepare_llm_query(self, query, rule, source_file):
+        """Adapts an LLM-generated LOAD CSV import to the ingest mode. Returns (query, params, stream)."""
+        self.llm_rules_used.add(rule_id(rule))
+        if self.ingest_mode == 'stream':
+            rewritten = load_csv_to_unwind(query)
+            if rewritten:
+                unwind_query, headers = rewritten
+                return unwind_query, None, self._stream_source(source_file, self._batch_size(rule), headers=headers)
+            print(f"{YELLOW}⚠️  LLM query cannot be streamed; running it with LOAD CSV.{RESET}")
+        return (*self._batch_llm_query(query, rule), None)
+
+    def _batch_llm_query(self, query, rule):
+        """
+        Wraps an LLM-generated import in periodic commits when it has the plain
+        `LOAD CSV ... AS row <body>` shape. Returns (query, params).
+        """
+        batch_size = self._batch_size(rule)
+        if not batch_size:
+            # Still reports the rows it read, like the batched form
+            return with_row_count(query) or query, None
+        wrapped = wrap_in_transactions(query)
+        if wrapped is None:
+            print(f"{YELLOW}⚠️  LLM query cannot be batched safely; running it as a single transaction.{RESET}")
+            return query, None
+        return wrapped, {"batch_size": batch_size}
+
+    def _force_regenerate(self, rule):
+        names = {rule_id(rule), rule.get('label'), rule.get('relationship_type', rule.get('type'))}
+        return 'all' in self.regenerate_llm or bool(names & self.regenerate_llm)
+
+    def _llm_task(self, rule):
+        """Task description the LLM is asked to write Cypher for (part of the cache key)."""
+        if 'label' in rule:
+            return f"Import Nodes with Label {rule['label']}"
+        return (f"Import Relationship {rule.get('relationship_type', rule.get('type'))} "
+                f"between {rule.get('from_node_label')} and {rule.get('to_node_label')}")
+
+    def prefetch_llm_queries(self, nodes, relationships):
+        """
+        With the LLM strategy, starts generating the Cypher of every rule on up to
+        `self.llm_concurrency` threads, so generation runs in parallel instead of one
+        LLM call per rule. `_llm_query` collects the results; `prepare_imports` still
+        waits for all of them before any import starts.
+        """
+        if self.global_strategy != 'L':
+            return
+        node_map = {n['label']: n for n in nodes}
+        rules = [n for n in nodes if n.get('source_file')]
+        rules += [r for r in relationships if self._relationship_source_file(r, node_map)]
+        rules = [r for r in rules if rule_id(r) not in self._llm_futures]
+        if not rules:
+            return
+        print(f"{CYAN}🤖 Generating Cypher for {len(rules)} rules ({self.llm_concurrency} at a time)...{RESET}")
+        pool = ThreadPoolExecutor(max_workers=max(1, self.llm_concurrency), thread_name_prefix="llm-prefetch")
+        for rule in rules:
+            self._llm_futures[rule_id(rule)] = pool.submit(self._generate_llm_query, self._llm_task(rule), rule, True)
+        pool.shutdown(wait=False)
+
+    def _cancel_llm_prefetch(self):
+        """Drops generations that have not started yet (e.g. after a failed prepare)."""
+        for future in self._llm_futures.values():
+            future.cancel()
+        self._llm_futures = {}
+
+    def _llm_query(self, task_desc, rule):
+        """The rule's LLM Cypher: the prefetched result when there is one, else generated now."""
+        future = self._llm_futures.pop(rule_id(rule), None)
+        if future is not None:
+            return future.result()
+        return self._generate_llm_query(task_desc, rule)
+
+    def _generate_llm_query(self, task_desc, context_json, quiet=False):
+        """
+        Returns LLM-generated Cypher for a rule, from the context's cache unless the rule changed.
+        `quiet` drops the progress output (used by concurrent prefetches).
+        """
+        key = LLMQueryCache.make_key(context_json, task_desc, self.MODEL_CANDIDATES[0])
+        self.llm_cache_keys[rule_id(context_json)] = key
+        cached = self.llm_cache.get(key)
+        if cached and not self._force_regenerate(context_json):
+            last_success = cached["last_success"] or "never"
+            if not quiet:
+                print(f"{CYAN}♻️  Using cached LLM Cypher ({cached['model']}, last successful import: {last_success}){RESET}")
+            return cached["query"]
+
+        if not quiet:
+            print(f"{CYAN}🤖 Generating Cypher via LLM...", end="", flush=True) 
         start_time = time.time()
         prompt = f"""
         You are a Neo4j Cypher Expert.
@@ -115,136 +366,413 @@ class GraphBuilderAgent(BaseAgent):
         2. Use `LOAD CSV WITH HEADERS FROM 'file:///...'`
         3. Handle nulls using `coalesce` or `WHERE` clauses if needed.
         4. Use `MERGE` to avoid duplicates.
+        5. Write a single statement without RETURN, `USING PERIODIC COMMIT` or `CALL {{}} IN TRANSACTIONS`; batching is added automatically.
         """
-        response, _ = self._generate(prompt, function_name="generate_cypher")
+        response, model = self._generate(prompt, function_name="generate_cypher")
         
         duration = time.time() - start_time
-        print(f" Done ({duration:.1f}s){RESET}")
+        if not quiet:
+            print(f" Done ({duration:.1f}s){RESET}")
         
         # Clean response
+        query = response.strip()
         if "```" in response:
             import re
             match = re.search(r"```(?:cypher)?\s*(.*?)\s*```", response, re.DOTALL)
-            if match: return match.group(1)
-        return response.strip()
+            if match: query = match.group(1)
+        if model != "simulation-model":
+            self.llm_cache.put(key, query, model, task_desc, rule_id(context_json))
+        return query
 
-    def import_nodes(self, nodes):
-        self.log_step("Node Import", "Starting node batch import...")
-        
-        total = len(nodes)
-        for i, node in enumerate(nodes):
-            label = node['label']
+    def _choose_query(self, prompt_label, hq, params, rule, llm_task, source_file):
+        """Applies the global strategy (or asks) and returns the (query, params, stream) to run."""
+        if self.global_strategy in ['H', 'L']:
+            choice = self.global_strategy
+            print(f"{YELLOW}{prompt_label} -> Auto-selecting {choice}{RESET}")
+        else:
+            print(f"\n{YELLOW}{prompt_label}{RESET}")
+            choice = input(f"{CYAN}Import Strategy? [H]euristic (Default) / [L]LM / [C]ompare: {RESET}").strip().upper()
+
+        if choice == 'L' or choice == 'C':
+            lq = self._llm_query(llm_task, rule)
+            if choice == 'L':
+                return self._prepare_llm_query(lq, rule, source_file)
+            print(f"\n{CYAN}--- Heuristic ---{RESET}\n{hq}\nParams: {params}")
+            print(f"\n{CYAN}--- LLM Generated ---{RESET}\n{lq}")
+            sel = input(f"\n{YELLOW}Select [H]euristic or [L]LM: {RESET}").strip().upper()
+            if sel == 'L':
+                return self._prepare_llm_query(lq, rule, source_file)
+        return hq, params, self._heuristic_stream(rule, source_file)
+
+    def prepare_node_import(self, node, i, total):
+        """Returns (step label, query, params, stream) for a node rule, or None if it has no source file."""
+        label = node['label']
+        source_file = node.get('source_file')
+        if not source_file: return None
+        filename = self._load_csv_filename(source_file)
+
+        hq, params = self._get_heuristic_node_query(node, filename)
+        return (f"Import {label}",
+                *self._choose_query(f"[{i+1}/{total}] Node: {label} (File: {filename})",
+                                    hq, params, node, self._llm_task(node), source_file))
+
+    def prepare_relationship_import(self, rel, node_map, i, total):
+        """Returns (step label, query, params, stream) for a relationship rule, or None if it has no source file."""
+        rel_type = rel.get('relationship_type', rel.get('type'))
+        source_file = self._relationship_source_file(rel, node_map)
+        if not source_file: return None
+        filename = self._load_csv_filename(source_file)
+
+        hq, params = self._get_heuristic_relationship_query(rel, filename)
+        return (f"Rel {rel_type}",
+                *self._choose_query(f"[{i+1}/{total}] Relationship: {rel_type}", hq, params, rel,
+                                    self._llm_task(rel), source_file))
+
+    def _get_file_query(self, group):
+        """Returns (query, params) importing every rule of a file group in one pass."""
+        rules = group["nodes"] + group["relationships"]
+        return file_import_query(self._load_csv_filename(group["source_file"]), group["nodes"], group["relationships"],
+                                 batch_size=min(self._batch_size(r) for r in rules), provenance=self._provenance,
+                                 streamed=self.ingest_mode == 'stream')
+
+    def prepare_file_import(self, group, i, total):
+        """Returns (step label, query, params, stream) for a file group (heuristic only)."""
+        source_file = group["source_file"]
+        filename = self._load_csv_filename(source_file)
+        rules = group["nodes"] + group["relationships"]
+        print(f"{YELLOW}[{i+1}/{total}] File: {filename} -> single pass for "
+              f"{', '.join(r.get('label') or r.get('relationship_type', r.get('type')) for r in rules)}{RESET}")
+        query, params = self._get_file_query(group)
+        stream = self._stream_source(source_file, min(self._batch_size(r) for r in rules),
+                                     text_rows=is_text_source(source_file))
+        return f"File {filename}", query, params, stream
+
+    def plan_import_tasks(self, nodes, relationships):
+        """
+        Builds the import DAG. With `single_pass` and the heuristic strategy, rules that
+        read the same file are fused into one task so each file is scanned once.
+        Fast initial loads keep one task per rule, since each rule has its own dedup filter.
+        """
+        groups = []
+        if self.single_pass and self.global_strategy == 'H' and not self.fast_load:
+            node_map = {n['label']: n for n in nodes}
+            # Rules reading a side table no longer share their original file
+            normalized_nodes = [n for n in nodes if rule_id(n) in self.normalized]
+            normalized_rels = [r for r in relationships if rule_id(r) in self.normalized]
+            groups, nodes, relationships = group_rules_by_file(
+                [n for n in nodes if rule_id(n) not in self.normalized],
+                [r for r in relationships if rule_id(r) not in self.normalized],
+                lambda rule: rule.get('source_file') if 'label' in rule else self._relationship_source_file(rule, node_map))
+            nodes, relationships = nodes + normalized_nodes, relationships + normalized_rels
+        return build_import_dag(nodes, relationships, groups)
+
+    def normalize_sources(self, nodes, relationships):
+        """
+        Explodes the multi-valued column of every split rule once per source version into
+        a value table and link tables (see core/side_tables.py), cached in the data
+        directory by source fingerprint. The rule's heuristic import then MERGEs plain
+        values, and relationship rules matching an endpoint on that column read the
+        (row key, value) link table, instead of re-splitting strings row by row.
+        Fills `self.normalized`: rule id -> (rule as imported, side table path).
+        """
+        self.normalized = {}
+        if not self.normalize_multi_valued:
+            return
+        node_map = {n['label']: n for n in nodes}
+        keep = set()
+        for node in nodes:
             source_file = node.get('source_file')
-            if not source_file: continue
-            filename = os.path.basename(source_file)
-            
-            # 1. Heuristic
-            hq = self._get_heuristic_node_query(node, filename)
-            
-            if self.global_strategy in ['H', 'L']:
-                 choice = self.global_strategy
-                 print(f"{YELLOW}[{i+1}/{total}] Node: {label} (File: {filename}) -> Auto-selecting {choice}{RESET}")
-            else:
-                print(f"\n{YELLOW}[{i+1}/{total}] Node: {label} (File: {filename}){RESET}")
-                choice = input(f"{CYAN}Import Strategy? [H]euristic (Default) / [L]LM / [C]ompare: {RESET}").strip().upper()
-            
-            final_query = hq
-            
-            if choice == 'L' or choice == 'C':
-                lq = self._generate_llm_query(f"Import Nodes with Label {label}", node)
-                if choice == 'L':
-                    final_query = lq
-                else:
-                    print(f"\n{CYAN}--- Heuristic ---{RESET}\n{hq}")
-                    print(f"\n{CYAN}--- LLM Generated ---{RESET}\n{lq}")
-                    sel = input(f"\n{YELLOW}Select [H]euristic or [L]LM: {RESET}").strip().upper()
-                    final_query = lq if sel == 'L' else hq
+            if not is_split_rule(node) or not source_file or is_text_source(source_file):
+                continue
+            source_path = self._source_path(source_file)
+            fingerprint = self.file_fingerprints.get(rule_id(node)) or file_fingerprint(source_path)
+            if not fingerprint:
+                continue
+            key = node_key(node)
+            links = {}
+            for rel in relationships:
+                rel_source = self._relationship_source_file(rel, node_map)
+                if not rel_source or self._source_path(rel_source) != source_path:
+                    continue
+                for side, other in (("to", "from"), ("from", "to")):
+                    other_column = rel.get(f'{other}_node_column', 'id')
+                    if (rel.get(f'{side}_node_label') == node['label'] and rel.get(f'{side}_node_column') == SPLIT_COLUMN
+                            and other_column != key):
+                        links[rule_id(rel)] = (rel, side, other_column)
+                        break
+
+            out_dir = side_table_dir(self.data_dir, fingerprint)
+            keep.add(out_dir)
+            values_path, link_paths, cached = normalize_column(
+                source_path, SPLIT_COLUMN, out_dir, key, {other for _, _, other in links.values()}, SPLIT_DELIMITER)
+            self.normalized[rule_id(node)] = ({**node, "properties": [key], "transformation_rule": ""}, values_path)
+            for rid, (rel, side, other_column) in links.items():
+                self.normalized[rid] = ({**rel, f"{side}_node_column": key}, link_paths[other_column])
+            self.log_step(f"Normalize {node['label']}",
+                          f"{'Reused' if cached else 'Wrote'} side tables of {os.path.basename(source_file)}.{SPLIT_COLUMN}:\n"
+                          + "\n".join([values_path, *link_paths.values()]), "SUCCESS")
+        prune_side_tables(self.data_dir, keep)
 
-            self._execute_import(f"Import {label}", final_query)
+    def prepare_imports(self, nodes, relationships):
+        """
+        Plans the import DAG and prepares every task's statement up front
+        (sequentially, since strategy I prompts).
 
-    def import_relationships(self, nodes, relationships):
-        self.log_step("Relationship Import", "Starting relationship import...")
+        Returns:
+            tuple: (tasks, {task key: (step label, query, params, stream) or None})
+        """
         node_map = {n['label']: n for n in nodes}
-        
-        total = len(relationships)
-        for i, rel in enumerate(relationships):
-            rel_type = rel.get('relationship_type', rel.get('type'))
-            print(f"\n{YELLOW}[{i+1}/{total}] Relationship: {rel_type}{RESET}")
-            
-            # Logic to find source file... (simplified for brevity, assume extraction from rel or source node)
-            source_label = rel.get('from_node_label')
-            source_file = rel.get('source_file')
-            if not source_file:
-                 source_file = node_map.get(source_label, {}).get('source_file')
-            if not source_file: continue
-            
-            filename = os.path.basename(source_file)
-            
-            # Standard Heuristic
-            hq = f"""
-            LOAD CSV WITH HEADERS FROM 'file:///{filename}' AS row
-            MATCH (source:{source_label} {{ id: row['id'] }}) -- Simplified assumption
-            MATCH (target:{rel.get('to_node_label')} {{ id: row['target_id'] }}) -- Simplified
-            MERGE (source)-[r:{rel_type}]->(target)
-            """
-            
-            # Quick check for original heuristic logic re-implementation
-            source_key = rel.get('from_node_column', 'id')
-            target_key = rel.get('to_node_column', 'id')
-            target_label = rel.get('to_node_label')
-            
-            hq = f"""
-            LOAD CSV WITH HEADERS FROM 'file:///{filename}' AS row
-            MATCH (source:{source_label} {{ {source_key}: row['{source_key}'] }})
-            MATCH (target:{target_label} {{ {target_key}: row['{target_key}'] }})
-            MERGE (source)-[r:{rel_type}]->(target)
-            """
-
-            if self.global_strategy in ['H', 'L']:
-                 choice = self.global_strategy
-                 print(f" -> Auto-selecting {choice}")
+        tasks = self.plan_import_tasks(nodes, relationships)
+        self.prefetch_llm_queries(nodes, relationships)
+        prepared = {}
+        try:
+            for i, task in enumerate(tasks):
+                if task.kind == "file":
+                    prepared[task.key] = self.prepare_file_import(task.rule, i, len(tasks))
+                elif task.kind == "node":
+                    prepared[task.key] = self.prepare_node_import(task.rule, i, len(tasks))
+                else:
+                    prepared[task.key] = self.prepare_relationship_import(task.rule, node_map, i, len(tasks))
+        except BaseException:
+            self._cancel_llm_prefetch()
+            raise
+        return tasks, prepared
+
+    def audit_imports(self, prepared_imports, nodes, relationships=()):
+        """
+        Pre-flight check: EXPLAINs every prepared import in parallel and rates it from
+        its plan (see core/query_audit.py). Nothing is executed.
+
+        Returns:
+            list: one dict per import with step, risk, estimated_rows, eager,
+                  missing_indexes and error
+        """
+        tasks, prepared = prepared_imports
+        relationships = [self.normalized.get(rule_id(r), (r, None))[0] for r in relationships]
+        planned_indexes = {(n['label'], node_key(n)) for n in nodes} | set(match_key_indexes(nodes, relationships))
+
+        def _audit(task):
+            label, query, params, stream = prepared[task.key]
+            explain_params = {**(params or {}), "rows": []} if stream else params
+            is_valid, error, plan = graphdb.validate_cypher(query, explain_params, return_plan=True)
+            if not is_valid:
+                return {"step": label, "risk": "INVALID", "estimated_rows": None, "eager": 0,
+                        "missing_indexes": [], "error": error}
+            return {"step": label, **audit_plan(plan, planned_indexes), "error": None}
+
+        runnable = [t for t in tasks if prepared[t.key] is not None]
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            results = list(pool.map(_audit, runnable))
+
+        if self.context:
+            os.makedirs(self.debug_dir, exist_ok=True)
+            with open(os.path.join(self.debug_dir, 'import_audit.json'), 'w') as f:
+                json.dump(results, f, indent=2)
+        return results
+
+    def print_audit_report(self, results):
+        print(f"\n{CYAN}--- Pre-flight Import Audit ---{RESET}")
+        print(f"{'Step':<40} {'Risk':<8} {'Est. rows':>12} {'Eager':>6}  Missing indexes")
+        for r in results:
+            color = {"LOW": GREEN, "MEDIUM": YELLOW}.get(r["risk"], RED)
+            estimate = f"{r['estimated_rows']:.0f}" if r["estimated_rows"] is not None else "-"
+            detail = r["error"] or ", ".join(r["missing_indexes"]) or "-"
+            print(f"{color}{r['step']:<40} {r['risk']:<8} {estimate:>12} {r['eager']:>6}  {detail}{RESET}")
+        risky = [r for r in results if r["risk"] in ("HIGH", "INVALID")]
+        status = "ERROR" if risky else "SUCCESS"
+        self.log_step("Pre-flight Audit", json.dumps(results, indent=2), status)
+
+    def run_imports(self, nodes, relationships, prepared_imports=None):
+        """
+        Imports every rule through the dependency scheduler: node rules for different
+        labels run concurrently on `self.max_workers` threads, and each relationship
+        rule starts once all node rules of its endpoint labels have succeeded.
+
+        Args:
+            prepared_imports (tuple, optional): Result of `prepare_imports`, when the
+                statements were already prepared (e.g. for the pre-flight audit).
+
+        Returns:
+            dict: task key -> "SUCCESS", "ERROR" or "SKIPPED"
+        """
+        tasks, prepared = prepared_imports or self.prepare_imports(nodes, relationships)
+
+        def _worker(task):
+            if prepared[task.key] is None:
+                return True  # nothing to import for this rule
+            label, query, params, stream = prepared[task.key]
+            rules = task.rule["nodes"] + task.rule["relationships"] if task.kind == "file" else [task.rule]
+            if stream and self.checkpoint:
+                rule_ids = [rule_id(r) for r in rules]
+                stream = {**stream, "rule_ids": rule_ids, "offset": self.checkpoint.offset(rule_ids)}
+            if self._execute_import(label, query, params, stream)["status"] != "SUCCESS":
+                return False
+            if task.kind == "file":
+                for rule in rules:
+                    stamp = self._provenance(rule)
+                    self._rule_imported(rule, {"kg_rule": stamp[0], "kg_build": stamp[1]} if stamp else None)
             else:
-                choice = input(f"{CYAN}Import Strategy? [H]euristic / [L]LM / [C]ompare: {RESET}").strip().upper()
-                
-            final_query = hq
-            
-            if choice == 'L' or choice == 'C':
-                 lq = self._generate_llm_query(f"Import Relationship {rel_type} between {source_label} and {target_label}", rel)
-                 if choice == 'L': final_query = lq
-                 else:
-                    print(f"\n{CYAN}--- Heuristic ---{RESET}\n{hq}")
-                    print(f"\n{CYAN}--- LLM Generated ---{RESET}\n{lq}")
-                    sel = input(f"\n{YELLOW}Select [H]euristic or [L]LM: {RESET}").strip().upper()
-                    final_query = lq if sel == 'L' else hq
-            
-            self._execute_import(f"Rel {rel_type}", final_query)
+                self._rule_imported(task.rule, params)
+            return True
 
-    def _execute_import(self, label, query):
-        result = graphdb.send_query(query)
-        status = "ERROR" if isinstance(result, dict) and "error" in result else "SUCCESS"
-        self.log_step(label, f"Query: {query}", status)
+        def _on_skip(task, failed):
+            self.log_step(f"Skip {task.key}", f"Dependencies failed: {', '.join(sorted(failed))}", "ERROR")
 
-    def init_log(self):
-        # Log init handled in __init__ now or via logging utils
-        pass
+        self.log_step("Import Scheduler", f"{len(tasks)} rules, {self.max_workers} workers")
+        return run_import_dag(tasks, _worker, max_workers=self.max_workers, on_skip=_on_skip)
 
-    def build_graph(self):
-        # self.init_log() # done via logging utils implicitly when writing
-        print(f"\n{CYAN}--- 🏗️  Starting Graph Construction ---{RESET}")
-        
-        if not graphdb.connect():
-            self.log_step("Connection", "Failed to connect to Neo4j", "ERROR")
-            return False
+    def _relationship_source_file(self, rel, node_map):
+        # Relationships without their own file are read from the source node's file
+        source_file = rel.get('source_file')
+        if not source_file:
+             source_file = node_map.get(rel.get('from_node_label'), {}).get('source_file')
+        return source_file
+
+    def warm_import_queries(self, nodes, relationships):
+        """Plans every heuristic import once with EXPLAIN so imports start on cached plans."""
+        node_map = {n['label']: n for n in nodes}
+        templates = []
+        for task in self.plan_import_tasks(nodes, relationships):
+            if task.kind == "file":
+                templates.append(self._get_file_query(task.rule))
+            elif task.kind == "node" and task.rule.get('source_file'):
+                templates.append(self._get_heuristic_node_query(task.rule, self._load_csv_filename(task.rule['source_file'])))
+            elif task.kind == "relationship":
+                source_file = self._relationship_source_file(task.rule, node_map)
+                if source_file:
+                    templates.append(self._get_heuristic_relationship_query(task.rule, self._load_csv_filename(source_file)))
+
+        templates = [(query, {**params, "rows": []}) if "$rows" in query else (query, params)
+                     for query, params in templates]
+        failures = warm_templates(graphdb, templates)
+        details = f"Planned {len(templates) - len(failures)}/{len(templates)} import templates."
+        for query, error in failures:
+            details += f"\n- {error}\n{query}"
+        self.log_step("Query Warm-up", details, "ERROR" if failures else "SUCCESS")
+
+    def _execute_import(self, label, query, params=None, stream=None):
+        """
+        Runs one import and records rows read, summary counters and throughput in
+        `self.import_stats`. With `stream` (see `_stream_source`), the file is parsed
+        here and sent as `UNWIND $rows` batches; otherwise the server reads it with LOAD CSV.
+        """
+        start_time = time.time()
+        if stream:
+            result = self._stream_import(label, query, params, stream)
+        else:
+            result = graphdb.execute_import(query, params)
+        duration = time.time() - start_time
+
+        failed = result is None or result.get("status") == "error"
+        rows = None
+        counters = {}
+        if stream and not failed:
+            rows = result["rows"]
+            counters = result
+        elif not failed:
+            records = result["records"]
+            if records and "rows" in records[0]:
+                rows = records[0]["rows"]
+            counters = result["counters"]
+        stats = {
+            "step": label,
+            "status": "ERROR" if failed else "SUCCESS",
+            "batch_size": stream["batch_size"] if stream else (params or {}).get("batch_size"),
+            "rows": rows,
+            "nodes_created": counters.get("nodes_created"),
+            "relationships_created": counters.get("relationships_created"),
+            "properties_set": counters.get("properties_set"),
+            "seconds": round(duration, 3),
+            "rows_per_sec": round(rows / duration, 1) if rows and duration > 0 else None,
+        }
+        self.import_stats.append(stats)
+
+        details = f"Query: {query}\nParams: {params}"
+        if rows is not None:
+            details += f"\nRows: {rows} in {duration:.1f}s ({stats['rows_per_sec'] or 0:.0f} rows/s)"
+        if counters:
+            details += (f"\nCreated: {stats['nodes_created']} nodes, {stats['relationships_created']} relationships, "
+                        f"{stats['properties_set']} properties set")
+        self.log_step(label, details, stats["status"])
+        return stats
+
+    def _stream_import(self, label, query, params, stream):
+        """Reads the source on a prefetch thread (bounded queue) while batches are written."""
+        if not os.path.exists(stream["path"]):
+            return {"status": "error", "message": f"Source file not found: {stream['path']}"}
+        batch_size = stream["batch_size"]
+        source = iter_csv_rows(stream["path"], headers=stream["headers"], text_rows=stream["text_rows"])
+        # Offsets count source rows, before any transform, so they replay with or without one
+        offset = stream.get("offset", 0)
+        if offset:
+            print(f"{CYAN}   {label}: resuming after row {offset}{RESET}")
+            source = islice(source, offset, None)
+        transformed = None
+        if stream.get("transform"):
+            # Runs on the prefetch thread, overlapping the writes
+            source = transformed = TransformedRows(source, stream["transform"], start=offset)
+        rows = prefetch_rows(source, batch_size, max_batches=self.stream_queue_batches)
+
+        def _progress(written):
+            # write_batches reports after each committed batch
+            if stream.get("rule_ids") and self.checkpoint:
+                done = transformed.source_rows_done(written) if transformed else offset + written
+                self.checkpoint.advance(stream["rule_ids"], done)
+            if self.verbose and written % (batch_size * 10) == 0:
+                print(f"{CYAN}   {label}: {written} rows streamed{RESET}")
 
-        print(f"{YELLOW}🧨 Nuking Database (Clean Slate Policy)...{RESET}")
-        graphdb.nuke_database()
-        
         try:
-            plan = self.load_construction_plan()
+            result = graphdb.write_batches(query, rows, batch_size=batch_size, params=params, progress_callback=_progress)
         except Exception as e:
-            self.log_step("Load Plan", str(e), "ERROR")
-            return False
+            # Raised by the reader thread (e.g. a malformed file)
+            return {"status": "error", "message": str(e)}
+        finally:
+            rows.close()
+        if transformed and isinstance(result, dict) and result.get("status") != "error":
+            # Rows read from the source, not the deduplicated rows written
+            result = {**result, "rows": transformed.source_rows_done(result["rows"]) - offset}
+        return result
 
+    def report_build(self, started):
+        """
+        Builds the structured per-rule report of this run, compares it with the previous
+        run of the context and persists both the JSON and the rendered summary.
+        """
+        if not self.import_stats:
+            return None
+        settings = {"strategy": self.global_strategy, "ingest_mode": self.ingest_mode,
+                    "incremental": self.incremental, "single_pass": self.single_pass,
+                    "fast_initial_load": self.fast_load,
+                    "max_workers": self.max_workers, "import_batch_size": self.import_batch_size}
+        report = build_report(self.build_id, self.import_stats, started, time.time(), settings)
+        previous = load_previous_report(self.base_dir, exclude_build_id=self.build_id) if self.context else None
+        diff = diff_reports(report, previous)
+        report["previous_build_id"] = previous.get("build_id") if previous else None
+        report["diff"] = diff
+        rendered = render_report(report, diff)
+
+        print(f"\n{CYAN}--- Build Report ---{RESET}")
+        for line in rendered.splitlines():
+            color = RED if ("REGRESSION" in line or " ERROR " in line) else ""
+            print(f"{color}{line}{RESET if color else ''}")
+        regressions = [d["step"] for d in diff if d["regression"]]
+        if regressions:
+            print(f"{RED}⚠️  Throughput regressed vs {report['previous_build_id']}: {', '.join(regressions)}{RESET}")
+
+        if self.context:
+            path = save_report(self.base_dir, report, rendered)
+            print(f"{CYAN}📊 Build report written to {path}{RESET}")
+        return report
+
+    def init_log(self):
+        # Log init handled in __init__ now or via logging utils
+        pass
+
+    def _report_nuke_progress(self, phase, deleted, total):
+        print(f"\r{YELLOW}   Deleting {phase}: {deleted}/{total}{RESET}", end="\n" if deleted >= total else "", flush=True)
+
+    def _split_plan(self, plan):
+        """Returns (node rules, relationship rules) from either construction plan layout."""
         nodes = []
         rels = []
         if isinstance(plan, dict):
@@ -257,6 +785,156 @@ class GraphBuilderAgent(BaseAgent):
                      ctype = rule.get('construction_type')
                      if ctype == 'node': nodes.append(rule)
                      elif ctype == 'relationship': rels.append(rule)
+        return nodes, rels
+
+    def _nuke(self, recreate_store):
+        print(f"{YELLOW}🧨 Nuking Database (Clean Slate Policy)...{RESET}")
+        container_service = None
+        if recreate_store and self.context:
+            from services.container_service import ContainerService
+            container_service = ContainerService(self.context)
+        nuke_res = graphdb.nuke_database(progress_callback=self._report_nuke_progress, container_service=container_service)
+        if isinstance(nuke_res, dict) and nuke_res.get("status") == "error":
+            self.log_step("Nuke Database", nuke_res.get("message", ""), "ERROR")
+            return False
+        self.log_step("Nuke Database", json.dumps(nuke_res), "SUCCESS")
+        return True
+
+    def _source_fingerprints(self, nodes, relationships):
+        """rule id -> sha256 of the rule's source file in the data directory."""
+        node_map = {n['label']: n for n in nodes}
+        fingerprints = {}
+        for rule in nodes + relationships:
+            source_file = rule.get('source_file') if 'label' in rule else self._relationship_source_file(rule, node_map)
+            if source_file:
+                fingerprints[rule_id(rule)] = file_fingerprint(self._source_path(source_file))
+        return fingerprints
+
+    def _rule_imported(self, rule, params):
+        """Called from import workers after a rule succeeded: sweeps removed rows and records its fingerprints."""
+        # Only stamped (heuristic) imports can be swept; LLM queries leave the old stamps in place
+        if self.incremental and params and "kg_build" in params:
+            if 'label' in rule:
+                query = stale_nodes_query(rule['label'])
+            else:
+                query = stale_relationships_query(rule.get('relationship_type', rule.get('type')))
+            result = graphdb.send_query(query, {"kg_rule": params["kg_rule"], "kg_build": self.build_id,
+                                                "batch_size": self.import_batch_size or 10000})
+            if isinstance(result, list) and result:
+                self.log_step(f"Sweep {rule_id(rule)}", f"Deleted {result[0].get('deleted', 0)} stale entities", "SUCCESS")
+        with self._manifest_lock:
+            self.manifest.record(rule, self.file_fingerprints.get(rule_id(rule)), self.build_id)
+            # Saved per rule so an interrupted build keeps what it completed
+            self.manifest.save()
+        if self.checkpoint:
+            self.checkpoint.complete(rule_id(rule))
+        if rule_id(rule) in self.llm_rules_used and rule_id(rule) in self.llm_cache_keys:
+            self.llm_cache.mark_success(self.llm_cache_keys[rule_id(rule)])
+
+    def _sweep_removed_rules(self, removed):
+        """Deletes everything imported by rules that are no longer in the plan."""
+        for rid, entry in removed.items():
+            if entry.get("label"):
+                query = stale_nodes_query(entry["label"])
+            else:
+                query = stale_relationships_query(entry["relationship_type"])
+            result = graphdb.send_query(query, {"kg_rule": rid, "kg_build": self.build_id,
+                                                "batch_size": self.import_batch_size or 10000})
+            if isinstance(result, list):
+                deleted = result[0].get('deleted', 0) if result else 0
+                self.log_step(f"Remove {rid}", f"Rule left the plan; deleted {deleted} entities", "SUCCESS")
+                del self.manifest.entries[rid]
+
+    def _resume_checkpoint(self, plan):
+        """The checkpoint to resume from, or None (after saying why) to run a normal build."""
+        if not self.checkpoint.state:
+            print(f"{YELLOW}No build checkpoint; running a normal build.{RESET}")
+            return None
+        if self.checkpoint.state.get("plan") != rule_fingerprint(plan):
+            print(f"{YELLOW}Construction plan changed since the checkpoint; running a normal build.{RESET}")
+            return None
+        return self.checkpoint.state
+
+    def build_graph(self, recreate_store=False, incremental=False, dry_run=False, preflight=True, resume=False):
+        """
+        Runs the build: pre-flight audit, nuke, constraints, node imports, relationship imports.
+
+        Args:
+            recreate_store (bool): Drop and recreate the context's Neo4j store instead of
+                deleting the existing graph in batches. Requires a managed container.
+            incremental (bool): Keep the graph and re-import only rules whose rule or source
+                file changed since the last build (see core/build_manifest.py). Entities
+                from removed rows are deleted by their `_kg_rules` provenance stamps.
+                Falls back to a full build when no previous manifest exists.
+            dry_run (bool): Prepare and audit every import, print the risk table and stop
+                before touching the database.
+            preflight (bool): Audit the imports with EXPLAIN before a real build too.
+            resume (bool): Continue the build recorded in the context's checkpoint
+                (see core/build_checkpoint.py): completed rules are skipped and streamed
+                files continue after their last committed batch. Rules imported with
+                LOAD CSV restart from the top (MERGE makes that safe).
+        """
+        # self.init_log() # done via logging utils implicitly when writing
+        print(f"\n{CYAN}--- 🏗️  Starting Graph Construction ---{RESET}")
+        started = time.time()
+        self.import_stats = []
+        self.llm_rules_used = set()
+        self._llm_futures = {}
+        self.build_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.manifest = BuildManifest(self.base_dir)
+        
+        if not graphdb.connect():
+            self.log_step("Connection", "Failed to connect to Neo4j", "ERROR")
+            return False
+
+        try:
+            plan = self.load_construction_plan()
+        except Exception as e:
+            self.log_step("Load Plan", str(e), "ERROR")
+            return False
+        nodes, rels = self._split_plan(plan)
+
+        self.checkpoint = BuildCheckpoint(self.base_dir)
+        resumed = self._resume_checkpoint(plan) if resume else None
+        if resumed:
+            self.build_id = resumed["build_id"]
+            self.incremental = resumed["incremental"]
+        else:
+            self.incremental = incremental and bool(self.manifest.entries)
+            if incremental and not self.incremental:
+                print(f"{YELLOW}No previous build manifest; running a full build.{RESET}")
+        self.file_fingerprints = self._source_fingerprints(nodes, rels)
+        if resumed:
+            changed = self.checkpoint.drop_changed_offsets(self.file_fingerprints)
+            if changed:
+                print(f"{YELLOW}⚠️  Source changed since the checkpoint; reloading from the first row: "
+                      f"{', '.join(changed)}{RESET}")
+        # CREATE is only safe on the empty database a full build starts from
+        self.fast_load = self.fast_initial_load and not self.incremental and not resumed
+        self.fast_labels = fast_load_labels(nodes) if self.fast_load else set()
+        self._fast_seen = {}
+        if self.fast_load and len(self.fast_labels) < len({n['label'] for n in nodes}):
+            print(f"{YELLOW}⚠️  Labels fed by several node rules keep MERGE.{RESET}")
+
+        removed = {}
+        if resumed:
+            pending = set(self.checkpoint.pending())
+            import_nodes = [n for n in nodes if rule_id(n) in pending]
+            import_rels = [r for r in rels if rule_id(r) in pending]
+            removed = self.manifest.removed(nodes + rels) if self.incremental else {}
+            self.log_step("Resume",
+                          f"Resuming build {self.build_id}: {len(pending)}/{len(resumed['rules'])} rules left, "
+                          f"{len(resumed['offsets'])} partially loaded.")
+        elif self.incremental:
+            import_nodes, import_rels, removed = plan_delta(self.manifest, nodes, rels, self.file_fingerprints)
+            self.log_step("Incremental Plan",
+                          f"Re-importing {len(import_nodes)}/{len(nodes)} node rules and "
+                          f"{len(import_rels)}/{len(rels)} relationship rules; {len(removed)} rules removed.")
+            if not import_nodes and not import_rels and not removed:
+                print(f"{GREEN}✅ Graph is up to date.{RESET}")
+                return True
+        else:
+            import_nodes, import_rels = nodes, rels
         
         # Ask for global strategy
         print(f"\n{CYAN}Select Global Import Strategy:{RESET}")
@@ -268,10 +946,41 @@ class GraphBuilderAgent(BaseAgent):
             choice = 'H' # Default
         self.global_strategy = choice
         print(f"{GREEN}Selected Strategy: {self.global_strategy}{RESET}\n")
+        if self.incremental and choice != 'H':
+            print(f"{YELLOW}⚠️  Rows removed from LLM-imported rules are not swept (only heuristic imports carry provenance).{RESET}")
 
-        self.create_constraints(nodes)
-        self.import_nodes(nodes)
-        self.import_relationships(nodes, rels)
+        self.normalize_sources(nodes, rels)
+        prepared_imports = self.prepare_imports(import_nodes, import_rels)
+        if preflight or dry_run:
+            self.print_audit_report(self.audit_imports(prepared_imports, nodes, rels))
+        if dry_run:
+            print(f"\n{GREEN}✅ Dry run complete; the database was not modified.{RESET}")
+            return True
+
+        if not resumed:
+            if not self.incremental:
+                if not self._nuke(recreate_store):
+                    return False
+                self.manifest.entries = {}
+            self.checkpoint.start(self.build_id, rule_fingerprint(plan),
+                                  [rule_id(r) for r in import_nodes + import_rels], self.incremental,
+                                  file_fingerprints=self.file_fingerprints)
+
+        self.create_constraints(nodes, rels)
+        if self.warm_queries:
+            self.warm_import_queries(import_nodes, import_rels)
+        statuses = self.run_imports(import_nodes, import_rels, prepared_imports)
+        self._sweep_removed_rules(removed)
+        self.manifest.save()
+        self.report_build(started)
+        if all(status == "SUCCESS" for status in statuses.values()):
+            self.checkpoint.clear()
+        else:
+            print(f"{YELLOW}⚠️  Some rules failed; fix them and rerun with --resume to import only those.{RESET}")
+        
+        if self.context:
+            stats_path = graphdb.dump_query_stats(self.debug_dir)
+            print(f"{CYAN}📈 Query timings written to {stats_path}{RESET}")
         
         print(f"\n{GREEN}✅ Build Sequence Complete. Check {self.log_path}{RESET}")
         return True
@@ -13,6 +13,7 @@ from neo4j_graphrag.experimental.components.types import PdfDocument, DocumentIn
 from neo4j_graphrag.experimental.components.text_splitters.base import TextSplitter
 
 from services.graph_service import graphdb, CYAN, GREEN, YELLOW, RED, RESET
+from services.cypher_templates import escape_identifier
 from services.gemini_graphrag import GeminiLLM, GeminiEmbedder
 from agents.schema_agent import BaseAgent
 
@@ -177,6 +178,9 @@ class KgPipelineAgent(BaseAgent):
                 print(f"{GREEN}✓ Processed {fname}. Created: {result.result}{RESET}")
             except Exception as e:
                 print(f"{RED}Error processing {fname}: {e}{RESET}")
+            finally:
+                # The pipeline writes through the raw driver, bypassing the service's cache invalidation
+                graphdb.clear_query_cache()
 
     def resolve_entities(self):
         """
@@ -196,56 +200,65 @@ class KgPipelineAgent(BaseAgent):
         WHERE NOT l STARTS WITH "__"
         RETURN collect(distinct l) as unique_labels
         """
-        res = graphdb.send_query(labels_q)
-        if not res or not res[0].get('unique_labels'):
-            print(f"{YELLOW}No extracted entities found to resolve.{RESET}")
-            return
+        # One session (and connection) for the label scan plus a check and merge per label
+        with graphdb.session_scope() as s:
+            if s is None:
+                print(f"{RED}Neo4j not connected.{RESET}")
+                return
+            res = s.execute_read(labels_q)
+            if not isinstance(res, list) or not res or not res[0].get('unique_labels'):
+                print(f"{YELLOW}No extracted entities found to resolve.{RESET}")
+                return
             
-        labels = res[0]['unique_labels']
-        print(f"Resolving Labels: {labels}")
+            labels = res[0]['unique_labels']
+            print(f"Resolving Labels: {labels}")
         
-        # 2. For each label, try to link to Domain nodes
-        # We hardcode the match key 'name' for simplicity.
-        # In a robust system, we would dynamically discover keys.
+            # 2. For each label, try to link to Domain nodes
+            # We hardcode the match key 'name' for simplicity.
+            # In a robust system, we would dynamically discover keys.
         
-        threshold = 0.85 
-        distance_threshold = 1.0 - threshold
+            threshold = 0.85 
+            distance_threshold = 1.0 - threshold
         
-        for label in labels:
-            print(f"Resolving {label}...")
+            for label in labels:
+                print(f"Resolving {label}...")
             
-            # Check if domain nodes exist
-            check_q = f"MATCH (n:{label}) WHERE NOT n:`__Entity__` RETURN count(n) as c"
-            check_res = graphdb.send_query(check_q)
-            if check_res and check_res[0]['c'] == 0:
-                print(f"  > No domain nodes for {label}, skipping.")
-                continue
+                # Check if domain nodes exist
+                check_q = f"MATCH (n:{escape_identifier(label)}) WHERE NOT n:`__Entity__` RETURN count(n) as c"
+                check_res = s.execute_read(check_q)
+                if isinstance(check_res, list) and check_res and check_res[0]['c'] == 0:
+                    print(f"  > No domain nodes for {label}, skipping.")
+                    continue
                 
-            # Run Jaro-Winkler Merge strategy
-            # We assume property is 'name' or 'id'
-            # Let's try 'name' -> 'name' mapping
+                # Run Jaro-Winkler Merge strategy
+                # We assume property is 'name' or 'id'
+                # Let's try 'name' -> 'name' mapping
             
-            query = f"""
-            MATCH (entity:{label}:`__Entity__`), (domain:{label})
-            WHERE NOT domain:`__Entity__`
-            AND entity.name IS NOT NULL AND domain.name IS NOT NULL
-            AND apoc.text.jaroWinklerDistance(entity.name, domain.name) < {distance_threshold}
-            MERGE (entity)-[r:CORRESPONDS_TO]->(domain)
-            ON CREATE SET r.created_at = datetime(), r.score = 1.0 - apoc.text.jaroWinklerDistance(entity.name, domain.name)
-            RETURN count(r) as connections
-            """
+                query = f"""
+                MATCH (entity:{escape_identifier(label)}:`__Entity__`), (domain:{escape_identifier(label)})
+                WHERE NOT domain:`__Entity__`
+                AND entity.name IS NOT NULL AND domain.name IS NOT NULL
+                AND apoc.text.jaroWinklerDistance(entity.name, domain.name) < $distance_threshold
+                MERGE (entity)-[r:CORRESPONDS_TO]->(domain)
+                ON CREATE SET r.created_at = datetime(), r.score = 1.0 - apoc.text.jaroWinklerDistance(entity.name, domain.name)
+                RETURN count(r) as connections
+                """
             
-            try:
-                link_res = graphdb.send_query(query)
-                count = link_res[0]['connections'] if link_res else 0
-                if count > 0:
-                    print(f"{GREEN}  > Linked {count} entities for {label}.{RESET}")
-                else:
-                    print(f"  > No matches found.")
-            except Exception as e:
-                print(f"{RED}  > Error resolving {label}: {e}{RESET}")
+                try:
+                    link_res = s.execute_write(query, {"distance_threshold": distance_threshold})
+                    if isinstance(link_res, dict):
+                        print(f"{RED}  > Error resolving {label}: {link_res['message']}{RESET}")
+                        continue
+                    count = link_res[0]['connections'] if link_res else 0
+                    if count > 0:
+                        print(f"{GREEN}  > Linked {count} entities for {label}.{RESET}")
+                    else:
+                        print(f"  > No matches found.")
+                except Exception as e:
+                    print(f"{RED}  > Error resolving {label}: {e}{RESET}")
                 
         self.log_extraction_stats()
+        graphdb.dump_query_stats(self.debug_dir)
 
     def log_extraction_stats(self):
         """Log all extracted entities to the build log."""
@@ -254,26 +267,20 @@ class KgPipelineAgent(BaseAgent):
         
         print(f"\n{CYAN}--- 📝 Logging Extracted Entities ---{RESET}")
         
-        query = "MATCH (n:`__Entity__`) RETURN n"
-        result = graphdb.send_query(query)
+        count_res = graphdb.send_query("MATCH (n:`__Entity__`) RETURN count(n) as c")
+        count = count_res[0]['c'] if isinstance(count_res, list) and count_res else 0
         
-        count = len(result) if result else 0
+        # Stream the entities straight into the log instead of loading them all at once
+        query = "MATCH (n:`__Entity__`) RETURN labels(n) as labels, properties(n) as props"
         
         try:
             os.makedirs(os.path.dirname(log_path), exist_ok=True)
             with open(log_path, 'a') as f:
                 f.write(f"\n## Unstructured Extraction Results ({count} Entities)\n")
-                if result:
-                    for record in result:
-                        node = record['n']
-                        if hasattr(node, 'labels'):
-                            lbls = list(node.labels)
-                        else:
-                            lbls = [] 
-                        
-                        labels = ":".join([l for l in lbls if l != '__Entity__'])
-                        props_dict = dict(node)
-                        props = json.dumps(props_dict, default=str)
+                if count:
+                    for record in graphdb.stream_query(query):
+                        labels = ":".join([l for l in record['labels'] if l != '__Entity__'])
+                        props = json.dumps(record['props'], default=str)
                         f.write(f"- (:{labels}) {props}\n")
             
             print(f"{GREEN}Logged {count} extracted entities to {log_path}{RESET}")
@@ -16,6 +16,15 @@ class BaseAgent:
     Base class for all Agents interacting with Gemini models.
     Handles API key validation, client initialization, and exponential backoff retry logic.
     """
+    # Tried in order by _generate
+    MODEL_CANDIDATES = [
+        'gemini-3-pro-preview', # Best quality
+        'gemini-1.5-pro',       # Reliable fallback
+        'gemini-2.0-flash-exp', 
+        'gemini-2.0-flash', 
+        'gemini-1.5-flash'
+    ]
+
     def __init__(self, api_key=None, debug_dir=None, module_name="BaseAgent"):
         """
         Initialize the BaseAgent.
@@ -72,13 +81,7 @@ class BaseAgent:
                 "reasoning": "SIMULATION MODE: No API Key provided."
             }), "simulation-model"
         
-        candidates = [
-            'gemini-3-pro-preview', # Best quality
-            'gemini-1.5-pro',       # Reliable fallback
-            'gemini-2.0-flash-exp', 
-            'gemini-2.0-flash', 
-            'gemini-1.5-flash'
-        ]
+        candidates = self.MODEL_CANDIDATES
         
         errors = []
         import re
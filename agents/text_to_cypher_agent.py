@@ -1,7 +1,7 @@
 import json
 import time
 import os
-from services.graph_service import graphdb
+from services.graph_service import graphdb, plan_estimated_rows
 from services.gemini_graphrag import GeminiLLM
 
 # ANSI Colors for CLI
@@ -151,7 +151,7 @@ Cypher: MATCH (o:Organization) RETURN o.name LIMIT 5
                     return None
                 
                 # Validate
-                is_valid, error = graphdb.validate_cypher(cypher)
+                is_valid, error, plan = graphdb.validate_cypher(cypher, return_plan=True)
                 
                 if is_valid:
                     # Don't log success here yet, wait for execution result to log everything in one block? 
@@ -162,6 +162,9 @@ Cypher: MATCH (o:Organization) RETURN o.name LIMIT 5
                     # No, retry loop might fail.
                     # I'll log as "Pending Execution" here.
                     self._log_conversation(user_input, cypher, None, model=used_model) # Log Generated Cypher
+                    estimated = plan_estimated_rows(plan)
+                    if estimated is not None:
+                        print(f"{CYAN}📐 Planner estimate: ~{estimated:.0f} rows{RESET}")
                     return cypher
                 else:
                     last_error = error
@@ -178,20 +181,29 @@ Cypher: MATCH (o:Organization) RETURN o.name LIMIT 5
         print(f"{RED}❌ Failed to generate valid Cypher after retries.{RESET}")
         return None
 
-    def execute_query(self, cypher):
+    def execute_query(self, cypher, max_results=1000):
+        """
+        Executes the generated Cypher, reading at most `max_results` records.
+        Unbounded answers are cut off instead of being pulled into memory whole.
+        """
         print(f"\n{CYAN}Generated Cypher:{RESET}\n{cypher}")
         start = time.time()
-        results = graphdb.send_query(cypher)
-        duration = time.time() - start
-        
-        if isinstance(results, dict) and "status" in results and results["status"] == "error":
-             print(f"{RED}Runtime Error: {results['message']}{RESET}")
+        # One extra record tells a complete answer from a cut-off one; cut-off answers are not cached
+        results = graphdb.send_query(cypher, cache=True, max_records=max_results + 1)
+        if not isinstance(results, list):
+             error = results.get("message") if isinstance(results, dict) else "No connection to Neo4j"
+             print(f"{RED}Runtime Error: {error}{RESET}")
              # Log runtime error
              with open(self.debug_log_path, "a") as f:
-                 f.write(f"**Runtime Error:** {results['message']}\n\n---\n")
+                 f.write(f"**Runtime Error:** {error}\n\n---\n")
              return None
+        truncated = len(results) > max_results
+        results = results[:max_results]
+        duration = time.time() - start
              
         print(f"{GREEN}✓ Executed in {duration:.2f}s{RESET}")
+        if truncated:
+            print(f"{YELLOW}⚠️ Result truncated to the first {max_results} records.{RESET}")
         
         # Log Execution Results
         try:
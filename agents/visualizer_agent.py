@@ -1,7 +1,9 @@
 import json
 import os
+import asyncio
 import webbrowser
-from services.graph_service import graphdb, CYAN, GREEN, YELLOW, RED, RESET
+from services.graph_service import graphdb, async_graphdb, CYAN, GREEN, YELLOW, RED, RESET
+from services.cypher_templates import escape_identifier, is_internal_property
 
 class VisualizerAgent:
     def __init__(self, context=None):
@@ -20,30 +22,32 @@ class VisualizerAgent:
         # 1. Fetch Schema Data
         print(f"{YELLOW}>> Querying Graph Meta-Data...{RESET}")
         
-        # A. Node Counts
         node_query = "MATCH (n) RETURN labels(n)[0] as label, count(n) as count"
-        node_res = graphdb.send_query(node_query)
-        nodes_counts = {r['label']: r['count'] for r in node_res} if node_res else {}
-        
-        # B. Relationship Counts
         rel_query = "MATCH (a)-[r]->(b) RETURN labels(a)[0] as source, type(r) as type, labels(b)[0] as target, count(r) as count"
-        rel_res = graphdb.send_query(rel_query)
-        rels_data = rel_res if rel_res else []
-        
-        # C. Property Schema (Drill-down info)
         prop_query = """
         CALL db.schema.nodeTypeProperties() 
         YIELD nodeType, propertyName, propertyTypes 
         RETURN nodeType, propertyName, propertyTypes
         """
-        try:
-            prop_res = graphdb.send_query(prop_query)
-        except:
-            prop_res = [] # Fallback if apoc/db procedure fails
+        with graphdb.session_scope(read_only=True) as s:
+            # A. Node Counts
+            node_res = s.send_query(node_query, cache=True)
+            nodes_counts = {r['label']: r['count'] for r in node_res} if isinstance(node_res, list) else {}
+            
+            # B. Relationship Counts
+            rel_res = s.send_query(rel_query, cache=True)
+            rels_data = rel_res if isinstance(rel_res, list) else []
+            
+            # C. Property Schema (Drill-down info)
+            prop_res = s.send_query(prop_query, cache=True)
+            if not isinstance(prop_res, list):
+                prop_res = [] # Fallback if apoc/db procedure fails
             
         # Organize Properties by Label
         node_props = {}
         for row in prop_res:
+            if is_internal_property(row['propertyName']):
+                continue  # build provenance, not data
             label = row['nodeType'].replace(":", "").replace("`", "") # Clean ":Label"
             if label not in node_props: node_props[label] = []
             
@@ -51,31 +55,9 @@ class VisualizerAgent:
             if prop_str not in node_props[label]:
                 node_props[label].append(prop_str)
             
-        # D. Hubs (Most connected nodes)
-        print(f"{YELLOW}>> Identifying Hubs...{RESET}")
-        hubs = {}
-        for label in nodes_counts.keys():
-            hub_query = f"""
-            MATCH (n:`{label}`)-[r]-()
-            WITH n, count(r) as degree
-            ORDER BY degree DESC LIMIT 1
-            RETURN n, degree
-            """
-            res = graphdb.send_query(hub_query)
-            if res:
-                props = res[0]['n']
-                # Try to find a readable name
-                name = props.get('name', props.get('id', props.get('title', str(props).strip("{}"))))
-                hubs[label] = {"name": name, "degree": res[0]['degree']}
-            
-        # E. Sample Data (5 random nodes per label)
-        print(f"{YELLOW}>> Fetching Sample Data...{RESET}")
-        samples = {}
-        for label in nodes_counts.keys():
-            sample_query = f"MATCH (n:`{label}`) RETURN n LIMIT 5"
-            res = graphdb.send_query(sample_query)
-            if res:
-                samples[label] = [r['n'] for r in res]
+        # D/E. Hubs (Most connected nodes) and Sample Data (5 random nodes per label)
+        print(f"{YELLOW}>> Identifying Hubs & Fetching Sample Data...{RESET}")
+        hubs, samples = asyncio.run(self._fetch_label_details(list(nodes_counts.keys())))
             
         # F. Anomalies
         anomalies = []
@@ -101,6 +83,8 @@ class VisualizerAgent:
             f.write(html_content)
             
         print(f"{GREEN}Visualization saved to: {self.output_file}{RESET}")
+        if self.context:
+            graphdb.dump_query_stats(self.context.debug_dir)
         try:
             abs_path = "file://" + os.path.abspath(self.output_file)
             print(f"Opening {abs_path}...")
@@ -110,6 +94,41 @@ class VisualizerAgent:
         
         return anomalies
 
+    async def _fetch_label_details(self, labels):
+        """
+        Fetches the hub and sample nodes of every label concurrently.
+        The per-label queries are independent, so they overlap on the async pool.
+        """
+        queries = []
+        for label in labels:
+            queries.append(f"""
+            MATCH (n:{escape_identifier(label)})-[r]-()
+            WITH n, count(r) as degree
+            ORDER BY degree DESC LIMIT 1
+            RETURN n, degree
+            """)
+            queries.append((f"MATCH (n:{escape_identifier(label)}) RETURN n LIMIT $limit", {"limit": 5}))
+
+        try:
+            results = await async_graphdb.send_queries(queries)
+        finally:
+            await async_graphdb.close()
+
+        hubs = {}
+        samples = {}
+        for i, label in enumerate(labels):
+            res = results[2 * i]
+            if isinstance(res, list) and res:
+                props = res[0]['n']
+                # Try to find a readable name
+                name = props.get('name', props.get('id', props.get('title', str(props).strip("{}"))))
+                hubs[label] = {"name": name, "degree": res[0]['degree']}
+
+            res = results[2 * i + 1]
+            if isinstance(res, list) and res:
+                samples[label] = [{k: v for k, v in r['n'].items() if not is_internal_property(k)} for r in res]
+        return hubs, samples
+
     def _generate_html(self, nodes, rels, props, hubs, samples, anomalies):
         vis_nodes = []
         vis_edges = []
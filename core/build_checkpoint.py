@@ -0,0 +1,102 @@
+import datetime
+import json
+import os
+import threading
+
+CHECKPOINT_FILE = 'build_checkpoint.json'
+
+
+class BuildCheckpoint:
+    """
+    Progress of the running build, stored in the context next to system_state.json:
+    the rules it imports, those already completed and the last committed row offset
+    of partially streamed rules. A resumed build skips completed rules and continues
+    streamed files from their offset. Removed once a build finishes without errors.
+    Thread-safe; every change is written through to disk.
+    """
+    def __init__(self, base_path='data'):
+        self.base_path = base_path
+        self.path = os.path.join(base_path, CHECKPOINT_FILE)
+        self._lock = threading.Lock()
+        self.state = self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                pass
+        return {}
+
+    def _save(self):
+        self.state["updated"] = str(datetime.datetime.now())
+        os.makedirs(self.base_path, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def start(self, build_id, plan_fingerprint, rule_ids, incremental=False, file_fingerprints=None):
+        """
+        Starts tracking a new build, replacing any previous checkpoint.
+        `file_fingerprints` (rule id -> source file sha256) tell a resumed build which
+        offsets still point into the same file (see `drop_changed_offsets`).
+        """
+        with self._lock:
+            self.state = {
+                "build_id": build_id,
+                "plan": plan_fingerprint,
+                "incremental": incremental,
+                "rules": list(rule_ids),
+                "files": dict(file_fingerprints or {}),
+                "completed": [],
+                "offsets": {},
+            }
+            self._save()
+
+    def complete(self, rid):
+        with self._lock:
+            if rid not in self.state["completed"]:
+                self.state["completed"].append(rid)
+            self.state["offsets"].pop(rid, None)
+            self._save()
+
+    def advance(self, rule_ids, rows):
+        """Records that the first `rows` source rows of these rules are committed."""
+        with self._lock:
+            for rid in rule_ids:
+                self.state["offsets"][rid] = rows
+            self._save()
+
+    def offset(self, rule_ids):
+        """Source rows to skip for a task importing `rule_ids` (0 unless all of them got that far)."""
+        with self._lock:
+            offsets = self.state.get("offsets", {})
+            return min((offsets.get(rid, 0) for rid in rule_ids), default=0)
+
+    def drop_changed_offsets(self, file_fingerprints):
+        """
+        Forgets the offsets of rules whose source file is not the one they were counted
+        in, so those rules restart from the first row. Returns the affected rule ids.
+        """
+        with self._lock:
+            files = self.state.get("files", {})
+            offsets = self.state.get("offsets", {})
+            changed = [rid for rid in offsets if files.get(rid) != file_fingerprints.get(rid)]
+            for rid in changed:
+                del offsets[rid]
+            if changed:
+                self._save()
+            return changed
+
+    def pending(self):
+        """Rule ids of the checkpointed build that have not completed."""
+        completed = set(self.state.get("completed", []))
+        return [rid for rid in self.state.get("rules", []) if rid not in completed]
+
+    def clear(self):
+        with self._lock:
+            self.state = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
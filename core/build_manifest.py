@@ -0,0 +1,102 @@
+import datetime
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = 'build_manifest.json'
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """sha256 of a file's contents, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def rule_fingerprint(rule):
+    """sha256 of a construction-plan rule, independent of key order."""
+    return hashlib.sha256(json.dumps(rule, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def rule_id(rule):
+    """
+    Stable identity of a rule across builds (its position in the plan may change).
+    Also stamped on imported entities (`_kg_rules`) for provenance.
+    """
+    source = os.path.basename(rule.get('source_file') or '')
+    if 'label' in rule:
+        return f"node:{rule['label']}:{source}"
+    rel_type = rule.get('relationship_type', rule.get('type'))
+    return f"rel:{rel_type}:{rule.get('from_node_label')}:{rule.get('to_node_label')}:{source}"
+
+
+class BuildManifest:
+    """
+    Fingerprints of the source file and rule of every successfully imported rule,
+    stored in the context next to system_state.json. Incremental builds compare
+    against it to re-import only what changed.
+    """
+    def __init__(self, base_path='data'):
+        self.base_path = base_path
+        self.path = os.path.join(base_path, MANIFEST_FILE)
+        self.entries = self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f).get("rules", {})
+            except (json.JSONDecodeError, AttributeError):
+                pass
+        return {}
+
+    def save(self):
+        os.makedirs(self.base_path, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({"last_updated": str(datetime.datetime.now()), "rules": self.entries}, f, indent=2)
+
+    def record(self, rule, file_fp, build_id):
+        self.entries[rule_id(rule)] = {
+            "rule": rule_fingerprint(rule),
+            "file": file_fp,
+            "build": build_id,
+            "label": rule.get('label'),
+            "relationship_type": rule.get('relationship_type', rule.get('type')),
+        }
+
+    def is_current(self, rule, file_fp):
+        entry = self.entries.get(rule_id(rule))
+        return bool(entry) and entry["rule"] == rule_fingerprint(rule) and entry["file"] == file_fp
+
+    def removed(self, rules):
+        """Entries of rules that are no longer in the plan."""
+        current = {rule_id(r) for r in rules}
+        return {rid: entry for rid, entry in self.entries.items() if rid not in current}
+
+
+def plan_delta(manifest, nodes, relationships, file_fingerprints):
+    """
+    Splits the plan into the rules an incremental build must re-import.
+
+    A rule is changed when its rule text or source file differs from the manifest.
+    Relationship rules are also re-imported when a node rule of either endpoint label
+    changed, because new endpoint nodes may now match rows that found nothing before.
+
+    Args:
+        file_fingerprints (dict): rule id -> fingerprint of the rule's source file
+
+    Returns:
+        tuple: (changed_nodes, changed_relationships, removed_entries)
+    """
+    changed_nodes = [n for n in nodes if not manifest.is_current(n, file_fingerprints.get(rule_id(n)))]
+    changed_labels = {n['label'] for n in changed_nodes}
+    changed_rels = [
+        r for r in relationships
+        if not manifest.is_current(r, file_fingerprints.get(rule_id(r)))
+        or r.get('from_node_label') in changed_labels or r.get('to_node_label') in changed_labels
+    ]
+    return changed_nodes, changed_rels, manifest.removed(nodes + relationships)
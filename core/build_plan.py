@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ImportTask:
+    """
+    One import rule of the construction plan as a node of the build DAG.
+
+    `depends_on` are keys of tasks that must succeed first; `locks` are labels the
+    task writes to. Two tasks sharing a label never run at the same time, which
+    keeps concurrent MERGEs from contending for (or deadlocking on) the same nodes.
+    """
+    key: str
+    kind: str
+    rule: dict
+    depends_on: set = field(default_factory=set)
+    locks: set = field(default_factory=set)
+
+
+def relationship_type(rel):
+    return rel.get('relationship_type', rel.get('type'))
+
+
+def node_key_column(node):
+    return node.get('unique_column_name', node.get('unique_id', 'id'))
+
+
+def is_row_local(rel, nodes):
+    """
+    True when both endpoints of `rel` are created by `nodes` from the same row the
+    relationship is read from (same key column), so a single pass over the file can
+    write the nodes and then the relationship without missing rows further down.
+    """
+    by_label = {n['label']: n for n in nodes}
+    for label, column in ((rel.get('from_node_label'), rel.get('from_node_column', 'id')),
+                          (rel.get('to_node_label'), rel.get('to_node_column', 'id'))):
+        node = by_label.get(label)
+        if node is None or node_key_column(node) != column:
+            return False
+    return True
+
+
+def match_key_indexes(nodes, relationships):
+    """
+    (label, property) pairs relationship rules MATCH their endpoints on that no
+    uniqueness constraint indexes, i.e. the indexes the build must add so each
+    relationship row is an index seek instead of a label scan. Sorted, no duplicates.
+    """
+    constrained = {(n['label'], node_key_column(n)) for n in nodes}
+    keys = set()
+    for rel in relationships:
+        keys.add((rel.get('from_node_label'), rel.get('from_node_column', 'id')))
+        keys.add((rel.get('to_node_label'), rel.get('to_node_column', 'id')))
+    return sorted(k for k in keys - constrained if k[0])
+
+
+def group_rules_by_file(nodes, relationships, source_file_of):
+    """
+    Groups rules reading the same file so it can be imported in one pass.
+
+    A group holds every node rule of a file plus the relationship rules of that file
+    that are row-local to those nodes. Only files with at least two such rules form
+    a group; everything else is returned as is.
+
+    Args:
+        source_file_of (callable): rule -> source file (relationships may inherit it).
+
+    Returns:
+        tuple: (groups, remaining_nodes, remaining_relationships) where each group is
+        {"source_file": ..., "nodes": [...], "relationships": [...]}
+    """
+    files = {}
+    for node in nodes:
+        files.setdefault(source_file_of(node), {"nodes": [], "relationships": []})["nodes"].append(node)
+    for rel in relationships:
+        group = files.get(source_file_of(rel))
+        if group and is_row_local(rel, group["nodes"]):
+            group["relationships"].append(rel)
+
+    groups = []
+    grouped = set()
+    for source_file, group in files.items():
+        if source_file and len(group["nodes"]) + len(group["relationships"]) > 1:
+            groups.append({"source_file": source_file, **group})
+            grouped.update(id(r) for r in group["nodes"] + group["relationships"])
+    return (groups,
+            [n for n in nodes if id(n) not in grouped],
+            [r for r in relationships if id(r) not in grouped])
+
+
+def build_import_dag(nodes, relationships, groups=()):
+    """
+    Parses node and relationship rules into a list of ImportTasks.
+
+    Node rules depend on nothing (rules sharing a label are serialized by their lock).
+    A relationship rule depends on every node rule of both of its endpoint labels;
+    endpoints without a node rule in the plan impose no dependency. Each file group
+    (see `group_rules_by_file`) becomes one task that provides all of its labels.
+    """
+    tasks = []
+    node_tasks_by_label = {}
+    for i, group in enumerate(groups):
+        labels = {n['label'] for n in group["nodes"]}
+        task = ImportTask(key=f"file:{i}:{os.path.basename(group['source_file'])}", kind="file", rule=group,
+                          locks=labels | {label for r in group["relationships"]
+                                          for label in (r.get('from_node_label'), r.get('to_node_label')) if label})
+        for label in labels:
+            node_tasks_by_label.setdefault(label, []).append(task.key)
+        tasks.append(task)
+
+    for i, node in enumerate(nodes):
+        task = ImportTask(key=f"node:{i}:{node['label']}", kind="node", rule=node, locks={node['label']})
+        node_tasks_by_label.setdefault(node['label'], []).append(task.key)
+        tasks.append(task)
+
+    for i, rel in enumerate(relationships):
+        endpoints = {rel.get('from_node_label'), rel.get('to_node_label')} - {None}
+        depends_on = {key for label in endpoints for key in node_tasks_by_label.get(label, [])}
+        tasks.append(ImportTask(key=f"rel:{i}:{relationship_type(rel)}", kind="relationship", rule=rel,
+                                depends_on=depends_on, locks=endpoints))
+    return tasks
+
+
+def run_import_dag(tasks, worker, max_workers=4, on_skip=None):
+    """
+    Runs `worker(task)` for every task on a thread pool of `max_workers`, starting each
+    task once its dependencies have succeeded and none of its label locks are held.
+
+    `worker` returns True on success. Tasks whose dependency failed are not run;
+    `on_skip(task, failed_dependencies)` is called for them instead.
+
+    Returns:
+        dict: task key -> "SUCCESS", "ERROR" or "SKIPPED"
+    """
+    max_workers = max(1, max_workers)
+    status = {}
+    pending = list(tasks)
+    running = {}
+    held_locks = set()
+
+    def _run(task):
+        try:
+            return bool(worker(task))
+        except Exception as e:
+            print(f"Import task {task.key} crashed: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            skipped = False
+            for task in list(pending):
+                failed = {d for d in task.depends_on if status.get(d) in ("ERROR", "SKIPPED")}
+                if failed:
+                    pending.remove(task)
+                    status[task.key] = "SKIPPED"
+                    skipped = True
+                    if on_skip:
+                        on_skip(task, failed)
+                    continue
+                ready = all(status.get(d) == "SUCCESS" for d in task.depends_on)
+                if ready and not (task.locks & held_locks) and len(running) < max_workers:
+                    pending.remove(task)
+                    held_locks |= task.locks
+                    running[pool.submit(_run, task)] = task
+
+            if not running:
+                if skipped:
+                    continue  # dependents of the tasks just skipped are handled on the next pass
+                # Only reachable with a dependency that is not in `tasks`
+                for task in pending:
+                    status[task.key] = "SKIPPED"
+                    if on_skip:
+                        on_skip(task, task.depends_on - set(status))
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                held_locks -= task.locks
+                status[task.key] = "SUCCESS" if future.result() else "ERROR"
+    return status
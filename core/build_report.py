@@ -0,0 +1,125 @@
+import datetime
+import glob
+import json
+import os
+
+REPORTS_DIR = 'build_reports'
+# Rows/sec drop (fraction) flagged as a regression against the previous run
+REGRESSION_THRESHOLD = 0.2
+
+RULE_FIELDS = ["step", "status", "rows", "nodes_created", "relationships_created", "properties_set",
+               "seconds", "rows_per_sec", "batch_size"]
+
+
+def reports_dir(base_path):
+    return os.path.join(base_path, REPORTS_DIR)
+
+
+def build_report(build_id, rules, started, finished, settings=None):
+    """
+    Structured report of one build: one entry per import step with rows read,
+    summary counters, wall time and throughput, plus totals.
+    """
+    totals = {field: sum(r.get(field) or 0 for r in rules)
+              for field in ("rows", "nodes_created", "relationships_created", "properties_set")}
+    seconds = round(finished - started, 3)
+    return {
+        "build_id": build_id,
+        "started": str(datetime.datetime.fromtimestamp(started)),
+        "seconds": seconds,
+        "settings": settings or {},
+        "totals": {**totals, "rows_per_sec": round(totals["rows"] / seconds, 1) if seconds > 0 else None},
+        "rules": [{field: r.get(field) for field in RULE_FIELDS} for r in rules],
+    }
+
+
+def save_report(base_path, report, rendered=None):
+    """
+    Writes `build_<id>.json` (and the rendered summary as `build_<id>.md`) under the
+    context's build_reports directory. Returns the JSON path.
+    """
+    directory = reports_dir(base_path)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"build_{report['build_id']}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    if rendered is not None:
+        with open(os.path.join(directory, f"build_{report['build_id']}.md"), 'w') as f:
+            f.write(f"```text\n{rendered}\n```\n")
+    return path
+
+
+def load_previous_report(base_path, exclude_build_id=None):
+    """Most recent saved report other than `exclude_build_id`, or None."""
+    paths = sorted(glob.glob(os.path.join(reports_dir(base_path), "build_*.json")), key=os.path.getmtime, reverse=True)
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                report = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+        if report.get("build_id") != exclude_build_id:
+            return report
+    return None
+
+
+def _change(current, previous):
+    if not current or not previous:
+        return None
+    return round((current - previous) / previous, 3)
+
+
+def diff_reports(current, previous, threshold=REGRESSION_THRESHOLD):
+    """
+    Compares each step with the same step of the previous run.
+
+    Returns:
+        list: {"step", "rows_per_sec", "previous_rows_per_sec", "change", "regression"}
+              where `change` is the relative rows/sec change (None when not comparable)
+    """
+    before = {r["step"]: r for r in (previous or {}).get("rules", [])}
+    diff = []
+    for rule in current["rules"]:
+        old = before.get(rule["step"])
+        change = _change(rule.get("rows_per_sec"), old.get("rows_per_sec") if old else None)
+        diff.append({
+            "step": rule["step"],
+            "rows_per_sec": rule.get("rows_per_sec"),
+            "previous_rows_per_sec": old.get("rows_per_sec") if old else None,
+            "change": change,
+            "regression": change is not None and change <= -threshold,
+        })
+    return diff
+
+
+def render_report(report, diff=None):
+    """Plain-text table of a report, with the rows/sec change against the previous run."""
+    changes = {d["step"]: d for d in diff or []}
+    lines = [
+        f"Build {report['build_id']} ({report['seconds']:.1f}s)",
+        f"{'Step':<36} {'Status':<8} {'Rows':>10} {'Nodes+':>9} {'Rels+':>9} {'Props':>10} {'Secs':>8} {'Rows/s':>10}  vs prev",
+    ]
+    for r in report["rules"]:
+        d = changes.get(r["step"])
+        if d is None or d["change"] is None:
+            trend = "-"
+        else:
+            trend = f"{d['change']:+.0%}" + ("  REGRESSION" if d["regression"] else "")
+        lines.append(
+            f"{r['step']:<36} {r['status']:<8} {_fmt(r['rows']):>10} {_fmt(r['nodes_created']):>9} "
+            f"{_fmt(r['relationships_created']):>9} {_fmt(r['properties_set']):>10} {r['seconds'] or 0:>8.1f} "
+            f"{_fmt(r['rows_per_sec']):>10}  {trend}"
+        )
+    t = report["totals"]
+    lines.append(
+        f"{'TOTAL':<36} {'':<8} {_fmt(t['rows']):>10} {_fmt(t['nodes_created']):>9} "
+        f"{_fmt(t['relationships_created']):>9} {_fmt(t['properties_set']):>10} {report['seconds']:>8.1f} "
+        f"{_fmt(t['rows_per_sec']):>10}"
+    )
+    return "\n".join(lines)
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    return f"{value:.0f}" if isinstance(value, float) else str(value)
@@ -0,0 +1,114 @@
+import csv
+import queue
+import threading
+from collections import deque
+from itertools import islice
+
+_DONE = object()
+
+
+def iter_csv_rows(path, headers=True, text_rows=False):
+    """
+    Streams a source file as the rows LOAD CSV would bind, without loading it in memory.
+
+    - `headers`: dicts keyed by the header line, empty fields as None (LOAD CSV WITH HEADERS).
+    - no headers: lists of fields (LOAD CSV).
+    - `text_rows`: {"ln": line number (1-based), "text": first field} maps, matching
+      the text-file source of `cypher_templates.load_csv_source`.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if text_rows:
+            for ln, fields in enumerate(csv.reader(f), start=1):
+                yield {"ln": ln, "text": fields[0] if fields else None}
+        elif headers:
+            for row in csv.DictReader(f):
+                yield {k: (v if v != '' else None) for k, v in row.items() if k is not None}
+        else:
+            yield from csv.reader(f)
+
+
+def prefetch_rows(rows, batch_size, max_batches=4):
+    """
+    Reads `rows` on a background thread in chunks of `batch_size`, keeping at most
+    `max_batches` chunks queued. Parsing overlaps with the consumer's database writes
+    while the queue bound caps memory when the database is the slower side.
+    Reader errors are re-raised in the consumer.
+    """
+    pending = queue.Queue(maxsize=max(1, max_batches))
+    stop = threading.Event()
+
+    def _put(item):
+        # Give up when the consumer has stopped iterating
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader():
+        try:
+            iterator = iter(rows)
+            while True:
+                chunk = list(islice(iterator, batch_size))
+                if not chunk or not _put(chunk):
+                    break
+        except Exception as e:
+            _put(e)
+        finally:
+            _put(_DONE)
+
+    thread = threading.Thread(target=_reader, name="csv-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = pending.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+    finally:
+        stop.set()
+        thread.join(timeout=1)
+
+
+class TransformedRows:
+    """
+    Iterates `transform` (rows -> rows, e.g. a fast-load dedup filter) applied to one
+    source row at a time, and maps a count of written output rows back to the source
+    rows they complete. Resume offsets then stay in source rows even when the transform
+    drops rows or emits several per source row (split rules).
+    Iterated on the prefetch thread while `source_rows_done` is called by the writer.
+    """
+    def __init__(self, rows, transform, start=0):
+        self._rows = rows
+        self._transform = transform
+        self._start = start
+        self._done = start
+        # (output rows emitted, source rows complete), ascending; rows without output share a mark
+        self._marks = deque()
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        emitted = 0
+        for n, row in enumerate(self._rows, start=self._start + 1):
+            for out in self._transform((row,)):
+                emitted += 1
+                yield out
+            with self._lock:
+                if self._marks and self._marks[-1][0] == emitted:
+                    self._marks[-1] = (emitted, n)
+                else:
+                    self._marks.append((emitted, n))
+
+    def source_rows_done(self, written):
+        """
+        Source rows (counting skipped ones) whose output rows are all among the first
+        `written`. Errs low while the reader has not moved past a row yet.
+        """
+        with self._lock:
+            while self._marks and self._marks[0][0] <= written:
+                self._done = self._marks.popleft()[1]
+        return self._done
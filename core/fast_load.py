@@ -0,0 +1,85 @@
+# Initial loads into an empty database: duplicate node keys and (source, target)
+# pairs are dropped in Python with hash sets so survivors can be written with plain
+# CREATE (see cypher_templates.create_*_query) instead of MERGE, which pays an index
+# lookup per node row and an existence check per relationship pair.
+# The first row seen for a key wins; rows without a key are dropped (MERGE fails on them).
+# Only labels fed by a single node rule qualify: a second rule's rows would carry other
+# properties for keys already created, which MERGE + SET writes and CREATE cannot.
+from core.build_manifest import rule_id
+from services.cypher_templates import (
+    SPLIT_COLUMN, SPLIT_DELIMITER, is_split_rule, is_text_source, node_key, text_property
+)
+
+
+def seen_key(rule):
+    """
+    Identity of the seen-set a rule deduplicates against: its label for a node rule (the
+    only rule of a fast-loaded label, see `fast_load_labels`); for a relationship rule, the
+    rule and the key properties its (source, target) values are matched on.
+    """
+    if 'label' in rule:
+        return ("node", rule['label'])
+    return ("rel", rule_id(rule), rule.get('from_node_column', 'id'), rule.get('to_node_column', 'id'))
+
+
+def node_rows(rows, node, filename, seen):
+    """
+    Property maps of the nodes a node rule would MERGE, each key once.
+
+    Args:
+        rows: Rows as bound by LOAD CSV (`core.csv_stream.iter_csv_rows`).
+        seen (set): Keys already created for this label.
+    """
+    key = node_key(node)
+    if is_split_rule(node):
+        for row in rows:
+            for item in (row.get(SPLIT_COLUMN) or "").split(SPLIT_DELIMITER):
+                item = item.strip()
+                if item and item not in seen:
+                    seen.add(item)
+                    yield {key: item}
+    elif is_text_source(filename):
+        text_prop = text_property(node)
+        for row in rows:
+            line_key = str(row["ln"])
+            if row["text"] is None or line_key in seen:
+                continue
+            seen.add(line_key)
+            yield {key: line_key, text_prop: row["text"]}
+    else:
+        props = [p for p in node.get('properties', []) if p != key]
+        for row in rows:
+            value = row.get(key)
+            if value is None or value in seen:
+                continue
+            seen.add(value)
+            yield {key: value, **{p: row[p] for p in props if row.get(p) is not None}}
+
+
+def relationship_rows(rows, rel, seen):
+    """
+    {"source", "target"} key pairs of a relationship rule, each pair once.
+
+    Args:
+        seen (set): Pairs already created by this rule (see `seen_key`).
+    """
+    source_column = rel.get('from_node_column', 'id')
+    target_column = rel.get('to_node_column', 'id')
+    for row in rows:
+        pair = (row.get(source_column), row.get(target_column))
+        if None in pair or pair in seen:
+            continue
+        seen.add(pair)
+        yield {"source": pair[0], "target": pair[1]}
+
+
+def fast_load_labels(nodes):
+    """
+    Labels that can be created without MERGE: those fed by exactly one node rule.
+    Labels shared by several rules keep MERGE, so each rule still sets its properties
+    on nodes another rule created.
+    """
+    rules = {}
+    for node in nodes:
+        rules[node['label']] = rules.get(node['label'], 0) + 1
+    return {label for label, count in rules.items() if count == 1}
@@ -0,0 +1,72 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+
+CACHE_FILE = 'llm_query_cache.json'
+
+
+class LLMQueryCache:
+    """
+    Import Cypher generated by the LLM, stored in the context so rebuilds do not
+    call the model again. Entries are keyed by a hash of the rule, the task
+    description and the model, so editing a rule invalidates its entry.
+    Thread-safe; every change is written through to disk.
+    """
+    def __init__(self, base_path='data'):
+        self.base_path = base_path
+        self.path = os.path.join(base_path, CACHE_FILE)
+        self._lock = threading.Lock()
+        self.entries = self.load()
+
+    @staticmethod
+    def make_key(rule, task, model):
+        payload = json.dumps({"rule": rule, "task": task, "model": model}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                pass
+        return {}
+
+    def _save(self):
+        os.makedirs(self.base_path, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            return dict(entry) if entry else None
+
+    def put(self, key, query, model, task, rule_id):
+        """Stores a generated query, replacing older entries for the same rule and task."""
+        with self._lock:
+            for stale in [k for k, e in self.entries.items() if e.get("rule_id") == rule_id and e.get("task") == task]:
+                del self.entries[stale]
+            self.entries[key] = {
+                "query": query,
+                "model": model,
+                "task": task,
+                "rule_id": rule_id,
+                "created": str(datetime.datetime.now()),
+                "last_success": None,
+                "success_count": 0,
+            }
+            self._save()
+
+    def mark_success(self, key):
+        """Records that the cached query imported successfully."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry:
+                entry["last_success"] = str(datetime.datetime.now())
+                entry["success_count"] = entry.get("success_count", 0) + 1
+                self._save()
@@ -0,0 +1,82 @@
+import re
+
+# Operators that read every node of a label (or the whole graph) instead of seeking an index
+SCAN_OPERATORS = {"NodeByLabelScan", "AllNodesScan"}
+SCAN_DETAILS_RE = re.compile(r"^\s*`?(\w+)`?\s*:\s*`?([^`\s]+)`?")
+
+LARGE_ESTIMATE = 1_000_000
+
+
+def operator_name(op):
+    """Operator type without the runtime suffix ("NodeByLabelScan@neo4j" -> "NodeByLabelScan")."""
+    return (op.get("operatorType") or "").split("@")[0]
+
+
+def walk_plan(plan):
+    """Yields every operator of an EXPLAIN plan dict, depth first."""
+    if not isinstance(plan, dict):
+        return
+    stack = [plan]
+    while stack:
+        op = stack.pop()
+        yield op
+        stack.extend(reversed(op.get("children") or []))
+
+
+def _details(op):
+    return (op.get("args") or {}).get("Details") or ""
+
+
+def scanned_keys(plan):
+    """
+    (label, property) pairs looked up through a label scan plus filter instead of an
+    index. The property comes from Filter operators on the scanned variable; it is
+    None when the scan is unfiltered.
+    """
+    ops = list(walk_plan(plan))
+    filters = " ".join(_details(op) for op in ops if operator_name(op) == "Filter")
+    keys = set()
+    for op in ops:
+        if operator_name(op) not in SCAN_OPERATORS:
+            continue
+        match = SCAN_DETAILS_RE.match(_details(op))
+        if not match:
+            keys.add((None, None))  # AllNodesScan
+            continue
+        var, label = match.groups()
+        props = re.findall(rf"\b{re.escape(var)}\.`?(\w+)`?\s*=", filters)
+        for prop in props or [None]:
+            keys.add((label, prop))
+    return keys
+
+
+def audit_plan(plan, planned_indexes=()):
+    """
+    Summarizes the risk of one import statement from its EXPLAIN plan.
+
+    Args:
+        planned_indexes: (label, property) pairs the build will index before importing
+            (its uniqueness constraints); scans on those are not reported.
+
+    Returns:
+        dict: estimated_rows (largest estimate of any operator), eager (number of Eager
+        operators, which make LOAD CSV materialize the whole file), missing_indexes
+        ("Label.property" strings) and risk ("HIGH", "MEDIUM" or "LOW").
+    """
+    ops = list(walk_plan(plan))
+    estimates = [(op.get("args") or {}).get("EstimatedRows") for op in ops]
+    estimated_rows = max((e for e in estimates if e is not None), default=None)
+    eager = sum(1 for op in ops if operator_name(op).startswith("Eager"))
+    missing = sorted(
+        f"{label or '*'}.{prop or '*'}"
+        for label, prop in scanned_keys(plan)
+        if (label, prop) not in set(planned_indexes)
+    )
+
+    if eager or missing:
+        risk = "HIGH"
+    elif estimated_rows is not None and estimated_rows >= LARGE_ESTIMATE:
+        risk = "MEDIUM"
+    else:
+        risk = "LOW"
+    return {"estimated_rows": estimated_rows, "eager": eager, "missing_indexes": missing, "risk": risk}
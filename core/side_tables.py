@@ -0,0 +1,80 @@
+import csv
+import os
+import shutil
+from core.csv_stream import iter_csv_rows
+
+NORMALIZED_DIR = '.kg_normalized'
+
+
+def split_values(text, delimiter):
+    """Items of a multi-valued field, trimmed, without empties (as `split`/`trim` in Cypher)."""
+    return [item.strip() for item in (text or "").split(delimiter) if item.strip()]
+
+
+def side_table_dir(data_dir, fingerprint):
+    """Side tables of one version of a source file, inside the data directory (the LOAD CSV root)."""
+    return os.path.join(data_dir, NORMALIZED_DIR, fingerprint[:16])
+
+
+def side_table_paths(out_dir, source_path, column, value_header, link_keys=()):
+    """
+    Returns:
+        tuple: (values path, {link key column: links path})
+    """
+    stem = f"{os.path.splitext(os.path.basename(source_path))[0]}.{column}.{value_header}"
+    return (os.path.join(out_dir, f"{stem}.values.csv"),
+            {key: os.path.join(out_dir, f"{stem}.{key}.links.csv") for key in link_keys})
+
+
+def _write_csv(path, header, rows):
+    # Written under a temporary name so an interrupted run never leaves a partial table behind
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+
+def normalize_column(source_path, column, out_dir, value_header, link_keys=(), delimiter=","):
+    """
+    Explodes a multi-valued column in a single pass over the source into:
+    - a value table (header `value_header`) with every distinct item, and
+    - per key column in `link_keys`, a link table (header key, `value_header`) with
+      every distinct (row key, item) pair.
+    Existing tables in `out_dir` are reused, so callers key `out_dir` by the source
+    fingerprint (see `side_table_dir`).
+
+    Returns:
+        tuple: (values path, {link key column: links path}, cached)
+    """
+    values_path, link_paths = side_table_paths(out_dir, source_path, column, value_header, link_keys)
+    if all(os.path.exists(p) for p in [values_path, *link_paths.values()]):
+        return values_path, link_paths, True
+
+    values = {}
+    links = {key: {} for key in link_keys}
+    for row in iter_csv_rows(source_path):
+        for item in split_values(row.get(column), delimiter):
+            values[item] = None
+            for key in link_keys:
+                if row.get(key) is not None:
+                    links[key][(row[key], item)] = None
+
+    os.makedirs(out_dir, exist_ok=True)
+    _write_csv(values_path, [value_header], ([v] for v in values))
+    for key, path in link_paths.items():
+        _write_csv(path, [key, value_header], links[key])
+    return values_path, link_paths, False
+
+
+def prune_side_tables(data_dir, keep):
+    """Deletes side tables of source versions not in `keep` (directories from `side_table_dir`)."""
+    root = os.path.join(data_dir, NORMALIZED_DIR)
+    if not os.path.isdir(root):
+        return
+    keep = {os.path.abspath(d) for d in keep}
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and os.path.abspath(path) not in keep:
+            shutil.rmtree(path, ignore_errors=True)
@@ -12,6 +12,8 @@ except:
     pass
 
 from core.context import Context
+from core.build_manifest import MANIFEST_FILE
+from core.build_checkpoint import CHECKPOINT_FILE
 from services.container_service import ContainerService
 from state_manager import StateManager
 from agents.schema_agent import SchemaRefinementLoop
@@ -29,7 +31,7 @@ RED = "\033[91m"
 RESET = "\033[0m"
 
 class Orchestrator:
-    def __init__(self, context: Context, cli_mode=False):
+    def __init__(self, context: Context, cli_mode=False, slow_query_ms=None, profile_slow_queries=False):
         self.context = context
         self.cli_mode = cli_mode
         self.sm = StateManager(base_path=self.context.base_path) 
@@ -37,6 +39,12 @@ class Orchestrator:
         self.api_key = self._setup_api_key()
         
         self.context.ensure_directories()
+
+        # Slow statements go to debug/slow_queries.jsonl (threshold from CLI or NEO4J_SLOW_QUERY_MS)
+        if slow_query_ms is None and os.getenv("NEO4J_SLOW_QUERY_MS"):
+            slow_query_ms = float(os.getenv("NEO4J_SLOW_QUERY_MS"))
+        if slow_query_ms is not None:
+            graphdb.configure_slow_query_log(slow_query_ms, self.context.debug_dir, profile=profile_slow_queries)
         
         # Rotate logs on startup
         # Rotation handled on module initialization
@@ -183,19 +191,34 @@ class Orchestrator:
         if not self.cli_mode:
             input(f"\n{CYAN}Press [Enter] to return...{RESET}")
 
-    def run_graph_build(self):
+    def run_graph_build(self, recreate_store=False, import_batch_size=10000, import_workers=4, incremental=False,
+                        ingest_mode='load_csv', single_pass=True, regenerate_llm=None, dry_run=False,
+                        fast_initial_load=False, resume=False, normalize_multi_valued=True, llm_concurrency=4):
         plan_path = os.path.join(self.context.base_path, 'construction_plan.json')
         if not os.path.exists(plan_path) and not self.cli_mode:
              print(f"{RED}Prerequisites not met. Schema must be VALID.{RESET}")
              return
 
         try:
-            print(f"{YELLOW}⚠️  WARNING: This will NUKE the existing Neo4j database.{RESET}")
+            if dry_run:
+                print(f"{CYAN}🔎 Dry run: imports are audited with EXPLAIN, nothing is written.{RESET}")
+            elif resume:
+                print(f"{CYAN}⏯️  Resuming the interrupted build from its checkpoint.{RESET}")
+            elif incremental:
+                print(f"{CYAN}♻️  Incremental build: only changed rules are re-imported.{RESET}")
+            else:
+                print(f"{YELLOW}⚠️  WARNING: This will NUKE the existing Neo4j database.{RESET}")
             # Inject Context into Builder
-            builder = GraphBuilderAgent(api_key=self.api_key, context=self.context)
-            success = builder.build_graph()
+            builder = GraphBuilderAgent(api_key=self.api_key, context=self.context, import_batch_size=import_batch_size,
+                                        max_workers=import_workers, ingest_mode=ingest_mode,
+                                        single_pass=single_pass, regenerate_llm=regenerate_llm,
+                                        fast_initial_load=fast_initial_load,
+                                        normalize_multi_valued=normalize_multi_valued,
+                                        llm_concurrency=llm_concurrency)
+            success = builder.build_graph(recreate_store=recreate_store, incremental=incremental, dry_run=dry_run,
+                                          resume=resume)
             
-            if success:
+            if success and not dry_run:
                 self.sm.mark_graph_built()
         except Exception as e:
             print(f"{RED}Crash: {e}{RESET}")
@@ -263,31 +286,36 @@ class Orchestrator:
              print(f"{RED}DB not running.{RESET}")
              return
 
-        # 1. Total Counts
-        q = "MATCH (n) RETURN count(n) as c"
-        res = graphdb.send_query(q)
-        total = res[0]['c'] if res else 0
-        print(f"Total Nodes: {total}")
-        
-        # 2. Counts by Label
-        q2 = "MATCH (n) RETURN labels(n)[0] as label, count(n) as c ORDER BY c DESC"
-        res2 = graphdb.send_query(q2)
-        if res2:
-            print("\nNodes by Label:")
-            for r in res2:
-                print(f"  - {r['label']}: {r['c']}")
-                
-        # 3. Recent Nodes
-        print("\nLatest 5 extracted entities:")
-        q3 = "MATCH (n:`__Entity__`) RETURN n ORDER BY elementId(n) DESC LIMIT 5"
-        res3 = graphdb.send_query(q3)
-        if res3:
-            for r in res3:
-                 node = r['n']
-                 props = json.dumps(dict(node), default=str)
-                 print(f"  - {props}")
-        else:
-             print("  (No entities found)")
+        with graphdb.session_scope(read_only=True) as s:
+            if s is None:
+                print(f"{RED}Could not connect to Neo4j.{RESET}")
+                return
+
+            # 1. Total Counts
+            q = "MATCH (n) RETURN count(n) as c"
+            res = s.send_query(q, cache=True)
+            total = res[0]['c'] if isinstance(res, list) and res else 0
+            print(f"Total Nodes: {total}")
+            
+            # 2. Counts by Label
+            q2 = "MATCH (n) RETURN labels(n)[0] as label, count(n) as c ORDER BY c DESC"
+            res2 = s.send_query(q2, cache=True)
+            if isinstance(res2, list) and res2:
+                print("\nNodes by Label:")
+                for r in res2:
+                    print(f"  - {r['label']}: {r['c']}")
+                    
+            # 3. Recent Nodes
+            print("\nLatest 5 extracted entities:")
+            q3 = "MATCH (n:`__Entity__`) RETURN n ORDER BY elementId(n) DESC LIMIT 5"
+            res3 = s.send_query(q3, cache=True)
+            if isinstance(res3, list) and res3:
+                for r in res3:
+                     node = r['n']
+                     props = json.dumps(dict(node), default=str)
+                     print(f"  - {props}")
+            else:
+                 print("  (No entities found)")
 
         if not self.cli_mode:
             input(f"\n{CYAN}Press [Enter] to return...{RESET}")
@@ -414,7 +442,12 @@ class Orchestrator:
             elif choice == '5':
                  self.run_extraction_design()
             elif choice == '6':
-                 self.run_graph_build()
+                 incremental = resume = False
+                 if os.path.exists(os.path.join(self.context.base_path, CHECKPOINT_FILE)):
+                     resume = input(f"{CYAN}Resume the interrupted build? [Y/n]: {RESET}").strip().lower() != 'n'
+                 if not resume and os.path.exists(os.path.join(self.context.base_path, MANIFEST_FILE)):
+                     incremental = input(f"{CYAN}Refresh incrementally (only changed files/rules)? [Y/n]: {RESET}").strip().lower() != 'n'
+                 self.run_graph_build(incremental=incremental, resume=resume)
             elif choice == '7':
                  self.run_kg_pipeline()
             elif choice == '8':
@@ -440,18 +473,39 @@ if __name__ == "__main__":
     parser.add_argument("--reset-db", action="store_true", help="Force restart of Neo4j container")
     parser.add_argument("--cli", action="store_true", help="Run in CLI mode (non-interactive)")
     parser.add_argument("--action", type=str, help="Action to run in CLI mode (build, visualize, export)")
+    parser.add_argument("--recreate-store", action="store_true", help="Build: drop and recreate the Neo4j store instead of deleting the graph in batches")
+    parser.add_argument("--import-batch-size", type=int, default=10000, help="Build: rows per periodic commit for LOAD CSV imports (0 = one transaction per import)")
+    parser.add_argument("--incremental", action="store_true", help="Build: re-import only rules whose file or rule changed since the last build")
+    parser.add_argument("--ingest-mode", choices=["load_csv", "stream"], default="load_csv", help="Build: let Neo4j read files with LOAD CSV, or stream them from Python in UNWIND batches")
+    parser.add_argument("--no-single-pass", action="store_true", help="Build: import each rule separately instead of one pass per source file")
+    parser.add_argument("--regenerate-llm", action="append", metavar="RULE", help="Build: ignore cached LLM Cypher for a label, relationship type or rule id ('all' for every rule); repeatable")
+    parser.add_argument("--fast-initial-load", action="store_true", help="Build: on full builds, dedupe keys in Python and write heuristic imports with CREATE instead of MERGE")
+    parser.add_argument("--no-normalize", action="store_true", help="Build: split multi-valued columns in Cypher instead of importing pre-normalized side tables")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Build: LLM Cypher generations in flight at once with the LLM strategy")
+    parser.add_argument("--resume", action="store_true", help="Build: continue an interrupted build from its checkpoint (skips finished rules)")
+    parser.add_argument("--dry-run", action="store_true", help="Build: audit every import with EXPLAIN and print a risk table without writing")
+    parser.add_argument("--import-workers", type=int, default=4, help="Build: import rules run concurrently (1 = sequential)")
+    parser.add_argument("--slow-query-ms", type=float, help="Log statements slower than this (ms) to debug/slow_queries.jsonl")
+    parser.add_argument("--profile-slow-queries", action="store_true", help="Re-run slow read-only statements under PROFILE and log the plan")
     
     args = parser.parse_args()
     
     ctx = Context.from_path(args.context)
-    app = Orchestrator(ctx, cli_mode=args.cli)
+    app = Orchestrator(ctx, cli_mode=args.cli, slow_query_ms=args.slow_query_ms,
+                       profile_slow_queries=args.profile_slow_queries)
     
     if args.reset_db:
         app.container_svc.start_container(force_restart=True)
         
     if args.cli:
         if args.action == "build":
-            app.run_graph_build()
+            app.run_graph_build(recreate_store=args.recreate_store, import_batch_size=args.import_batch_size,
+                                import_workers=args.import_workers, incremental=args.incremental,
+                                ingest_mode=args.ingest_mode, single_pass=not args.no_single_pass,
+                                regenerate_llm=args.regenerate_llm, dry_run=args.dry_run,
+                                fast_initial_load=args.fast_initial_load, resume=args.resume,
+                                normalize_multi_valued=not args.no_normalize,
+                                llm_concurrency=args.llm_concurrency)
         elif args.action == "visualize":
             app.run_visualization()
         elif args.action == "export":
@@ -0,0 +1,426 @@
+"""
+Parameterized Cypher templates.
+
+Every builder here returns `(query, params)`. Labels, relationship types and property
+keys cannot be parameters in Cypher, so they are escaped into the text; every value
+(file names, column names, thresholds...) travels as a `$param`. The query text of a
+rule therefore never changes between runs and Neo4j's plan cache is reused.
+"""
+import re
+
+
+def escape_identifier(name):
+    """Backtick-quotes a label, relationship type or property key (doubling embedded backticks)."""
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def file_url(filename):
+    """URL of a file in the Neo4j import directory (the context's user_data mount)."""
+    return f"file:///{filename}"
+
+
+def is_text_source(filename):
+    return filename.endswith('.txt')
+
+
+def node_key(node):
+    """The property a node rule is keyed on."""
+    return node.get('unique_column_name', node.get('unique_id', 'id'))
+
+
+# Split rules explode this column on this delimiter (see node_import_body)
+SPLIT_COLUMN = "ingredients"
+SPLIT_DELIMITER = ","
+
+
+def text_property(node):
+    """Property that receives the line of a text-file source."""
+    return next((p for p in node.get('properties', []) if 'text' in p or 'content' in p), 'text')
+
+
+def is_split_rule(node):
+    rule = node.get('transformation_rule', '').lower()
+    return "split" in rule and "ingredients" in rule
+
+
+# --- Row bodies -------------------------------------------------------------
+# Bodies operate on a `row` map and are shared by every row source (LOAD CSV, UNWIND $rows).
+
+# `_kg_rules` holds one `<rule id>@<build id>` stamp per rule that supplies the entity,
+# so rules sharing a label or relationship type never sweep each other's entities.
+# Full builds stamp too, so the next incremental build can sweep what they imported;
+# the cost is one extra SET (a short list rewrite) per imported row.
+
+# Properties the builder keeps for itself; hidden from schema output and samples
+INTERNAL_PROPERTY_PREFIX = "_kg_"
+
+
+def is_internal_property(name):
+    return str(name).startswith(INTERNAL_PROPERTY_PREFIX)
+
+
+def provenance_set(var):
+    """Replaces this rule's stamp on the entity with one for the current build (see `stale_*_query`)."""
+    return (f"SET {var}._kg_rules = [stamp IN coalesce({var}._kg_rules, []) WHERE NOT stamp STARTS WITH $kg_rule + '@']"
+            f" + ($kg_rule + '@' + $kg_build)\n")
+
+
+def provenance_sweep(var, delete):
+    """
+    Drops this rule's stamp where it is older than the current build and deletes the
+    entities no rule supplies any more. Returns (WHERE clause, per-entity subquery body).
+    """
+    where = f"any(stamp IN {var}._kg_rules WHERE stamp STARTS WITH $kg_rule + '@' AND stamp <> $kg_rule + '@' + $kg_build)"
+    body = (f"SET {var}._kg_rules = [stamp IN {var}._kg_rules WHERE NOT stamp STARTS WITH $kg_rule + '@'] "
+            f"WITH {var} WHERE size({var}._kg_rules) = 0 {delete} {var} RETURN 1 AS deleted_one")
+    return where, body
+
+
+def with_provenance(body, params, var, provenance):
+    """Appends the provenance stamp when `provenance` is a (rule_id, build_id) pair."""
+    if not provenance:
+        return body, params
+    rule, build = provenance
+    return body + provenance_set(var), {**params, "kg_rule": rule, "kg_build": build}
+
+
+def node_import_body(node, filename):
+    """
+    Heuristic MERGE body for a node rule.
+
+    Returns:
+        tuple: (body, params)
+    """
+    label = escape_identifier(node['label'])
+    unique_id = node_key(node)
+    key = escape_identifier(unique_id)
+    props = node.get('properties', [])
+
+    if is_split_rule(node):
+        body = f"""
+            UNWIND split(row[$split_column], $delimiter) AS item
+            WITH trim(item) AS cleaned_item
+            WHERE cleaned_item IS NOT NULL AND cleaned_item <> ''
+            MERGE (n:{label} {{ {key}: cleaned_item }})
+            """
+        return body, {"split_column": SPLIT_COLUMN, "delimiter": SPLIT_DELIMITER}
+
+    if is_text_source(filename):
+        text_prop = text_property(node)
+        body = f"""
+            WITH row WHERE row.text IS NOT NULL
+            MERGE (n:{label} {{ {key}: toString(row.ln) }})
+            SET n.{escape_identifier(text_prop)} = row.text
+            """
+        return body, {}
+
+    params = {"key_column": unique_id}
+    body = f"""
+            MERGE (n:{label} {{ {key}: row[$key_column] }})
+            """
+    set_parts = []
+    for i, p in enumerate([p for p in props if p != unique_id]):
+        params[f"column_{i}"] = p
+        set_parts.append(f"n.{escape_identifier(p)} = row[$column_{i}]")
+    if set_parts:
+        body += f"SET {', '.join(set_parts)}\n"
+    return body, params
+
+
+def relationship_import_body(rel):
+    """
+    Heuristic MATCH/MATCH/MERGE body for a relationship rule.
+
+    Returns:
+        tuple: (body, params)
+    """
+    source_key = rel.get('from_node_column', 'id')
+    target_key = rel.get('to_node_column', 'id')
+    rel_type = rel.get('relationship_type', rel.get('type'))
+    body = f"""
+            MATCH (source:{escape_identifier(rel.get('from_node_label'))} {{ {escape_identifier(source_key)}: row[$source_column] }})
+            MATCH (target:{escape_identifier(rel.get('to_node_label'))} {{ {escape_identifier(target_key)}: row[$target_column] }})
+            MERGE (source)-[r:{escape_identifier(rel_type)}]->(target)
+            """
+    return body, {"source_column": source_key, "target_column": target_key}
+
+
+def prefix_params(body, params, prefix):
+    """Renames a body's own `$params` with `prefix` so several bodies can share one statement."""
+    body = re.sub(r"\$(\w+)", lambda m: f"${prefix}{m.group(1)}" if m.group(1) in params else m.group(0), body)
+    return body, {f"{prefix}{k}": v for k, v in params.items()}
+
+
+def fused_body(parts):
+    """
+    Runs several row bodies against the same `row`, in order, each in its own unit
+    subquery so one body's WITH/WHERE/UNWIND cannot filter or multiply the next.
+    Used to import every rule of a file in a single pass. Returns (body, params).
+    """
+    body = ""
+    params = {}
+    for i, (part, part_params) in enumerate(parts):
+        part, part_params = prefix_params(part, part_params, f"r{i}_")
+        body += f"CALL (row) {{\n{part}\n}}\n"
+        params.update(part_params)
+    return body, params
+
+
+# --- Row sources ------------------------------------------------------------
+
+def load_csv_source(filename):
+    """
+    LOAD CSV clause binding each line of `filename` to `row`.
+    Text files are read headerless and exposed as {ln, text} maps.
+    """
+    if is_text_source(filename):
+        return """
+            LOAD CSV FROM $file_url AS line
+            WITH {ln: linenumber(), text: line[0]} AS row
+            """
+    return """
+            LOAD CSV WITH HEADERS FROM $file_url AS row
+            """
+
+
+UNWIND_SOURCE = """
+            UNWIND $rows AS row
+            """
+
+
+def in_transactions(source, body, row_var="row"):
+    """
+    Runs `body` once per row of `source` in periodic commits of `$batch_size` rows.
+    Must be executed in an auto-commit transaction (session.run), not a managed one.
+    """
+    return (source
+            + f"CALL ({row_var}) {{\n{body}\n}} IN TRANSACTIONS OF $batch_size ROWS\n"
+            + "RETURN count(*) AS rows\n")
+
+
+def counted(source, body, row_var="row"):
+    """
+    Runs `body` once per row of `source` in the current transaction and returns the rows
+    read (`rows`, as `in_transactions` does), however many rows the body itself produces.
+    """
+    return source + f"CALL ({row_var}) {{\n{body}\n}}\n" + "RETURN count(*) AS rows\n"
+
+
+def load_csv_query(filename, body, params, batch_size=None):
+    """
+    Combines a row body with a LOAD CSV source. With `batch_size`, the body is
+    committed every `batch_size` rows instead of in one transaction. Returns (query, params).
+    """
+    params = {**params, "file_url": file_url(filename)}
+    if batch_size:
+        return in_transactions(load_csv_source(filename), body), {**params, "batch_size": batch_size}
+    return counted(load_csv_source(filename), body), params
+
+
+def heuristic_node_query(node, filename, batch_size=None, provenance=None):
+    body, params = with_provenance(*node_import_body(node, filename), "n", provenance)
+    return load_csv_query(filename, body, params, batch_size=batch_size)
+
+
+def heuristic_relationship_query(rel, filename, batch_size=None, provenance=None):
+    body, params = with_provenance(*relationship_import_body(rel), "r", provenance)
+    return load_csv_query(filename, body, params, batch_size=batch_size)
+
+
+def streamed_node_query(node, filename, provenance=None):
+    """Node body over client-side `$rows` batches (see GraphService.write_batches). Returns (query, params)."""
+    body, params = with_provenance(*node_import_body(node, filename), "n", provenance)
+    return UNWIND_SOURCE + body, params
+
+
+def streamed_relationship_query(rel, provenance=None):
+    body, params = with_provenance(*relationship_import_body(rel), "r", provenance)
+    return UNWIND_SOURCE + body, params
+
+
+def file_import_query(filename, nodes, relationships, batch_size=None, provenance=None, streamed=False):
+    """
+    Imports several rules that read `filename` in one pass: node bodies first, then
+    relationship bodies, per row (see `fused_body`). `provenance(rule)` returns each
+    rule's (rule_id, build_id) stamp or None. Returns (query, params).
+    """
+    stamp = provenance or (lambda rule: None)
+    parts = [with_provenance(*node_import_body(n, filename), "n", stamp(n)) for n in nodes]
+    parts += [with_provenance(*relationship_import_body(r), "r", stamp(r)) for r in relationships]
+    body, params = fused_body(parts)
+    if streamed:
+        return UNWIND_SOURCE + body, params
+    return load_csv_query(filename, body, params, batch_size=batch_size)
+
+
+def create_nodes_query(node, provenance=None):
+    """
+    Initial-load variant of a node rule: plain CREATE from property maps that were
+    already deduplicated client-side (see core/fast_load.py). Returns (query, params).
+    """
+    body = f"""
+            CREATE (n:{escape_identifier(node['label'])})
+            SET n = row
+            """
+    body, params = with_provenance(body, {}, "n", provenance)
+    return UNWIND_SOURCE + body, params
+
+
+def create_relationships_query(rel, provenance=None):
+    """
+    Initial-load variant of a relationship rule: CREATE for (source, target) key pairs
+    that were already deduplicated client-side. Returns (query, params).
+    """
+    source_key = escape_identifier(rel.get('from_node_column', 'id'))
+    target_key = escape_identifier(rel.get('to_node_column', 'id'))
+    rel_type = escape_identifier(rel.get('relationship_type', rel.get('type')))
+    body = f"""
+            MATCH (source:{escape_identifier(rel.get('from_node_label'))} {{ {source_key}: row.source }})
+            MATCH (target:{escape_identifier(rel.get('to_node_label'))} {{ {target_key}: row.target }})
+            CREATE (source)-[r:{rel_type}]->(target)
+            """
+    body, params = with_provenance(body, {}, "r", provenance)
+    return UNWIND_SOURCE + body, params
+
+
+def is_batched(query):
+    return re.search(r"\bIN\s+TRANSACTIONS\b", query, re.IGNORECASE) is not None
+
+
+LOAD_CSV_HEAD_RE = re.compile(
+    r"""^\s*(?:USING\s+PERIODIC\s+COMMIT(?:\s+\d+)?\s+)?
+    (LOAD\s+CSV\s+(?:WITH\s+HEADERS\s+)?FROM\s+(?:'[^']*'|"[^"]*"|\$\w+)
+    \s+AS\s+(\w+|`[^`]+`)
+    (?:\s+FIELDTERMINATOR\s+(?:'[^']*'|"[^"]*"))?)""",
+    re.IGNORECASE | re.VERBOSE)
+
+
+# Clauses and functions that combine several rows; a body using them is not per-row
+CROSS_ROW_RE = re.compile(
+    r"\b(?:DISTINCT|ORDER\s+BY|SKIP|LIMIT|UNION)\b"
+    r"|\b(?:collect|count|sum|avg|min|max|stDev|stDevP|percentileCont|percentileDisc)\s*\(",
+    re.IGNORECASE)
+
+
+def is_row_local(body):
+    """
+    True when an import body handles each row on its own, so it may run on any split
+    of the rows (periodic commits, client batches). Aggregations, DISTINCT and
+    ORDER BY/SKIP/LIMIT act across rows and would only see part of them.
+    """
+    code = re.sub(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`", "''", body)
+    return CROSS_ROW_RE.search(code) is None
+
+
+def wrap_in_transactions(query):
+    """
+    Rewrites a free-form `LOAD CSV ... AS row <body>` import (e.g. LLM output) so the
+    body runs in periodic commits of `$batch_size` rows. Legacy `USING PERIODIC COMMIT`
+    is dropped. Returns None when the query cannot be wrapped safely: several
+    statements, several LOAD CSV clauses, a body that RETURNs or one that is not
+    per-row (see `is_row_local`).
+    """
+    if is_batched(query):
+        return query
+    parts = _per_row_load_csv(query)
+    return in_transactions(*parts) if parts else None
+
+
+def with_row_count(query):
+    """
+    Makes an unbatched free-form `LOAD CSV ... AS row <body>` import return the rows it
+    read (see `counted`), in one transaction. None under the same conditions as
+    `wrap_in_transactions`, or when the query is batched already.
+    """
+    if is_batched(query):
+        return None
+    parts = _per_row_load_csv(query)
+    return counted(*parts) if parts else None
+
+
+def _per_row_load_csv(query):
+    """(LOAD CSV source, per-row body, row variable) of a free-form import, or None."""
+    statement = query.strip().rstrip(';')
+    match = LOAD_CSV_HEAD_RE.match(statement)
+    if not match or ';' in statement:
+        return None
+    body = statement[match.end():]
+    if re.search(r"\bLOAD\s+CSV\b", body, re.IGNORECASE) or re.search(r"\bRETURN\b", body, re.IGNORECASE) \
+            or not is_row_local(body):
+        return None
+    return match.group(1) + "\n", body, match.group(2)
+
+
+def load_csv_to_unwind(query):
+    """
+    Rewrites a free-form `LOAD CSV ... AS row <body>` import (e.g. LLM output) to read
+    client-side batches from `UNWIND $rows AS row` instead of a server-side file.
+
+    Returns:
+        tuple: (query, headers) where `headers` says whether rows must be maps
+        (WITH HEADERS) or field lists; None when the query has another shape or
+        is not per-row (see `is_row_local`).
+    """
+    statement = query.strip().rstrip(';')
+    match = LOAD_CSV_HEAD_RE.match(statement)
+    if not match or ';' in statement or is_batched(statement):
+        return None
+    body = statement[match.end():]
+    if re.search(r"\bLOAD\s+CSV\b", body, re.IGNORECASE) or not is_row_local(body):
+        return None
+    headers = re.search(r"\bWITH\s+HEADERS\b", match.group(1), re.IGNORECASE) is not None
+    return f"UNWIND $rows AS {match.group(2)}\n{body.lstrip()}", headers
+
+
+# --- Provenance sweeps -----------------------------------------------------
+# Entities stamped by a rule but not by its latest build come from rows that were removed;
+# they are deleted once no other rule supplies them. Both take $kg_rule, $kg_build and $batch_size.
+
+def stale_nodes_query(label):
+    where, body = provenance_sweep("n", "DETACH DELETE")
+    return f"""
+            MATCH (n:{escape_identifier(label)})
+            WHERE {where}
+            CALL (n) {{ {body} }} IN TRANSACTIONS OF $batch_size ROWS
+            RETURN count(*) AS deleted
+            """
+
+
+def stale_relationships_query(rel_type):
+    where, body = provenance_sweep("r", "DELETE")
+    return f"""
+            MATCH ()-[r:{escape_identifier(rel_type)}]->()
+            WHERE {where}
+            CALL (r) {{ {body} }} IN TRANSACTIONS OF $batch_size ROWS
+            RETURN count(*) AS deleted
+            """
+
+
+# --- DDL --------------------------------------------------------------------
+
+def uniqueness_constraint(label, prop):
+    # Schema commands accept no parameters; identifiers are escaped instead
+    return f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{escape_identifier(label)}) REQUIRE n.{escape_identifier(prop)} IS UNIQUE"
+
+
+def range_index(label, prop):
+    """Named so reruns and the index advisor recognise their own indexes."""
+    name = escape_identifier(f"kg_{label}_{prop}")
+    return f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{escape_identifier(label)}) ON (n.{escape_identifier(prop)})"
+
+
+# Blocks until every index is ONLINE (or `$timeout` seconds pass)
+AWAIT_INDEXES = "CALL db.awaitIndexes($timeout)"
+
+
+def warm_templates(graph, templates):
+    """
+    Plans each (query, params) once with EXPLAIN so the first real execution
+    hits a cached plan. Returns a list of (query, error) for templates that failed.
+    """
+    failures = []
+    for query, params in templates:
+        is_valid, error = graph.validate_cypher(query, params)
+        if not is_valid:
+            failures.append((query, error))
+    return failures
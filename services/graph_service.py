@@ -1,8 +1,27 @@
 import os
+import re
+import json
 import shutil
-from neo4j import GraphDatabase
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from itertools import islice
+from neo4j import GraphDatabase, AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS
+from neo4j.exceptions import ClientError, AuthError
+from services.cypher_templates import is_batched, is_internal_property
 import time
 
+# Optional analytics dependencies for columnar results
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
 # Use colors for CLI output (reused from orchestrator)
 CYAN = "\033[96m"
 GREEN = "\033[92m"
@@ -10,6 +29,314 @@ YELLOW = "\033[93m"
 RED = "\033[91m"
 RESET = "\033[0m"
 
+# Summary counter fields aggregated by the batched write APIs.
+COUNTER_FIELDS = (
+    "nodes_created", "nodes_deleted",
+    "relationships_created", "relationships_deleted",
+    "properties_set", "labels_added", "labels_removed",
+    "indexes_added", "indexes_removed",
+    "constraints_added", "constraints_removed",
+)
+
+def _chunked(iterable, size):
+    """Yields lists of at most `size` items from any iterable, without materializing it."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Clauses that modify data or schema. Used to invalidate cached reads.
+WRITE_CLAUSE_RE = re.compile(
+    r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b"
+    r"|\bCALL\s+apoc\.(import|create|merge|refactor|periodic|nodes\.delete)",
+    re.IGNORECASE,
+)
+
+# DDL and bulk imports that change what a query validates against.
+SCHEMA_CHANGE_RE = re.compile(
+    r"\b(CREATE|DROP)\s+(OR\s+REPLACE\s+)?((RANGE|TEXT|POINT|LOOKUP|FULLTEXT|VECTOR)\s+)?(CONSTRAINT|INDEX)\b"
+    r"|\bCALL\s+apoc\.(import|schema)",
+    re.IGNORECASE,
+)
+STRING_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+NUMBER_LITERAL_RE = re.compile(r"(?<![\w$.`])-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?(?![\w`])")
+
+def normalize_cypher(cypher):
+    """Collapses whitespace so formatting differences map to the same query text."""
+    return " ".join(cypher.split())
+
+def fingerprint_cypher(cypher):
+    """
+    Normalizes a query to its shape: string and number literals become `?`
+    and whitespace is collapsed, so `... LIMIT 5` and `... LIMIT 10` share a fingerprint.
+    """
+    stripped = STRING_LITERAL_RE.sub("?", cypher)
+    stripped = NUMBER_LITERAL_RE.sub("?", stripped)
+    return normalize_cypher(stripped)
+
+# Like NUMBER_LITERAL_RE without the sign: `-5` keeps its minus when the digits are masked
+UNSIGNED_NUMBER_LITERAL_RE = re.compile(r"(?<![\w$.`])\d+(?:\.\d+)?(?:[eE][+-]?\d+)?(?![\w`])")
+
+def _typed_number_mask(match):
+    return "?f" if re.search(r"[.eE]", match.group()) else "?i"
+
+def validation_key(cypher, params=None):
+    """
+    Cache key of a successful EXPLAIN: the query shape with literals masked by type
+    (`?s`, `?i`, `?f`: `LIMIT 1.5` or `LIMIT '5'` fail where `LIMIT 5` does not) and
+    signs kept (`LIMIT -5`), plus the parameter names (a missing parameter is an error).
+    """
+    stripped = STRING_LITERAL_RE.sub("?s", cypher)
+    stripped = UNSIGNED_NUMBER_LITERAL_RE.sub(_typed_number_mask, stripped)
+    return normalize_cypher(stripped), tuple(sorted(params or {}))
+
+def _is_query_error(error):
+    """True for errors that are a property of the statement itself (syntax, semantics, types)."""
+    return isinstance(error, ClientError) and not isinstance(error, AuthError)
+
+# Scalar types numpy can hold in a typed array without changing the values
+NUMPY_SCALAR_TYPES = (bool, int, float, str)
+
+def _column_array(column):
+    """
+    numpy array of one result column: typed when every value is the same scalar type,
+    else dtype=object (lists such as `labels(n)`, nulls, mixed values stay as they are).
+    """
+    types = {type(value) for value in column}
+    if len(types) == 1 and types.pop() in NUMPY_SCALAR_TYPES:
+        return np.asarray(column)
+    return np.asarray(column, dtype=object) if column else np.asarray(column)
+
+def hide_internal_properties(value):
+    """Drops builder-internal properties (`_kg_*`) from an apoc.meta.schema map or apoc.meta.data rows."""
+    if isinstance(value, list):
+        return [hide_internal_properties(item) for item in value
+                if not (isinstance(item, dict) and is_internal_property(item.get("property", "")))]
+    if isinstance(value, dict):
+        return {k: hide_internal_properties(v) for k, v in value.items() if not is_internal_property(k)}
+    return value
+
+def plan_estimated_rows(plan):
+    """Returns the planner's row estimate for the root operator of an EXPLAIN plan, or None."""
+    if not isinstance(plan, dict):
+        return None
+    return (plan.get("args") or {}).get("EstimatedRows")
+
+def is_write_query(cypher):
+    return bool(WRITE_CLAUSE_RE.search(cypher))
+
+def is_schema_query(cypher):
+    return bool(SCHEMA_CHANGE_RE.search(cypher))
+
+class QueryResultCache:
+    """
+    Thread-safe LRU cache of read results, keyed by normalized Cypher plus params.
+    `invalidate()` bumps a generation counter so results computed before a write
+    can never be stored after it.
+    """
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(cypher, params=None):
+        return normalize_cypher(cypher), json.dumps(params or {}, sort_keys=True, default=str)
+
+    def get(self, cypher, params=None):
+        key = self.make_key(cypher, params)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(self._entries[key])
+
+    def put(self, cypher, params, rows, generation=None):
+        if self.max_entries <= 0:
+            return
+        key = self.make_key(cypher, params)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return # A write happened while this result was being computed
+            self._entries[key] = list(rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def _as_ms(value):
+    return value if isinstance(value, (int, float)) else 0
+
+class QueryStats:
+    """
+    Per-fingerprint aggregates of server-side timings and summary counters.
+    Timings are `result_available_after + result_consumed_after` as reported by
+    the server, so they exclude client-side processing and network time.
+    """
+    def __init__(self, max_samples=1000):
+        self.max_samples = max_samples
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, cypher, summary, records=0):
+        """Adds one executed statement. `summary` is a driver ResultSummary."""
+        available = _as_ms(getattr(summary, "result_available_after", 0))
+        consumed = _as_ms(getattr(summary, "result_consumed_after", 0))
+        query_type = getattr(summary, "query_type", None)
+        counters = getattr(summary, "counters", None)
+        key = fingerprint_cypher(cypher)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    "fingerprint": key,
+                    "query_type": query_type if isinstance(query_type, str) else None,
+                    "count": 0,
+                    "total_ms": 0,
+                    "samples": deque(maxlen=self.max_samples),
+                    "records": 0,
+                    "counters": {},
+                }
+            entry["count"] += 1
+            entry["total_ms"] += available + consumed
+            entry["samples"].append(available + consumed)
+            entry["records"] += records
+            if counters is not None:
+                _add_counters(entry["counters"], counters)
+
+    def snapshot(self, sort_by="total_ms"):
+        """Returns the aggregates as plain dicts, heaviest first."""
+        with self._lock:
+            entries = [dict(e, samples=sorted(e["samples"])) for e in self._stats.values()]
+        report = []
+        for e in entries:
+            samples = e.pop("samples")
+            counters = {k: v for k, v in e["counters"].items() if v}
+            report.append({
+                **e,
+                "counters": counters,
+                "p50_ms": _percentile(samples, 50),
+                "p95_ms": _percentile(samples, 95),
+                "p99_ms": _percentile(samples, 99),
+                "rows_touched": e["records"] + sum(counters.values()),
+            })
+        return sorted(report, key=lambda r: r.get(sort_by, 0), reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+def _loggable_params(params, max_items=20):
+    """Params for the slow-query log, with large batches (e.g. `$rows`) summarized."""
+    loggable = {}
+    for key, value in (params or {}).items():
+        if isinstance(value, (list, tuple)) and len(value) > max_items:
+            loggable[key] = f"<{len(value)} items, first: {json.dumps(value[0], default=str)[:200]}>"
+        else:
+            loggable[key] = value
+    return loggable
+
+def summarize_profile(profile):
+    """Flattens a PROFILE plan into total db hits plus one entry per operator."""
+    operators = []
+    def walk(op, depth=0):
+        args = op.get("args") or {}
+        operators.append({
+            "operator": op.get("operatorType"),
+            "depth": depth,
+            "db_hits": op.get("dbHits", args.get("DbHits", 0)),
+            "rows": op.get("rows", args.get("Rows", 0)),
+            "estimated_rows": args.get("EstimatedRows"),
+            "details": args.get("Details"),
+        })
+        for child in op.get("children") or []:
+            walk(child, depth + 1)
+    if isinstance(profile, dict):
+        walk(profile)
+    return {"total_db_hits": sum(o["db_hits"] or 0 for o in operators), "operators": operators}
+
+class SlowQueryLog:
+    """
+    Appends statements slower than `threshold_ms` (server time) to a JSONL file,
+    optionally with a PROFILE of read-only statements. Disabled until configured.
+    """
+    def __init__(self):
+        self.threshold_ms = None
+        self.path = None
+        self.profile = False
+        self._lock = threading.Lock()
+
+    def configure(self, threshold_ms, debug_dir=None, profile=False, filename="slow_queries.jsonl"):
+        self.threshold_ms = threshold_ms
+        self.profile = profile
+        if debug_dir:
+            os.makedirs(debug_dir, exist_ok=True)
+            self.path = os.path.join(debug_dir, filename)
+
+    @property
+    def enabled(self):
+        return self.threshold_ms is not None and self.path is not None
+
+    def observe(self, cypher, params, summary, profiler=None):
+        """Logs the statement if it crossed the threshold. `profiler(cypher, params)` returns a PROFILE plan."""
+        if not self.enabled:
+            return
+        runtime_ms = _as_ms(getattr(summary, "result_available_after", 0)) + _as_ms(getattr(summary, "result_consumed_after", 0))
+        if runtime_ms < self.threshold_ms:
+            return
+
+        query_type = getattr(summary, "query_type", None)
+        entry = {
+            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "runtime_ms": runtime_ms,
+            "query_type": query_type if isinstance(query_type, str) else None,
+            "fingerprint": fingerprint_cypher(cypher),
+            "query": cypher,
+            "params": _loggable_params(params),
+        }
+        # Only read-only statements are safe to execute a second time
+        if self.profile and profiler and entry["query_type"] == "r" and not is_write_query(cypher):
+            try:
+                entry["profile"] = summarize_profile(profiler(cypher, params))
+            except Exception as e:
+                entry["profile_error"] = str(e)
+
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        print(f"{YELLOW}🐢 Slow query ({runtime_ms} ms) logged to {os.path.basename(self.path)}{RESET}")
+
+def _add_counters(totals, counters):
+    """Adds a driver SummaryCounters object onto a plain dict of totals."""
+    for field in COUNTER_FIELDS:
+        totals[field] = totals.get(field, 0) + getattr(counters, field, 0)
+    return totals
+
+# Shared by the sync and async services so both show up in one report
+query_stats = QueryStats()
+slow_query_log = SlowQueryLog()
+
 class GraphService:
     """
     Singleton service for managing Neo4j connections and query execution.
@@ -28,11 +355,25 @@ class GraphService:
             os.getenv("NEO4J_PASSWORD", "password")
         )
         self.driver = None
+        # Managed transactions (execute_read/execute_write) are retried by the driver on
+        # transient errors (deadlocks, lock timeouts, dropped connections) for up to this long
+        self.max_transaction_retry_time = float(os.getenv("NEO4J_MAX_RETRY_TIME", "30"))
+        # Opt-in read cache (`cache=True`), cleared by every write through this service
+        self.query_cache = QueryResultCache(int(os.getenv("NEO4J_QUERY_CACHE_SIZE", "128")))
+        # EXPLAIN results by query fingerprint, kept until the schema changes
+        self.validation_cache = OrderedDict()
+        self.validation_cache_size = int(os.getenv("NEO4J_VALIDATION_CACHE_SIZE", "512"))
+        self._validation_lock = threading.Lock()
+        # Server timings and counters of every executed statement, by fingerprint
+        self.query_stats = query_stats
+        # Statements over a threshold are logged to debug/slow_queries.jsonl (see configure_slow_query_log)
+        self.slow_query_log = slow_query_log
 
     def connect(self):
         if not self.driver:
             try:
-                self.driver = GraphDatabase.driver(self.uri, auth=self.auth)
+                self.driver = GraphDatabase.driver(self.uri, auth=self.auth,
+                                                   max_transaction_retry_time=self.max_transaction_retry_time)
                 # Verify connectivity
                 self.driver.verify_connectivity()
                 return True
@@ -52,11 +393,11 @@ class GraphService:
         
         # filename should be relative to import dir
         # We assume the caller has placed the file in the import dir
-        import_query = f"CALL apoc.import.graphml('{filename}', {{readLabels: true}})"
+        import_query = "CALL apoc.import.graphml($file, {readLabels: true})"
         
         print(f"{YELLOW}>> Importing graph from {filename} (in container)...{RESET}")
         try:
-            res = self.send_query(import_query)
+            res = self.send_query(import_query, {"file": filename})
             return True
         except Exception as e:
              print(f"{RED}Import failed: {e}{RESET}")
@@ -105,48 +446,459 @@ class GraphService:
             # Let's use `apoc.meta.schema` as it returns a nice map.
             res = self.send_query(schema_query)
             if res and 'value' in res[0]:
-                return res[0]['value']
+                return hide_internal_properties(res[0]['value'])
                 
             # Fallback if that returns empty (sometimes happens)
-            return self.send_query("CALL apoc.meta.data()")
+            return hide_internal_properties(self.send_query("CALL apoc.meta.data()"))
             
         except Exception as e:
             print(f"{RED}Schema Extraction Failed: {e}{RESET}")
             return None
 
-    def validate_cypher(self, cypher):
+    def validate_cypher(self, cypher, params=None, return_plan=False):
         """
         Validates Cypher syntax using EXPLAIN.
-        Returns (is_valid, error_message).
+        Successes are memoized by `validation_key` (literals masked by type), so a query
+        validated in an earlier turn or retry costs no round trip until the schema changes.
+        Statement errors are memoized for the exact query text only, so a retry that fixes
+        a literal is checked again. Connection and transient errors are not cached.
+
+        Args:
+            cypher (str): Query to validate.
+            params (dict, optional): Parameters for the EXPLAIN.
+            return_plan (bool): Also return the EXPLAIN plan (dict with
+                `operatorType`, `args` incl. `EstimatedRows`, `children`).
+
+        Returns (is_valid, error_message), or (is_valid, error_message, plan) with `return_plan`.
         """
-        if not self.connect(): return False, "No Connection"
+        key = validation_key(cypher, params)
+        exact_key = (normalize_cypher(cypher), key[1])
+        with self._validation_lock:
+            cached = None
+            for k in (key, exact_key):
+                if k in self.validation_cache:
+                    cached = self.validation_cache[k]
+                    self.validation_cache.move_to_end(k)
+                    break
+        
+        if cached is None:
+            if not self.connect():
+                return (False, "No Connection", None) if return_plan else (False, "No Connection")
+            try:
+                with self.driver.session() as session:
+                    # EXPLAIN query prevents execution but checks syntax
+                    if params:
+                        result = session.run(f"EXPLAIN {cypher}", params)
+                    else:
+                        result = session.run(f"EXPLAIN {cypher}")
+                    cached = (True, None, result.consume().plan)
+            except Exception as e:
+                if not _is_query_error(e):
+                    # e.g. ServiceUnavailable: says nothing about the statement
+                    return (False, str(e), None) if return_plan else (False, str(e))
+                cached = (False, str(e), None)
+                key = exact_key
+
+            with self._validation_lock:
+                self.validation_cache[key] = cached
+                while len(self.validation_cache) > self.validation_cache_size:
+                    self.validation_cache.popitem(last=False)
+
+        return cached if return_plan else cached[:2]
+
+    def clear_validation_cache(self):
+        with self._validation_lock:
+            self.validation_cache.clear()
+
+    def _after_write(self, cypher):
+        """Invalidates cached reads, and cached validations when the query changed the schema."""
+        self.query_cache.invalidate()
+        if is_schema_query(cypher):
+            self.clear_validation_cache()
+
+    def _observe(self, cypher, params, summary, records=0):
+        """Hook run after every executed statement: stats aggregation and slow-query logging."""
+        self.query_stats.record(cypher, summary, records)
+        self.slow_query_log.observe(cypher, params, summary, profiler=self._profile)
+
+    def _profile(self, cypher, params):
+        with self.driver.session() as session:
+            return session.run(f"PROFILE {cypher}", params or {}).consume().profile
+
+    def configure_slow_query_log(self, threshold_ms, debug_dir, profile=False):
+        """
+        Logs every statement slower than `threshold_ms` (server time) with its parameters
+        to `debug_dir/slow_queries.jsonl`. With `profile`, read-only statements are re-run
+        once under PROFILE to capture db hits and the operator plan. `None` disables it.
+        """
+        self.slow_query_log.configure(threshold_ms, debug_dir, profile=profile)
+
+    def clear_query_cache(self):
+        """Drops cached reads. Call after writing through the raw driver (e.g. the GraphRAG pipeline)."""
+        self.query_cache.invalidate()
+
+    def send_query(self, cypher, params=None, cache=False, max_records=None):
+        """
+        Execute a Cypher query and return results as a list of dicts.
+
+        Args:
+            cypher (str): Query to run.
+            params (dict, optional): Query parameters.
+            cache (bool): Serve/store read results from the query cache.
+                Write queries always bypass the cache and invalidate it.
+            max_records (int, optional): Stop after this many records and discard the rest.
+                Results that reach the limit may be cut off and are never cached.
+        """
+        if not self.connect():
+            return None
+
+        with self.driver.session() as session:
+            return self._run_collect(session.run, cypher, params, cache, max_records=max_records)
+
+    def _run_collect(self, run, cypher, params=None, cache=False, invalidate=True, max_records=None):
+        """
+        Shared body of every `send_query`: runs through `run` (session.run or tx.run),
+        records stats, serves/stores cached reads and invalidates caches after writes.
+        """
+        write = is_write_query(cypher)
+        if cache and not write:
+            cached = self.query_cache.get(cypher, params)
+            if cached is not None:
+                return cached[:max_records] if max_records else cached
+        generation = self.query_cache.generation
         
         try:
-            with self.driver.session() as session:
-                # EXPLAIN query prevents execution but checks syntax
-                session.run(f"EXPLAIN {cypher}")
-                return True, None
+            result = run(cypher, params or {})
+            records = result if max_records is None else islice(result, max_records)
+            rows = [record.data() for record in records]
+            self._observe(cypher, params, result.consume(), len(rows))
+            if cache and not write and (max_records is None or len(rows) < max_records):
+                self.query_cache.put(cypher, params, rows, generation)
+            return rows
         except Exception as e:
-            return False, str(e)
+            print(f"{RED}Query Failed: {e}{RESET}")
+            print(f"{YELLOW}Query: {cypher}{RESET}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            if write and invalidate:
+                self._after_write(cypher)
 
+    def _execute_managed(self, cypher, params, write):
+        if not self.connect():
+            return None
 
-    def send_query(self, cypher, params=None):
-        """Execute a Cypher query and return results as a list of dicts."""
+        with self.driver.session() as session:
+            return self._execute_managed_in(session, cypher, params, write)
+
+    def _execute_managed_in(self, session, cypher, params, write):
+        def _work(tx):
+            result = tx.run(cypher, params or {})
+            rows = [record.data() for record in result]
+            return rows, result.consume()
+
+        try:
+            run = session.execute_write if write else session.execute_read
+            rows, summary = run(_work)
+            # Observed once, after the driver's retries, outside the transaction
+            self._observe(cypher, params, summary, len(rows))
+            return rows
+        except Exception as e:
+            print(f"{RED}Query Failed: {e}{RESET}")
+            print(f"{YELLOW}Query: {cypher}{RESET}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            if write:
+                self._after_write(cypher)
+
+    def execute_read(self, cypher, params=None):
+        """
+        Runs a read query in a managed read transaction (routable to read replicas).
+        Transient errors are retried by the driver (see `max_transaction_retry_time`).
+        Returns a list of dicts, or {"status": "error", ...} like `send_query`.
+        """
+        return self._execute_managed(cypher, params, write=False)
+
+    def execute_write(self, cypher, params=None):
+        """
+        Runs a write query in a managed write transaction.
+        Deadlocks and lock timeouts are retried by the driver instead of
+        surfacing as errors. Returns a list of dicts, or {"status": "error", ...}.
+        """
+        return self._execute_managed(cypher, params, write=True)
+
+    def execute_import(self, cypher, params=None):
+        """
+        Runs one import statement and returns its records together with the summary
+        counters (nodes/relationships created, properties set...).
+        `CALL {} IN TRANSACTIONS` statements commit by themselves and run auto-commit;
+        anything else runs in a managed write transaction with retries.
+
+        Returns:
+            dict: {"records": [...], "counters": {...}}, or {"status": "error", ...}
+        """
         if not self.connect():
             return None
-        
+
+        def _collect(result):
+            return [record.data() for record in result], result.consume()
+
         try:
             with self.driver.session() as session:
-                result = session.run(cypher, params or {})
-                return [record.data() for record in result]
+                if is_batched(cypher):
+                    records, summary = _collect(session.run(cypher, params or {}))
+                else:
+                    records, summary = session.execute_write(lambda tx: _collect(tx.run(cypher, params or {})))
+            self._observe(cypher, params, summary, len(records))
+            return {"records": records, "counters": _add_counters({}, summary.counters)}
         except Exception as e:
-            print(f"{RED}Query Failed: {e}{RESET}")
+            print(f"{RED}Import Failed: {e}{RESET}")
             print(f"{YELLOW}Query: {cypher}{RESET}")
             return {"status": "error", "message": str(e)}
+        finally:
+            self._after_write(cypher)
+
+    @contextmanager
+    def session_scope(self, read_only=False):
+        """
+        Reuses one session, and so one pooled connection, for a sequence of statements:
+
+            with graphdb.session_scope(read_only=True) as s:
+                counts = s.send_query("MATCH (n) RETURN count(n) AS c", cache=True)
+
+        The scoped `send_query`/`execute_read`/`execute_write` behave exactly like the
+        service methods (same results, caching, stats and error dicts).
+        Yields None when the database is unreachable.
+        """
+        if not self.connect():
+            yield None
+            return
+        access_mode = READ_ACCESS if read_only else WRITE_ACCESS
+        with self.driver.session(default_access_mode=access_mode) as session:
+            yield GraphSession(self, session)
 
-    def nuke_database(self):
-        """Dangerous: Clears the entire database."""
-        return self.send_query("MATCH (n) DETACH DELETE n")
+    @contextmanager
+    def transaction_scope(self, read_only=False):
+        """
+        Like `session_scope`, but every statement runs in one explicit transaction.
+        Commits when the block exits normally and rolls back when it raises or any
+        statement failed. Results are never cached inside the transaction.
+        """
+        with self.session_scope(read_only=read_only) as scope:
+            if scope is None:
+                yield None
+                return
+            tx = scope.session.begin_transaction()
+            tx_scope = GraphSession(self, scope.session, tx=tx)
+            try:
+                yield tx_scope
+                if tx_scope.failed:
+                    tx.rollback()
+                else:
+                    tx.commit()
+            except Exception:
+                tx.rollback()
+                raise
+            finally:
+                tx.close()
+                if tx_scope.wrote:
+                    self.query_cache.invalidate()
+                if tx_scope.schema_changed:
+                    self.clear_validation_cache()
+
+    def stream_query(self, cypher, params=None, fetch_size=1000):
+        """
+        Yields query results one record (as a dict) at a time while the session stays open.
+        Only `fetch_size` records are pulled from the server per round trip, so
+        unbounded results never have to fit in memory. Closing the generator early
+        (`break`, `.close()`) closes the session and discards the remaining records.
+
+        Args:
+            cypher (str): Query to run.
+            params (dict, optional): Query parameters.
+            fetch_size (int): Records fetched from the server per batch.
+        """
+        if not self.connect():
+            return
+
+        try:
+            with self.driver.session(fetch_size=fetch_size) as session:
+                result = session.run(cypher, params or {})
+                count = 0
+                for record in result:
+                    count += 1
+                    yield record.data()
+                self._observe(cypher, params, result.consume(), count)
+        except Exception as e:
+            print(f"{RED}Streaming Query Failed: {e}{RESET}")
+            print(f"{YELLOW}Query: {cypher}{RESET}")
+            raise
+        finally:
+            if is_write_query(cypher):
+                self._after_write(cypher)
+
+    def query_columns(self, cypher, params=None, fetch_size=10000, as_frame=None):
+        """
+        Runs a read query and returns its result column-wise, for vectorized analytics.
+        Values are appended straight from the record tuples into one list per column,
+        so no per-record dict is ever built.
+
+        Args:
+            cypher (str): Query to run.
+            params (dict, optional): Query parameters.
+            fetch_size (int): Records fetched from the server per round trip.
+            as_frame (bool, optional): Return a pandas DataFrame. Defaults to True
+                when pandas is installed.
+
+        Returns:
+            DataFrame | dict: DataFrame, or {column: numpy array} (plain lists without numpy).
+                None when not connected. Errors are raised.
+        """
+        if not self.connect():
+            return None
+        if as_frame is None:
+            as_frame = pd is not None
+        if as_frame and pd is None:
+            raise ImportError("pandas is required for as_frame=True")
+
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(cypher, params or {})
+            keys = list(result.keys())
+            columns = [[] for _ in keys]
+            appenders = [column.append for column in columns]
+            count = 0
+            for record in result:
+                for append, value in zip(appenders, record):
+                    append(value)
+                count += 1
+            self._observe(cypher, params, result.consume(), count)
+
+        if as_frame:
+            return pd.DataFrame(dict(zip(keys, columns)), columns=keys)
+        if np is not None:
+            return {key: _column_array(column) for key, column in zip(keys, columns)}
+        return dict(zip(keys, columns))
+
+    def write_batches(self, query, rows, batch_size=10000, params=None, progress_callback=None):
+        """
+        Writes an iterable of dicts in `UNWIND $rows` batches.
+        Each batch runs in its own managed write transaction (retried on transient
+        errors), so a failure only loses the current batch and the rest of the load
+        never pays a round trip per row.
+
+        Args:
+            query (str): Cypher operating on `row`. It is prefixed with
+                `UNWIND $rows AS row` unless it already unwinds `$rows`.
+            rows (iterable): Any iterable of dicts (list, generator, csv.DictReader...).
+            batch_size (int): Rows per transaction.
+            params (dict, optional): Extra parameters sent with every batch.
+            progress_callback (callable, optional): Called with the rows written so far after each batch.
+
+        Returns:
+            dict: Aggregated summary counters plus `batches` and `rows`.
+                  On failure: {"status": "error", "message": ..., **partial totals}.
+        """
+        if not self.connect():
+            return None
+
+        if "$rows" not in query:
+            query = f"UNWIND $rows AS row\n{query}"
+
+        def _write_batch(tx, batch):
+            batch_params = {**(params or {}), "rows": batch}
+            return tx.run(query, batch_params).consume()
+
+        totals = {"batches": 0, "rows": 0}
+        try:
+            with self.driver.session() as session:
+                for batch in _chunked(rows, batch_size):
+                    summary = session.execute_write(_write_batch, batch)
+                    self._observe(query, {**(params or {}), "rows": batch}, summary)
+                    _add_counters(totals, summary.counters)
+                    totals["batches"] += 1
+                    totals["rows"] += len(batch)
+                    if progress_callback:
+                        progress_callback(totals["rows"])
+            return totals
+        except Exception as e:
+            print(f"{RED}Batch Write Failed after {totals['rows']} rows: {e}{RESET}")
+            print(f"{YELLOW}Query: {query}{RESET}")
+            return {"status": "error", "message": str(e), **totals}
+        finally:
+            self.query_cache.invalidate()
+
+    def get_query_stats(self, sort_by="total_ms"):
+        """
+        Per-fingerprint aggregates: count, total/p50/p95/p99 server ms, query type,
+        records returned, summary counters and rows touched. Heaviest first.
+        """
+        return self.query_stats.snapshot(sort_by=sort_by)
+
+    def dump_query_stats(self, debug_dir, filename="query_stats.json"):
+        """Writes `get_query_stats()` as JSON into the context's debug directory. Returns the path."""
+        os.makedirs(debug_dir, exist_ok=True)
+        path = os.path.join(debug_dir, filename)
+        with open(path, "w") as f:
+            json.dump({
+                "generated_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "queries": self.get_query_stats(),
+            }, f, indent=2, default=str)
+        return path
+
+    def reset_query_stats(self):
+        self.query_stats.reset()
+
+    def nuke_database(self, batch_size=10000, progress_callback=None, container_service=None):
+        """
+        Dangerous: Clears the entire database.
+        Relationships are deleted first, then nodes, in `CALL { ... } IN TRANSACTIONS`
+        batches, so the transaction heap stays bounded on graphs of any size.
+
+        Args:
+            batch_size (int): Entities deleted per inner transaction.
+            progress_callback (callable, optional): Called as (phase, deleted, total) after
+                every chunk, with phase "relationships" or "nodes".
+            container_service (ContainerService, optional): When the container is managed for
+                this context, drop and recreate the store instead of deleting entity by entity.
+                Falls back to the batched delete if recreation fails.
+
+        Returns:
+            dict: {"relationships_deleted": int, "nodes_deleted": int}, or {"status": "error", ...}.
+        """
+        if container_service is not None:
+            self.close() # The container restart invalidates every pooled connection
+            if container_service.recreate_store() and self.connect():
+                self.query_cache.invalidate()
+                self.clear_validation_cache()
+                return {"relationships_deleted": None, "nodes_deleted": None, "store_recreated": True}
+            print(f"{YELLOW}Store recreation failed, falling back to batched delete...{RESET}")
+
+        # Each statement deletes one chunk so progress can be reported between chunks
+        phases = [
+            ("relationships", "MATCH ()-[r]->() RETURN count(r) AS c",
+             "MATCH ()-[r]->() WITH r LIMIT $chunk CALL (r) { DELETE r } IN TRANSACTIONS OF $batch_size ROWS RETURN count(*) AS deleted"),
+            ("nodes", "MATCH (n) RETURN count(n) AS c",
+             "MATCH (n) WITH n LIMIT $chunk CALL (n) { DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS RETURN count(*) AS deleted"),
+        ]
+        params = {"batch_size": batch_size, "chunk": batch_size * 10}
+        report = {}
+        for phase, count_query, delete_query in phases:
+            res = self.send_query(count_query)
+            if not isinstance(res, list):
+                return res if isinstance(res, dict) else {"status": "error", "message": "No Connection"}
+            total = res[0]['c'] if res else 0
+            deleted = 0
+            while deleted < total:
+                res = self.send_query(delete_query, params)
+                if not isinstance(res, list):
+                    return res
+                chunk_deleted = res[0]['deleted'] if res else 0
+                if chunk_deleted == 0:
+                    break
+                deleted += chunk_deleted
+                if progress_callback:
+                    progress_callback(phase, deleted, total)
+            report[f"{phase}_deleted"] = deleted
+        return report
 
     def export_graph(self, filename):
         """Exports graph to a GraphML file using APOC."""
@@ -154,16 +906,228 @@ class GraphService:
         
         # We export to the import folder because Neo4j can write there easily
         # filename should be relative to import dir, e.g. "graph_dump.graphml"
-        export_query = f"CALL apoc.export.graphml.all('{filename}', {{}})"
+        export_query = "CALL apoc.export.graphml.all($file, {})"
         
         print(f"{YELLOW}>> Exporting graph to {filename} (in container)...{RESET}")
         try:
-            res = self.send_query(export_query)
+            res = self.send_query(export_query, {"file": filename})
             # APOC returns a stream or result, check for error in result dict
             return True
         except Exception as e:
              print(f"{RED}Export failed: {e}{RESET}")
              return False
 
-# Singleton instance for easy import
+class GraphSession:
+    """
+    A session held open by `GraphService.session_scope` / `transaction_scope`.
+    Statements share the session's connection instead of checking one out per call.
+    """
+    def __init__(self, service, session, tx=None):
+        self.service = service
+        self.session = session
+        self.tx = tx
+        self.failed = False
+        self.wrote = False
+        self.schema_changed = False
+
+    def send_query(self, cypher, params=None, cache=False):
+        """Same contract as GraphService.send_query, on the scoped session/transaction."""
+        if self.tx is None:
+            return self.service._run_collect(self.session.run, cypher, params, cache)
+
+        # Inside a transaction: no caching, invalidate once on commit/rollback
+        self.wrote = self.wrote or is_write_query(cypher)
+        self.schema_changed = self.schema_changed or is_schema_query(cypher)
+        result = self.service._run_collect(self.tx.run, cypher, params, cache=False, invalidate=False)
+        if isinstance(result, dict):
+            self.failed = True
+        return result
+
+    def execute_read(self, cypher, params=None):
+        if self.tx is not None:
+            return self.send_query(cypher, params)
+        return self.service._execute_managed_in(self.session, cypher, params, write=False)
+
+    def execute_write(self, cypher, params=None):
+        if self.tx is not None:
+            return self.send_query(cypher, params)
+        return self.service._execute_managed_in(self.session, cypher, params, write=True)
+
+class AsyncGraphService:
+    """
+    asyncio counterpart of GraphService, built on the neo4j AsyncDriver.
+    Lets async callers overlap independent Cypher calls over one tunable connection pool
+    instead of serializing them through the blocking `graphdb` singleton.
+    """
+    def __init__(self, uri=None, auth=None, max_connection_pool_size=None,
+                 connection_acquisition_timeout=None, max_concurrency=None, sync_service=None):
+        """
+        Initialize the Async Graph Service.
+
+        Args:
+            uri (str): Neo4j Bolt URI. Defaults to env param or localhost.
+            auth (tuple): (username, password). Defaults to env param or neo4j/password.
+            max_connection_pool_size (int): Pool size. Defaults to NEO4J_MAX_POOL_SIZE or 50.
+            connection_acquisition_timeout (float): Seconds to wait for a pooled connection.
+                Defaults to NEO4J_POOL_ACQUIRE_TIMEOUT or 60.
+            max_concurrency (int): Default limit for `send_queries`. Defaults to the pool size.
+            sync_service (GraphService, optional): Service whose cached reads (and validations)
+                writes through this service invalidate.
+        """
+        self.uri = uri or os.getenv("NEO4J_URI", "bolt://localhost:7687")
+        self.auth = auth or (
+            os.getenv("NEO4J_USERNAME", "neo4j"),
+            os.getenv("NEO4J_PASSWORD", "password")
+        )
+        self.max_connection_pool_size = max_connection_pool_size or int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+        self.connection_acquisition_timeout = connection_acquisition_timeout or float(os.getenv("NEO4J_POOL_ACQUIRE_TIMEOUT", "60"))
+        self.max_concurrency = max_concurrency or self.max_connection_pool_size
+        self.driver = None
+        self._loop = None
+        self.sync_service = sync_service
+        self.query_stats = query_stats
+        self.slow_query_log = slow_query_log
+
+    def _after_write(self, cypher):
+        # Same database as the blocking service, so its cached reads are stale now too
+        if self.sync_service is not None:
+            self.sync_service._after_write(cypher)
+
+    async def connect(self):
+        loop = asyncio.get_running_loop()
+        if self.driver and self._loop is not loop:
+            # The driver belongs to an event loop that is gone (e.g. a previous asyncio.run)
+            await self._discard_driver()
+        if not self.driver:
+            try:
+                self.driver = AsyncGraphDatabase.driver(
+                    self.uri, auth=self.auth,
+                    max_connection_pool_size=self.max_connection_pool_size,
+                    connection_acquisition_timeout=self.connection_acquisition_timeout,
+                )
+                await self.driver.verify_connectivity()
+                self._loop = loop
+                return True
+            except Exception:
+                await self._discard_driver()
+                return False
+        return True
+
+    async def _discard_driver(self):
+        """Closes the current driver (releasing its pool) and forgets it."""
+        driver, self.driver, self._loop = self.driver, None, None
+        if driver:
+            try:
+                await driver.close()
+            except Exception as e:
+                # A driver from a closed loop cannot always shut its sockets down cleanly
+                print(f"{YELLOW}Closing previous Neo4j driver failed: {e}{RESET}")
+
+    async def close(self):
+        if self.driver:
+            await self.driver.close()
+            self.driver = None
+            self._loop = None
+
+    async def send_query(self, cypher, params=None):
+        """Execute a Cypher query and return results as a list of dicts."""
+        if not await self.connect():
+            return None
+
+        try:
+            async with self.driver.session() as session:
+                result = await session.run(cypher, params or {})
+                rows = [record.data() async for record in result]
+                summary = await result.consume()
+                self.query_stats.record(cypher, summary, len(rows))
+                self.slow_query_log.observe(cypher, params, summary)
+                return rows
+        except Exception as e:
+            print(f"{RED}Query Failed: {e}{RESET}")
+            print(f"{YELLOW}Query: {cypher}{RESET}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            if is_write_query(cypher):
+                self._after_write(cypher)
+
+    async def send_queries(self, queries, max_concurrency=None):
+        """
+        Runs independent queries concurrently, each in its own session.
+
+        Args:
+            queries (list): (cypher, params) tuples or bare cypher strings.
+            max_concurrency (int, optional): In-flight limit. Defaults to `self.max_concurrency`.
+
+        Returns:
+            list: One `send_query` result per input, in input order.
+        """
+        if not await self.connect():
+            return [None] * len(queries)
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _run(query):
+            cypher, params = (query, None) if isinstance(query, str) else query
+            async with semaphore:
+                return await self.send_query(cypher, params)
+
+        return await asyncio.gather(*[_run(q) for q in queries])
+
+    async def stream_query(self, cypher, params=None, fetch_size=1000):
+        """Async generator yielding records as dicts; see GraphService.stream_query."""
+        if not await self.connect():
+            return
+
+        try:
+            async with self.driver.session(fetch_size=fetch_size) as session:
+                result = await session.run(cypher, params or {})
+                count = 0
+                async for record in result:
+                    count += 1
+                    yield record.data()
+                summary = await result.consume()
+                self.query_stats.record(cypher, summary, count)
+                self.slow_query_log.observe(cypher, params, summary)
+        except Exception as e:
+            print(f"{RED}Streaming Query Failed: {e}{RESET}")
+            print(f"{YELLOW}Query: {cypher}{RESET}")
+            raise
+        finally:
+            if is_write_query(cypher):
+                self._after_write(cypher)
+
+    async def write_batches(self, query, rows, batch_size=10000, params=None, progress_callback=None):
+        """Async variant of GraphService.write_batches (same arguments and return value)."""
+        if not await self.connect():
+            return None
+
+        if "$rows" not in query:
+            query = f"UNWIND $rows AS row\n{query}"
+
+        async def _write_batch(tx, batch):
+            result = await tx.run(query, {**(params or {}), "rows": batch})
+            return await result.consume()
+
+        totals = {"batches": 0, "rows": 0}
+        try:
+            async with self.driver.session() as session:
+                for batch in _chunked(rows, batch_size):
+                    summary = await session.execute_write(_write_batch, batch)
+                    self.query_stats.record(query, summary)
+                    self.slow_query_log.observe(query, {**(params or {}), "rows": batch}, summary)
+                    _add_counters(totals, summary.counters)
+                    totals["batches"] += 1
+                    totals["rows"] += len(batch)
+                    if progress_callback:
+                        progress_callback(totals["rows"])
+            return totals
+        except Exception as e:
+            print(f"{RED}Batch Write Failed after {totals['rows']} rows: {e}{RESET}")
+            print(f"{YELLOW}Query: {query}{RESET}")
+            return {"status": "error", "message": str(e), **totals}
+        finally:
+            self._after_write(query)
+
+# Singleton instances for easy import
 graphdb = GraphService()
+async_graphdb = AsyncGraphService(sync_service=graphdb)
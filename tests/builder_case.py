@@ -0,0 +1,18 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+from core.context import Context
+from agents.graph_builder import GraphBuilderAgent
+
+
+class BuilderTestCase(unittest.TestCase):
+    """Base case providing `self.builder`: an offline GraphBuilderAgent on a temporary context (`self.ctx`)."""
+    builder_kwargs = {}
+
+    def setUp(self):
+        def init(agent, **kwargs):
+            agent.module_name = "GraphBuilderAgent"
+        self.ctx = Context.from_path(tempfile.mkdtemp())
+        with patch('agents.schema_agent.BaseAgent.__init__', init), \
+             patch('core.logging_utils.get_log_file_path', return_value=f"{self.ctx.base_path}/log.md"):
+            self.builder = GraphBuilderAgent(context=self.ctx, verbose=False, **self.builder_kwargs)
@@ -0,0 +1,22 @@
+import unittest
+from unittest.mock import MagicMock
+from services.graph_service import GraphService
+
+
+def fake_result(records, **summary):
+    """A driver Result stand-in: iterable of records with a consume() summary."""
+    result = MagicMock()
+    result.__iter__.side_effect = lambda: iter(records)
+    result.consume.return_value = MagicMock(**summary)
+    return result
+
+
+class GraphServiceTestCase(unittest.TestCase):
+    """Base case providing `self.service`: a GraphService on a mock driver (`self.mock_driver`) whose sessions are `self.session`."""
+
+    def setUp(self):
+        self.mock_driver = MagicMock()
+        self.service = GraphService()
+        self.service.driver = self.mock_driver
+        self.session = MagicMock()
+        self.mock_driver.session.return_value.__enter__.return_value = self.session
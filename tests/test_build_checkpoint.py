@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from core.build_checkpoint import BuildCheckpoint
+from builder_case import BuilderTestCase
+
+
+class TestBuildCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+
+    def test_progress_survives_a_restart(self):
+        checkpoint = BuildCheckpoint(self.base)
+        checkpoint.start("b1", "plan-fp", ["node:A:a.csv", "node:B:b.csv", "rel:R:A:B"])
+        checkpoint.complete("node:A:a.csv")
+        checkpoint.advance(["node:B:b.csv"], 20000)
+
+        reloaded = BuildCheckpoint(self.base)
+        self.assertEqual(reloaded.state["build_id"], "b1")
+        self.assertEqual(reloaded.pending(), ["node:B:b.csv", "rel:R:A:B"])
+        self.assertEqual(reloaded.offset(["node:B:b.csv"]), 20000)
+        # A fused task resumes from its least advanced rule
+        self.assertEqual(reloaded.offset(["node:B:b.csv", "rel:R:A:B"]), 0)
+
+        reloaded.complete("node:B:b.csv")
+        self.assertEqual(reloaded.offset(["node:B:b.csv"]), 0)
+        reloaded.clear()
+        self.assertFalse(os.path.exists(reloaded.path))
+        self.assertEqual(BuildCheckpoint(self.base).state, {})
+
+    def test_offsets_into_a_changed_file_are_dropped(self):
+        checkpoint = BuildCheckpoint(self.base)
+        checkpoint.start("b1", "plan-fp", ["node:A:a.csv", "node:B:b.csv"],
+                         file_fingerprints={"node:A:a.csv": "a1", "node:B:b.csv": "b1"})
+        checkpoint.advance(["node:A:a.csv"], 500)
+        checkpoint.advance(["node:B:b.csv"], 700)
+
+        reloaded = BuildCheckpoint(self.base)
+        self.assertEqual(reloaded.drop_changed_offsets({"node:A:a.csv": "a1", "node:B:b.csv": "b2"}), ["node:B:b.csv"])
+        self.assertEqual(BuildCheckpoint(self.base).offset(["node:A:a.csv"]), 500)
+        self.assertEqual(BuildCheckpoint(self.base).offset(["node:B:b.csv"]), 0)
+
+
+class TestStreamResume(BuilderTestCase):
+    def setUp(self):
+        super().setUp()
+        ctx = self.ctx
+        self.path = os.path.join(ctx.base_path, "p.csv")
+        with open(self.path, "w") as f:
+            f.write("id\n" + "".join(f"{i}\n" for i in range(5)))
+        self.builder.checkpoint = BuildCheckpoint(ctx.base_path)
+        self.builder.checkpoint.start("b1", "fp", ["node:P:p.csv"])
+
+    def test_skips_committed_rows_and_records_new_offsets(self):
+        written = []
+
+        def write_batches(query, rows, batch_size, params, progress_callback):
+            for row in rows:
+                written.append(row["id"])
+                if len(written) % batch_size == 0:
+                    progress_callback(len(written))
+            return {"rows": len(written)}
+
+        stream = {"path": self.path, "headers": True, "text_rows": False, "batch_size": 1,
+                  "rule_ids": ["node:P:p.csv"], "offset": 3}
+        with patch('agents.graph_builder.graphdb.write_batches', side_effect=write_batches):
+            self.builder._stream_import("Import P", "Q", {}, stream)
+        self.assertEqual(written, ["3", "4"])
+        self.assertEqual(self.builder.checkpoint.offset(["node:P:p.csv"]), 5)
+
+    def test_split_rule_offsets_count_source_rows(self):
+        with open(self.path, "w") as f:
+            f.write("id,ingredients\n1,\"salt,sugar\"\n2,sugar\n3,\"flour,egg,milk\"\n4,salt\n")
+        node = {"label": "Ingredient", "unique_column_name": "name", "transformation_rule": "Split ingredients by comma"}
+        self.builder._fast_seen = {}
+        written = []
+
+        def write_batches(query, rows, batch_size, params, progress_callback):
+            for row in rows:
+                written.append(row)
+                if len(written) % batch_size == 0:
+                    progress_callback(len(written))
+                if len(written) == 4:
+                    raise RuntimeError("connection lost")
+            return {"rows": len(written)}
+
+        stream = {"path": self.path, "headers": True, "text_rows": False, "batch_size": 2,
+                  "rule_ids": ["node:P:p.csv"], "offset": 0,
+                  "transform": self.builder._fast_transform(node, "p.csv")}
+        with patch('agents.graph_builder.graphdb.write_batches', side_effect=write_batches):
+            self.builder._stream_import("Import Ingredient", "Q", {}, stream)
+        # salt, sugar | flour, egg committed: rows 1-2 are done, row 3 is only partly written
+        self.assertEqual(self.builder.checkpoint.offset(["node:P:p.csv"]), 2)
+
+        # A resumed build streams without the dedup filter and restarts at source row 3
+        written.clear()
+        resumed = {**stream, "offset": 2, "transform": None, "batch_size": 10}
+        with patch('agents.graph_builder.graphdb.write_batches', side_effect=write_batches):
+            self.builder._stream_import("Import Ingredient", "Q", {}, resumed)
+        self.assertEqual([row["id"] for row in written], ["3", "4"])
+
+    def test_transformed_streams_report_source_rows(self):
+        with open(self.path, "w") as f:
+            f.write("id,ingredients\n1,\"salt,sugar\"\n2,sugar\n3,salt\n")
+        node = {"label": "Ingredient", "unique_column_name": "name", "transformation_rule": "Split ingredients by comma"}
+        self.builder._fast_seen = {}
+        stream = {"path": self.path, "headers": True, "text_rows": False, "batch_size": 10,
+                  "transform": self.builder._fast_transform(node, "p.csv")}
+
+        def write_batches(query, rows, batch_size, params, progress_callback):
+            return {"rows": len(list(rows)), "nodes_created": 2}
+
+        with patch('agents.graph_builder.graphdb.write_batches', side_effect=write_batches):
+            result = self.builder._stream_import("Import Ingredient", "Q", {}, stream)
+        self.assertEqual(result["rows"], 3)  # two distinct ingredients written from three rows
+
+
+if __name__ == '__main__':
+    unittest.main()
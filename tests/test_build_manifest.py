@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from core.build_manifest import BuildManifest, file_fingerprint, plan_delta, rule_id
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.product = {"label": "Product", "source_file": "products.csv", "unique_column_name": "id"}
+        self.supplier = {"label": "Supplier", "source_file": "suppliers.csv", "unique_column_name": "id"}
+        self.rel = {"relationship_type": "SUPPLIED_BY", "from_node_label": "Product", "to_node_label": "Supplier",
+                    "source_file": "supply.csv"}
+        self.fps = {rule_id(self.product): "p1", rule_id(self.supplier): "s1", rule_id(self.rel): "r1"}
+
+        manifest = BuildManifest(self.base)
+        for rule in (self.product, self.supplier, self.rel):
+            manifest.record(rule, self.fps[rule_id(rule)], "build-1")
+        manifest.save()
+        self.manifest = BuildManifest(self.base)
+
+    def test_unchanged_plan_has_no_delta(self):
+        self.assertEqual(plan_delta(self.manifest, [self.product, self.supplier], [self.rel], self.fps), ([], [], {}))
+
+    def test_changed_file_reimports_rule_and_dependent_relationships(self):
+        fps = {**self.fps, rule_id(self.supplier): "s2"}
+        nodes, rels, removed = plan_delta(self.manifest, [self.product, self.supplier], [self.rel], fps)
+        self.assertEqual(nodes, [self.supplier])
+        self.assertEqual(rels, [self.rel])
+        self.assertEqual(removed, {})
+
+    def test_changed_rule_and_removed_rule(self):
+        product = {**self.product, "properties": ["id", "name"]}
+        nodes, rels, removed = plan_delta(self.manifest, [product], [], self.fps)
+        self.assertEqual(nodes, [product])
+        self.assertEqual(set(removed), {rule_id(self.supplier), rule_id(self.rel)})
+        self.assertEqual(removed[rule_id(self.supplier)]["label"], "Supplier")
+
+    def test_rules_sharing_a_label_or_type_are_tracked_per_file(self):
+        imported = {**self.product, "source_file": "imported_products.csv"}
+        imported_rel = {**self.rel, "source_file": "imported_supply.csv"}
+        self.assertNotEqual(rule_id(self.product), rule_id(imported))
+        self.assertNotEqual(rule_id(self.rel), rule_id(imported_rel))
+
+        manifest = BuildManifest(self.base)
+        fps = {**self.fps, rule_id(imported): "i1", rule_id(imported_rel): "ir1"}
+        for rule in (imported, imported_rel):
+            manifest.record(rule, fps[rule_id(rule)], "build-1")
+
+        # Only the second file changed: the rule reading products.csv is neither re-imported nor removed
+        fps[rule_id(imported)] = "i2"
+        nodes, rels, removed = plan_delta(manifest, [self.product, imported, self.supplier],
+                                          [self.rel, imported_rel], fps)
+        self.assertEqual(nodes, [imported])
+        self.assertEqual(removed, {})
+        self.assertEqual(rels, [self.rel, imported_rel])  # Product nodes changed, so both endpoints are re-matched
+
+    def test_file_fingerprint(self):
+        path = os.path.join(self.base, "a.csv")
+        with open(path, "w") as f:
+            f.write("id\n1\n")
+        first = file_fingerprint(path)
+        with open(path, "a") as f:
+            f.write("2\n")
+        self.assertNotEqual(first, file_fingerprint(path))
+        self.assertIsNone(file_fingerprint(os.path.join(self.base, "missing.csv")))
+
+
+if __name__ == '__main__':
+    unittest.main()
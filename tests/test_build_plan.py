@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from core.build_plan import build_import_dag, group_rules_by_file, match_key_indexes, run_import_dag
+from builder_case import BuilderTestCase
+
+
+NODES = [
+    {"label": "Product", "source_file": "products.csv"},
+    {"label": "Supplier", "source_file": "suppliers.csv"},
+    {"label": "Ingredient", "source_file": "products.csv"},
+]
+RELS = [
+    {"relationship_type": "CONTAINS", "from_node_label": "Product", "to_node_label": "Ingredient"},
+    {"relationship_type": "SUPPLIED_BY", "from_node_label": "Product", "to_node_label": "Supplier"},
+]
+
+
+class TestBuildPlan(unittest.TestCase):
+
+    def test_match_keys_not_covered_by_constraints_need_indexes(self):
+        nodes = [{"label": "Recipe", "unique_column_name": "id"}, {"label": "Ingredient", "unique_column_name": "id"}]
+        rels = [{"relationship_type": "CONTAINS", "from_node_label": "Recipe", "to_node_label": "Ingredient",
+                 "from_node_column": "id", "to_node_column": "name"},
+                {"relationship_type": "PAIRS_WITH", "from_node_label": "Ingredient", "to_node_label": "Ingredient",
+                 "from_node_column": "name", "to_node_column": "name"}]
+        self.assertEqual(match_key_indexes(nodes, rels), [("Ingredient", "name")])
+
+    def test_relationships_depend_on_endpoint_labels(self):
+        tasks = {t.key: t for t in build_import_dag(NODES, RELS)}
+        contains = tasks["rel:0:CONTAINS"]
+        self.assertEqual(contains.depends_on, {"node:0:Product", "node:2:Ingredient"})
+        self.assertEqual(contains.locks, {"Product", "Ingredient"})
+        self.assertEqual(tasks["node:1:Supplier"].depends_on, set())
+
+    def test_nodes_run_concurrently_and_relationships_wait(self):
+        order = []
+        active = []
+        peak = [0]
+        guard = threading.Lock()
+
+        def worker(task):
+            with guard:
+                active.append(task.key)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.05)
+            with guard:
+                active.remove(task.key)
+                order.append(task.key)
+            return True
+
+        status = run_import_dag(build_import_dag(NODES, RELS), worker, max_workers=4)
+
+        self.assertTrue(all(s == "SUCCESS" for s in status.values()))
+        self.assertEqual(peak[0], 3)  # all node labels at once; rels share Product so run one at a time
+        self.assertEqual(set(order[:3]), {"node:0:Product", "node:1:Supplier", "node:2:Ingredient"})
+
+    def test_failed_node_skips_its_relationships(self):
+        skipped = []
+        status = run_import_dag(build_import_dag(NODES, RELS), lambda task: task.key != "node:1:Supplier",
+                                max_workers=2, on_skip=lambda task, failed: skipped.append((task.key, failed)))
+
+        self.assertEqual(status["node:1:Supplier"], "ERROR")
+        self.assertEqual(status["rel:1:SUPPLIED_BY"], "SKIPPED")
+        self.assertEqual(status["rel:0:CONTAINS"], "SUCCESS")
+        self.assertEqual(skipped, [("rel:1:SUPPLIED_BY", {"node:1:Supplier"})])
+
+    def test_rules_sharing_a_file_form_one_task(self):
+        nodes = [
+            {"label": "Product", "source_file": "products.csv", "unique_column_name": "id"},
+            {"label": "Category", "source_file": "products.csv", "unique_column_name": "category"},
+            {"label": "Supplier", "source_file": "suppliers.csv", "unique_column_name": "id"},
+        ]
+        belongs = {"relationship_type": "BELONGS_TO", "from_node_label": "Product", "from_node_column": "id",
+                   "to_node_label": "Category", "to_node_column": "category"}
+        # Parent rows may come later in the file, so this one needs a second pass
+        parent = {"relationship_type": "PARENT", "from_node_label": "Product", "from_node_column": "id",
+                  "to_node_label": "Product", "to_node_column": "parent_id"}
+        rels = [belongs, parent]
+
+        groups, rest_nodes, rest_rels = group_rules_by_file(
+            nodes, rels, lambda rule: rule.get("source_file", "products.csv"))
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0]["relationships"], [belongs])
+        self.assertEqual([n["label"] for n in rest_nodes], ["Supplier"])
+        self.assertEqual(rest_rels, [parent])
+
+        tasks = {t.key: t for t in build_import_dag(rest_nodes, rest_rels, groups)}
+        self.assertEqual(tasks["file:0:products.csv"].locks, {"Product", "Category"})
+        self.assertEqual(tasks["rel:0:PARENT"].depends_on, {"file:0:products.csv"})
+
+
+class TestCreateConstraints(BuilderTestCase):
+    def test_ddl_runs_serially_and_index_failures_only_warn(self):
+        nodes = [{"label": "Recipe", "unique_column_name": "id"}]
+        rels = [{"relationship_type": "CONTAINS", "from_node_label": "Recipe", "to_node_label": "Ingredient",
+                 "from_node_column": "id", "to_node_column": "name"}]
+        with patch('agents.graph_builder.graphdb') as db, patch.object(self.builder, 'log_step') as log_step:
+            db.execute_write.side_effect = lambda query: (
+                {"status": "error", "message": "key too large"} if "INDEX" in query else [])
+            db.send_query.return_value = {"status": "error", "message": "Index kg_Ingredient_name FAILED"}
+            self.builder.create_constraints(nodes, rels)
+
+        statuses = {call.args[0]: call.args[2] for call in log_step.call_args_list if len(call.args) > 2}
+        self.assertEqual(statuses, {"Constraint for Recipe": "SUCCESS", "Index for Ingredient": "WARNING",
+                                    "Await Indexes": "WARNING"})
+        # Managed write transactions, in plan order: the driver retries schema-lock conflicts
+        self.assertEqual([c.args[0].split()[1] for c in db.execute_write.call_args_list], ["CONSTRAINT", "INDEX"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from core.build_report import build_report, diff_reports, load_previous_report, render_report, save_report
+
+
+def rule(step, rows, seconds, **counters):
+    return {"step": step, "status": "SUCCESS", "rows": rows, "seconds": seconds,
+            "rows_per_sec": rows / seconds, "nodes_created": counters.get("nodes", 0),
+            "relationships_created": counters.get("rels", 0), "properties_set": counters.get("props", 0)}
+
+
+class TestBuildReport(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+
+    def test_report_totals_and_persistence(self):
+        report = build_report("b1", [rule("Import Product", 1000, 2.0, nodes=1000, props=2000),
+                                     rule("Rel CONTAINS", 500, 1.0, rels=450)], 100.0, 104.0)
+        self.assertEqual(report["totals"]["rows"], 1500)
+        self.assertEqual(report["totals"]["relationships_created"], 450)
+        self.assertEqual(report["totals"]["rows_per_sec"], 375.0)
+
+        path = save_report(self.base, report, render_report(report))
+        self.assertTrue(os.path.exists(path))
+        self.assertTrue(os.path.exists(path.replace(".json", ".md")))
+        self.assertEqual(load_previous_report(self.base)["build_id"], "b1")
+        self.assertIsNone(load_previous_report(self.base, exclude_build_id="b1"))
+
+    def test_diff_flags_throughput_regressions(self):
+        previous = build_report("b1", [rule("Import Product", 1000, 1.0), rule("Import Review", 100, 1.0)], 0, 2)
+        current = build_report("b2", [rule("Import Product", 1000, 2.0), rule("Import Review", 100, 0.9),
+                                      rule("Import New", 10, 1.0)], 0, 4)
+        diff = {d["step"]: d for d in diff_reports(current, previous)}
+
+        self.assertEqual(diff["Import Product"]["change"], -0.5)
+        self.assertTrue(diff["Import Product"]["regression"])
+        self.assertFalse(diff["Import Review"]["regression"])
+        self.assertIsNone(diff["Import New"]["change"])
+        self.assertIn("REGRESSION", render_report(current, list(diff.values())))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import threading
+import unittest
+from core.csv_stream import iter_csv_rows, prefetch_rows
+
+
+class TestCsvStream(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_rows_match_load_csv_binding(self):
+        path = self.write("p.csv", "id,name\n1,Apple\n2,\n")
+        self.assertEqual(list(iter_csv_rows(path)), [{"id": "1", "name": "Apple"}, {"id": "2", "name": None}])
+        self.assertEqual(list(iter_csv_rows(path, headers=False))[0], ["id", "name"])
+
+        text = self.write("r.txt", "great product\nbad, broken\n")
+        self.assertEqual(list(iter_csv_rows(text, text_rows=True)),
+                         [{"ln": 1, "text": "great product"}, {"ln": 2, "text": "bad"}])
+
+    def test_prefetch_preserves_order_and_bounds_the_queue(self):
+        produced = []
+
+        def rows():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        stream = prefetch_rows(rows(), batch_size=10, max_batches=2)
+        self.assertEqual(next(stream), 0)
+        # Reader may be at most: the batch being consumed + 2 queued + 1 being put
+        self.assertLessEqual(len(produced), 40)
+        self.assertEqual(list(stream), list(range(1, 100)))
+
+    def test_reader_errors_reach_the_consumer(self):
+        def rows():
+            yield {"id": 1}
+            raise ValueError("bad line")
+
+        with self.assertRaises(ValueError):
+            list(prefetch_rows(rows(), batch_size=1))
+
+    def test_closing_early_stops_the_reader(self):
+        stream = prefetch_rows(iter(range(10 ** 6)), batch_size=10, max_batches=1)
+        next(stream)
+        stream.close()
+        self.assertFalse(any(t.name == "csv-prefetch" and t.is_alive() for t in threading.enumerate()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+from unittest.mock import MagicMock
+from services.cypher_templates import (
+    escape_identifier, heuristic_node_query, heuristic_relationship_query,
+    uniqueness_constraint, range_index, warm_templates, is_batched, wrap_in_transactions, stale_nodes_query,
+    stale_relationships_query, with_row_count,
+    streamed_node_query, load_csv_to_unwind, file_import_query, create_nodes_query, create_relationships_query
+)
+
+
+class TestCypherTemplates(unittest.TestCase):
+
+    def test_escape_identifier(self):
+        self.assertEqual(escape_identifier("Product"), "`Product`")
+        self.assertEqual(escape_identifier("Bad`Label"), "`Bad``Label`")
+
+    def test_node_query_passes_values_as_params(self):
+        node = {"label": "Product", "unique_column_name": "id", "properties": ["id", "name"]}
+        query, params = heuristic_node_query(node, "products.csv")
+
+        self.assertIn("LOAD CSV WITH HEADERS FROM $file_url AS row", query)
+        self.assertIn("MERGE (n:`Product` { `id`: row[$key_column] })", query)
+        self.assertIn("n.`name` = row[$column_0]", query)
+        self.assertNotIn("products.csv", query)
+        self.assertEqual(params, {"file_url": "file:///products.csv", "key_column": "id", "column_0": "name"})
+
+    def test_same_rule_shape_gives_same_text_for_different_files(self):
+        node = {"label": "Product", "unique_column_name": "id", "properties": ["id"]}
+        q1, p1 = heuristic_node_query(node, "products.csv")
+        q2, p2 = heuristic_node_query(node, "products_2024.csv")
+        self.assertEqual(q1, q2)
+        self.assertNotEqual(p1["file_url"], p2["file_url"])
+
+    def test_split_and_text_rules(self):
+        split = {"label": "Ingredient", "unique_column_name": "name", "transformation_rule": "Split ingredients by comma"}
+        query, params = heuristic_node_query(split, "products.csv")
+        self.assertIn("split(row[$split_column], $delimiter)", query)
+        self.assertEqual(params["split_column"], "ingredients")
+
+        text = {"label": "Review", "unique_column_name": "id", "properties": ["review_text"]}
+        query, params = heuristic_node_query(text, "reviews.txt")
+        self.assertIn("LOAD CSV FROM $file_url AS line", query)
+        self.assertIn("SET n.`review_text` = row.text", query)
+
+    def test_relationship_query(self):
+        rel = {"relationship_type": "CONTAINS", "from_node_label": "Product", "to_node_label": "Ingredient",
+               "from_node_column": "id", "to_node_column": "name"}
+        query, params = heuristic_relationship_query(rel, "links.csv")
+        self.assertIn("MATCH (source:`Product` { `id`: row[$source_column] })", query)
+        self.assertIn("MERGE (source)-[r:`CONTAINS`]->(target)", query)
+        self.assertEqual(params["target_column"], "name")
+
+    def test_batched_import_commits_every_batch_size_rows(self):
+        node = {"label": "Product", "unique_column_name": "id", "properties": ["id"]}
+        query, params = heuristic_node_query(node, "products.csv", batch_size=5000)
+        self.assertIn("CALL (row) {", query)
+        self.assertIn("} IN TRANSACTIONS OF $batch_size ROWS", query)
+        self.assertTrue(query.strip().endswith("RETURN count(*) AS rows"))
+        self.assertEqual(params["batch_size"], 5000)
+        self.assertTrue(is_batched(query))
+        self.assertFalse(is_batched(heuristic_node_query(node, "products.csv")[0]))
+
+    def test_unbatched_imports_report_rows_read(self):
+        node = {"label": "Product", "unique_column_name": "id", "properties": ["id"]}
+        query, params = heuristic_node_query(node, "products.csv")
+        self.assertTrue(query.strip().endswith("}\nRETURN count(*) AS rows"))
+        self.assertNotIn("batch_size", params)
+
+        llm = "LOAD CSV WITH HEADERS FROM 'file:///p.csv' AS line\nUNWIND split(line.tags, ',') AS t MERGE (:Tag {name: t})"
+        counted = with_row_count(llm)
+        self.assertIn("CALL (line) {", counted)
+        self.assertTrue(counted.strip().endswith("RETURN count(*) AS rows"))
+        self.assertFalse(is_batched(counted))
+        self.assertIsNone(with_row_count("LOAD CSV FROM 'file:///a.csv' AS r WITH count(*) AS n CREATE (:A {n: n})"))
+        self.assertIsNone(with_row_count(wrap_in_transactions(llm)))
+
+    def test_wrap_llm_query(self):
+        llm = "USING PERIODIC COMMIT 500 LOAD CSV WITH HEADERS FROM 'file:///p.csv' AS line\nMERGE (p:Product {id: line.id});"
+        wrapped = wrap_in_transactions(llm)
+        self.assertTrue(wrapped.startswith("LOAD CSV WITH HEADERS FROM 'file:///p.csv' AS line"))
+        self.assertIn("CALL (line) {", wrapped)
+        self.assertNotIn("PERIODIC", wrapped)
+        self.assertEqual(wrap_in_transactions(wrapped), wrapped)
+
+        self.assertIsNone(wrap_in_transactions("LOAD CSV FROM 'file:///a.csv' AS r MERGE (n:A {id: r[0]}) RETURN count(n)"))
+        self.assertIsNone(wrap_in_transactions("MATCH (n) SET n.x = 1"))
+        self.assertIsNone(wrap_in_transactions("LOAD CSV FROM 'file:///a.csv' AS r CREATE (:A); LOAD CSV FROM 'file:///b.csv' AS r CREATE (:B)"))
+
+    def test_only_per_row_bodies_are_split(self):
+        head = "LOAD CSV WITH HEADERS FROM 'file:///p.csv' AS line "
+        for body in ["WITH collect(line.id) AS ids UNWIND ids AS id MERGE (:P {id: id})",
+                     "WITH DISTINCT line.category AS c MERGE (:C {name: c})",
+                     "WITH line ORDER BY line.date LIMIT 10 MERGE (:P {id: line.id})",
+                     "WITH line.brand AS b, count(*) AS n MERGE (:B {name: b, products: n})"]:
+            self.assertIsNone(wrap_in_transactions(head + body), body)
+            self.assertIsNone(load_csv_to_unwind(head + body), body)
+
+        # Names and literals that merely look like aggregations stay per-row
+        per_row = head + "MERGE (p:P {id: line.id}) SET p.`count(x)` = 'collect(' , p.item_count = toInteger(line.count)"
+        self.assertIsNotNone(wrap_in_transactions(per_row))
+        self.assertIsNotNone(load_csv_to_unwind(per_row))
+
+    def test_streamed_queries_unwind_client_batches(self):
+        node = {"label": "Product", "unique_column_name": "id", "properties": ["id", "name"]}
+        query, params = streamed_node_query(node, "products.csv")
+        self.assertIn("UNWIND $rows AS row", query)
+        self.assertNotIn("LOAD CSV", query)
+        self.assertEqual(params, {"key_column": "id", "column_0": "name"})
+
+        rewritten, headers = load_csv_to_unwind("LOAD CSV WITH HEADERS FROM 'file:///p.csv' AS line MERGE (p:P {id: line.id})")
+        self.assertEqual(rewritten, "UNWIND $rows AS line\nMERGE (p:P {id: line.id})")
+        self.assertTrue(headers)
+        self.assertFalse(load_csv_to_unwind("LOAD CSV FROM 'file:///r.txt' AS l CREATE (:R {t: l[0]})")[1])
+        self.assertIsNone(load_csv_to_unwind("MATCH (n) RETURN n"))
+
+    def test_initial_load_queries_create(self):
+        query, params = create_nodes_query({"label": "Product", "unique_column_name": "id"}, provenance=("node:Product:p.csv", "b1"))
+        self.assertIn("UNWIND $rows AS row", query)
+        self.assertIn("CREATE (n:`Product`)", query)
+        self.assertNotIn("MERGE", query)
+        self.assertEqual(params, {"kg_rule": "node:Product:p.csv", "kg_build": "b1"})
+
+        rel = {"relationship_type": "IN", "from_node_label": "Product", "to_node_label": "Category",
+               "from_node_column": "id", "to_node_column": "category"}
+        query, params = create_relationships_query(rel)
+        self.assertIn("MATCH (source:`Product` { `id`: row.source })", query)
+        self.assertIn("CREATE (source)-[r:`IN`]->(target)", query)
+        self.assertEqual(params, {})
+
+    def test_file_import_runs_every_rule_in_one_pass(self):
+        nodes = [{"label": "Product", "unique_column_name": "id", "properties": ["id"]},
+                 {"label": "Category", "unique_column_name": "category"}]
+        rels = [{"relationship_type": "IN", "from_node_label": "Product", "to_node_label": "Category",
+                 "from_node_column": "id", "to_node_column": "category"}]
+        query, params = file_import_query("products.csv", nodes, rels, batch_size=500)
+
+        self.assertEqual(query.count("LOAD CSV"), 1)
+        self.assertEqual(query.count("CALL (row) {"), 4)  # batch wrapper + one per rule
+        self.assertLess(query.index("`Category` { `category`: row[$r1_key_column]"), query.index("MERGE (source)"))
+        self.assertEqual((params["r0_key_column"], params["r1_key_column"], params["r2_target_column"]),
+                         ("id", "category", "category"))
+
+    def test_provenance_stamp_and_sweep(self):
+        rel = {"relationship_type": "CONTAINS", "from_node_label": "Product", "to_node_label": "Ingredient"}
+        query, params = heuristic_relationship_query(rel, "links.csv", batch_size=100, provenance=("rel:CONTAINS", "b2"))
+        # Only this rule's stamp is replaced; stamps of other rules on the same entity stay
+        self.assertIn("SET r._kg_rules = [stamp IN coalesce(r._kg_rules, []) WHERE NOT stamp STARTS WITH $kg_rule + '@']"
+                      " + ($kg_rule + '@' + $kg_build)", query)
+        self.assertLess(query.index("_kg_rules"), query.index("} IN TRANSACTIONS"))
+        self.assertEqual((params["kg_rule"], params["kg_build"]), ("rel:CONTAINS", "b2"))
+
+        sweep = stale_nodes_query("Product")
+        self.assertIn("stamp STARTS WITH $kg_rule + '@' AND stamp <> $kg_rule + '@' + $kg_build", sweep)
+        # Entities still supplied by another rule only lose this rule's stamp
+        self.assertLess(sweep.index("SET n._kg_rules"), sweep.index("WHERE size(n._kg_rules) = 0 DETACH DELETE n"))
+        self.assertIn("DELETE r", stale_relationships_query("CONTAINS"))
+
+    def test_constraint_and_warmup(self):
+        self.assertEqual(uniqueness_constraint("Product", "id"),
+                         "CREATE CONSTRAINT IF NOT EXISTS FOR (n:`Product`) REQUIRE n.`id` IS UNIQUE")
+        self.assertEqual(range_index("Ingredient", "name"),
+                         "CREATE INDEX `kg_Ingredient_name` IF NOT EXISTS FOR (n:`Ingredient`) ON (n.`name`)")
+
+        graph = MagicMock()
+        graph.validate_cypher.side_effect = [(True, None), (False, "Syntax Error")]
+        failures = warm_templates(graph, [("Q1", {"a": 1}), ("Q2", {})])
+        self.assertEqual(failures, [("Q2", "Syntax Error")])
+        graph.validate_cypher.assert_any_call("Q1", {"a": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from core.fast_load import fast_load_labels, node_rows, relationship_rows, seen_key
+
+
+class TestFastLoad(unittest.TestCase):
+    def test_node_rows_keep_first_row_per_key(self):
+        node = {"label": "Product", "unique_column_name": "id", "properties": ["id", "name", "price"]}
+        rows = [{"id": "1", "name": "Apple", "price": None}, {"id": "1", "name": "Pear"},
+                {"id": None, "name": "No key"}, {"id": "2", "name": "Fig", "price": "3"}]
+        seen = set()
+        self.assertEqual(list(node_rows(rows, node, "products.csv", seen)),
+                         [{"id": "1", "name": "Apple"}, {"id": "2", "name": "Fig", "price": "3"}])
+        # The seen-set outlives one call, e.g. across the batches of a stream
+        self.assertEqual(list(node_rows([{"id": "2"}, {"id": "3"}], node, "more.csv", seen)), [{"id": "3"}])
+
+    def test_split_and_text_rules(self):
+        split = {"label": "Ingredient", "unique_column_name": "name", "transformation_rule": "Split ingredients by comma"}
+        rows = [{"ingredients": "salt, sugar"}, {"ingredients": "sugar,,flour"}, {"ingredients": None}]
+        self.assertEqual([r["name"] for r in node_rows(rows, split, "recipes.csv", set())], ["salt", "sugar", "flour"])
+
+        text = {"label": "Review", "unique_column_name": "id", "properties": ["id", "content"]}
+        rows = [{"ln": 1, "text": "Great"}, {"ln": 2, "text": None}]
+        self.assertEqual(list(node_rows(rows, text, "reviews.txt", set())), [{"id": "1", "content": "Great"}])
+
+    def test_relationship_rows_dedupe_pairs(self):
+        rel = {"relationship_type": "CONTAINS", "from_node_column": "recipe", "to_node_column": "ingredient"}
+        rows = [{"recipe": "r1", "ingredient": "salt"}, {"recipe": "r1", "ingredient": "salt"},
+                {"recipe": "r2", "ingredient": None}, {"recipe": "r2", "ingredient": "salt"}]
+        self.assertEqual(list(relationship_rows(rows, rel, set())),
+                         [{"source": "r1", "target": "salt"}, {"source": "r2", "target": "salt"}])
+
+    def test_relationship_rules_do_not_share_pairs(self):
+        rel = {"relationship_type": "SOLD_BY", "from_node_label": "Product", "to_node_label": "Store",
+               "from_node_column": "id", "to_node_column": "store_id", "source_file": "sales.csv"}
+        by_name = {**rel, "to_node_column": "store_name"}
+        other_file = {**rel, "source_file": "returns.csv"}
+        self.assertEqual(len({seen_key(rel), seen_key(by_name), seen_key(other_file)}), 3)
+        self.assertEqual(seen_key(rel), seen_key(dict(rel)))
+        self.assertEqual(seen_key({"label": "Product", "source_file": "a.csv"}),
+                         seen_key({"label": "Product", "source_file": "b.csv"}))
+
+    def test_labels_with_several_rules_keep_merge(self):
+        # Same key, different properties: the prices rule must still SET price on products.csv keys
+        nodes = [{"label": "Product", "unique_column_name": "id", "source_file": "products.csv", "properties": ["id", "name"]},
+                 {"label": "Product", "unique_column_name": "id", "source_file": "prices.csv", "properties": ["id", "price"]},
+                 {"label": "B", "unique_column_name": "id"}, {"label": "B", "unique_column_name": "code"},
+                 {"label": "C", "unique_column_name": "id"}]
+        self.assertEqual(fast_load_labels(nodes), {"C"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,586 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+from neo4j.exceptions import TransientError, CypherSyntaxError, ServiceUnavailable
+from services.graph_service import GraphService, AsyncGraphService, QueryResultCache, QueryStats, fingerprint_cypher
+from services.graph_service import SlowQueryLog, summarize_profile, validation_key
+import json
+import os
+import tempfile
+from graph_service_case import GraphServiceTestCase, fake_result
+
+
+class TestWriteBatches(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        # Managed transaction: call the work function with a fake tx
+        self.tx = MagicMock()
+        self.tx.run.return_value.consume.return_value.counters = MagicMock(
+            nodes_created=2, relationships_created=1, properties_set=3,
+            nodes_deleted=0, relationships_deleted=0, labels_added=2, labels_removed=0,
+            indexes_added=0, indexes_removed=0, constraints_added=0, constraints_removed=0,
+        )
+        self.session.execute_write.side_effect = lambda fn, *args: fn(self.tx, *args)
+
+    def test_groups_rows_into_batches(self):
+        rows = ({"id": i} for i in range(5))  # generator, never materialized up front
+        with patch.object(self.service, 'connect', return_value=True):
+            totals = self.service.write_batches("MERGE (n:Item {id: row.id})", rows, batch_size=2)
+
+        self.assertEqual(totals["batches"], 3)
+        self.assertEqual(totals["rows"], 5)
+        self.assertEqual(totals["nodes_created"], 6)
+        self.assertEqual(totals["relationships_created"], 3)
+
+        query, params = self.tx.run.call_args_list[0][0]
+        self.assertTrue(query.startswith("UNWIND $rows AS row"))
+        self.assertEqual(params["rows"], [{"id": 0}, {"id": 1}])
+        self.assertEqual(self.tx.run.call_args_list[-1][0][1]["rows"], [{"id": 4}])
+
+    def test_keeps_explicit_unwind_and_extra_params(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.service.write_batches("UNWIND $rows AS r MERGE (n:Item {id: r.id}) SET n.src = $src",
+                                       [{"id": 1}], params={"src": "a.csv"})
+
+        query, params = self.tx.run.call_args[0]
+        self.assertTrue(query.startswith("UNWIND $rows AS r"))
+        self.assertEqual(params, {"src": "a.csv", "rows": [{"id": 1}]})
+
+    def test_failure_reports_partial_progress(self):
+        calls = {"n": 0}
+        def flaky(fn, *args):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise Exception("boom")
+            return fn(self.tx, *args)
+        self.session.execute_write.side_effect = flaky
+
+        with patch.object(self.service, 'connect', return_value=True):
+            result = self.service.write_batches("MERGE (n:Item {id: row.id})", [{"id": i} for i in range(4)], batch_size=2)
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["rows"], 2)
+        self.assertEqual(result["batches"], 1)
+
+
+class TestManagedTransactions(GraphServiceTestCase):
+    def test_driver_owns_transaction_retries(self):
+        self.service.driver = None
+        self.service.max_transaction_retry_time = 12.0
+        with patch('services.graph_service.GraphDatabase.driver') as driver:
+            self.assertTrue(self.service.connect())
+        self.assertEqual(driver.call_args.kwargs["max_transaction_retry_time"], 12.0)
+
+    def test_errors_left_after_driver_retries_are_reported_once(self):
+        self.session.execute_write.side_effect = TransientError("DeadlockDetected")
+        with patch.object(self.service, 'connect', return_value=True):
+            result = self.service.execute_write("MERGE (n:A {id: 1})")
+
+        self.assertEqual(result["status"], "error")
+        # No second retry loop around the driver's own
+        self.assertEqual(self.session.execute_write.call_count, 1)
+
+    def test_non_transient_errors_fail_fast(self):
+        self.session.execute_write.side_effect = CypherSyntaxError("bad")
+        with patch.object(self.service, 'connect', return_value=True):
+            result = self.service.execute_write("MERGE n")
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(self.session.execute_write.call_count, 1)
+
+
+class TestQueryCache(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        record = MagicMock()
+        record.data.return_value = {"c": 42}
+        self.session.run.side_effect = lambda *a, **k: fake_result([record])
+
+    def test_cached_reads_skip_the_database(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            first = self.service.send_query("MATCH (n) RETURN count(n) as c", cache=True)
+            second = self.service.send_query("MATCH (n)\n   RETURN count(n) as c", cache=True)
+        self.assertEqual(first, second)
+        self.assertEqual(self.session.run.call_count, 1)
+
+    def test_params_are_part_of_the_key(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.service.send_query("MATCH (n {id: $id}) RETURN n", {"id": 1}, cache=True)
+            self.service.send_query("MATCH (n {id: $id}) RETURN n", {"id": 2}, cache=True)
+        self.assertEqual(self.session.run.call_count, 2)
+
+    def test_writes_invalidate(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.service.send_query("MATCH (n) RETURN count(n) as c", cache=True)
+            self.service.send_query("MERGE (n:A {id: 1})")
+            self.service.send_query("MATCH (n) RETURN count(n) as c", cache=True)
+        self.assertEqual(self.session.run.call_count, 3)
+
+    def test_limited_reads_are_cached_only_when_complete(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.service.send_query("MATCH (n) RETURN n", cache=True, max_records=1)
+            self.service.send_query("MATCH (n) RETURN n", cache=True, max_records=1)
+            self.assertEqual(self.session.run.call_count, 2)  # may have been cut off
+
+            full = self.service.send_query("MATCH (n) RETURN n", cache=True, max_records=2)
+            self.assertEqual(self.service.send_query("MATCH (n) RETURN n", cache=True, max_records=2), full)
+        self.assertEqual(self.session.run.call_count, 3)
+
+    def test_failed_or_disconnected_reads_are_not_cached(self):
+        self.session.run.side_effect = ServiceUnavailable("down")
+        with patch.object(self.service, 'connect', return_value=True):
+            self.assertEqual(self.service.send_query("MATCH (n) RETURN n", cache=True)["status"], "error")
+        with patch.object(self.service, 'connect', return_value=False):
+            self.assertIsNone(self.service.send_query("MATCH (n) RETURN n", cache=True))
+        self.assertEqual(len(self.service.query_cache), 0)
+
+    def test_lru_eviction_and_stale_generation(self):
+        cache = QueryResultCache(max_entries=2)
+        cache.put("RETURN 1", None, [1])
+        cache.put("RETURN 2", None, [2])
+        cache.get("RETURN 1")
+        cache.put("RETURN 3", None, [3])
+        self.assertIsNone(cache.get("RETURN 2"))
+        self.assertEqual(cache.get("RETURN 1"), [1])
+
+        generation = cache.generation
+        cache.invalidate()
+        cache.put("RETURN 4", None, [4], generation)  # computed before the write
+        self.assertIsNone(cache.get("RETURN 4"))
+
+
+class TestValidationCache(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.plan = {"operatorType": "ProduceResults@neo4j", "args": {"EstimatedRows": 12.0}, "children": []}
+        self.session.run.return_value.consume.return_value.plan = self.plan
+
+    def test_fingerprint_strips_literals_and_whitespace(self):
+        a = fingerprint_cypher("MATCH (p:Product {name: 'Pizza'})\n  RETURN p LIMIT 5")
+        b = fingerprint_cypher('MATCH (p:Product {name: "Salad"}) RETURN p   LIMIT 20')
+        self.assertEqual(a, b)
+        self.assertEqual(a, "MATCH (p:Product {name: ?}) RETURN p LIMIT ?")
+        # Identifiers containing digits are not literals
+        self.assertIn("labels(n)[?]", fingerprint_cypher("RETURN labels(n)[0], n.prop2"))
+        self.assertIn("n.prop2", fingerprint_cypher("RETURN n.prop2"))
+
+    def test_repeated_validation_uses_cache_and_keeps_plan(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.assertEqual(self.service.validate_cypher("MATCH (n:A) RETURN n LIMIT 5"), (True, None))
+            valid, error, plan = self.service.validate_cypher("MATCH (n:A) RETURN n LIMIT 20", return_plan=True)
+        self.assertTrue(valid)
+        self.assertEqual(plan["args"]["EstimatedRows"], 12.0)
+        self.assertEqual(self.session.run.call_count, 1)
+
+    def test_only_statement_errors_are_cached(self):
+        self.session.run.side_effect = [ServiceUnavailable("connection lost"), self.session.run.return_value,
+                                        CypherSyntaxError("bad")]
+        with patch.object(self.service, 'connect', return_value=True):
+            self.assertEqual(self.service.validate_cypher("MATCH (n:A) RETURN n"), (False, "connection lost"))
+            self.assertEqual(self.service.validate_cypher("MATCH (n:A) RETURN n"), (True, None))
+            self.assertFalse(self.service.validate_cypher("MATCH n RETURN n")[0])
+            self.assertFalse(self.service.validate_cypher("MATCH n RETURN n")[0])
+        self.assertEqual(self.session.run.call_count, 3)
+
+    def test_sign_and_parameter_names_are_part_of_the_key(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.service.validate_cypher("MATCH (n:A) RETURN n LIMIT 5")
+            self.service.validate_cypher("MATCH (n:A) RETURN n LIMIT -5")
+            self.service.validate_cypher("MATCH (n:A {id: $id}) RETURN n", {"id": 1})
+            self.service.validate_cypher("MATCH (n:A {id: $id}) RETURN n", {"id": 2})
+            self.service.validate_cypher("MATCH (n:A {id: $id}) RETURN n")
+        self.assertEqual(self.session.run.call_count, 4)
+
+    def test_literal_types_are_part_of_the_key(self):
+        self.assertNotEqual(validation_key("RETURN 1 LIMIT 10"), validation_key("RETURN 1 LIMIT 1.5"))
+        self.assertNotEqual(validation_key("RETURN 1 LIMIT 5"), validation_key("RETURN 1 LIMIT '5'"))
+        self.assertEqual(validation_key("MATCH (n {name: 'a'}) RETURN n LIMIT 5"),
+                         validation_key('MATCH (n {name: "b"})  RETURN n LIMIT 20'))
+
+    def test_failures_are_cached_for_the_exact_text_only(self):
+        self.session.run.side_effect = [CypherSyntaxError("LIMIT must be an integer"), self.session.run.return_value]
+        with patch.object(self.service, 'connect', return_value=True):
+            self.assertFalse(self.service.validate_cypher("MATCH (n:A) RETURN n LIMIT 2.0")[0])
+            self.assertFalse(self.service.validate_cypher("MATCH (n:A)  RETURN n LIMIT 2.0")[0])
+            # A retry that only fixes the literal is checked again
+            self.assertEqual(self.service.validate_cypher("MATCH (n:A) RETURN n LIMIT 2"), (True, None))
+        self.assertEqual(self.session.run.call_count, 2)
+
+    def test_schema_change_clears_validations(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.service.validate_cypher("MATCH (n:A) RETURN n")
+            self.service.send_query("CREATE INDEX a_name IF NOT EXISTS FOR (n:A) ON (n.name)")
+            self.service.validate_cypher("MATCH (n:A) RETURN n")
+        explains = [c for c in self.session.run.call_args_list if c[0][0].startswith("EXPLAIN")]
+        self.assertEqual(len(explains), 2)
+
+    def test_data_writes_keep_validations(self):
+        with patch.object(self.service, 'connect', return_value=True):
+            self.service.validate_cypher("MATCH (n:A) RETURN n")
+            self.service.send_query("MERGE (n:A {id: 1})")
+            self.service.validate_cypher("MATCH (n:A) RETURN n")
+        explains = [c for c in self.session.run.call_args_list if c[0][0].startswith("EXPLAIN")]
+        self.assertEqual(len(explains), 1)
+
+
+class TestQueryStats(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service.query_stats = QueryStats()
+
+    def test_aggregates_per_fingerprint(self):
+        timings = iter([(1, 1), (2, 2), (40, 60)])
+        def run(cypher, params=None):
+            available, consumed = next(timings)
+            counters = MagicMock(nodes_created=1, **{f: 0 for f in (
+                "nodes_deleted", "relationships_created", "relationships_deleted", "properties_set",
+                "labels_added", "labels_removed", "indexes_added", "indexes_removed",
+                "constraints_added", "constraints_removed")})
+            return fake_result([], result_available_after=available, result_consumed_after=consumed,
+                               query_type="w", counters=counters)
+        self.session.run.side_effect = run
+
+        with patch.object(self.service, 'connect', return_value=True):
+            for name in ("A", "B", "C"):
+                self.service.send_query(f"MERGE (n:Item {{name: '{name}'}})")
+
+        stats = self.service.get_query_stats()
+        self.assertEqual(len(stats), 1)
+        entry = stats[0]
+        self.assertEqual(entry["count"], 3)
+        self.assertEqual(entry["query_type"], "w")
+        self.assertEqual(entry["total_ms"], 106)
+        self.assertEqual(entry["p50_ms"], 4)
+        self.assertEqual(entry["p99_ms"], 100)
+        self.assertEqual(entry["counters"], {"nodes_created": 3})
+        self.assertEqual(entry["rows_touched"], 3)
+
+    def test_dump_writes_json(self):
+        import json, tempfile, os
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.service.dump_query_stats(tmp)
+            self.assertEqual(path, os.path.join(tmp, "query_stats.json"))
+            with open(path) as f:
+                self.assertEqual(json.load(f)["queries"], [])
+
+
+class TestNukeDatabase(unittest.TestCase):
+    def setUp(self):
+        self.service = GraphService()
+
+    def test_deletes_relationships_then_nodes_in_chunks(self):
+        responses = {
+            "MATCH ()-[r]->() RETURN count(r) AS c": iter([[{"c": 25}]]),
+            "MATCH (n) RETURN count(n) AS c": iter([[{"c": 12}]]),
+        }
+        deletes = {"relationships": iter([10, 10, 5]), "nodes": iter([10, 2])}
+        calls = []
+
+        def fake_send(cypher, params=None):
+            calls.append(cypher)
+            if cypher in responses:
+                return next(responses[cypher])
+            self.assertIn("IN TRANSACTIONS OF $batch_size ROWS", cypher)
+            self.assertEqual(params, {"batch_size": 1, "chunk": 10})
+            phase = "relationships" if "DELETE r" in cypher else "nodes"
+            return [{"deleted": next(deletes[phase])}]
+
+        progress = []
+        with patch.object(self.service, 'send_query', side_effect=fake_send):
+            report = self.service.nuke_database(batch_size=1, progress_callback=lambda *a: progress.append(a))
+
+        self.assertEqual(report, {"relationships_deleted": 25, "nodes_deleted": 12})
+        self.assertEqual(progress[0], ("relationships", 10, 25))
+        self.assertEqual(progress[-1], ("nodes", 12, 12))
+        first_node_call = next(i for i, c in enumerate(calls) if "DETACH DELETE n" in c)
+        self.assertTrue(all("DETACH" not in c for c in calls[:first_node_call]))
+
+    def test_recreate_store_fast_path(self):
+        container = MagicMock()
+        container.recreate_store.return_value = True
+        with patch.object(self.service, 'connect', return_value=True), \
+             patch.object(self.service, 'send_query') as mock_send:
+            report = self.service.nuke_database(container_service=container)
+        self.assertTrue(report["store_recreated"])
+        mock_send.assert_not_called()
+
+    def test_recreate_store_falls_back_to_batched_delete(self):
+        container = MagicMock()
+        container.recreate_store.return_value = False
+        with patch.object(self.service, 'send_query', return_value=[{"c": 0}]):
+            report = self.service.nuke_database(container_service=container)
+        self.assertEqual(report, {"relationships_deleted": 0, "nodes_deleted": 0})
+
+
+class TestQueryColumns(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        result = fake_result([("Product", 3), ("Ingredient", 7)])
+        result.keys.return_value = ["label", "degree"]
+        self.session.run.return_value = result
+
+    def test_numpy_columns(self):
+        with patch.object(self.service, 'connect', return_value=True), \
+             patch('services.graph_service.pd', None):
+            cols = self.service.query_columns("MATCH (n) RETURN labels(n)[0] AS label, count{(n)--()} AS degree", fetch_size=500)
+        self.assertEqual(list(cols["label"]), ["Product", "Ingredient"])
+        self.assertEqual(cols["degree"].sum(), 10)
+        self.mock_driver.session.assert_called_with(fetch_size=500)
+
+    def test_list_and_mixed_columns_keep_their_values(self):
+        result = fake_result([(["Product", "Item"], 1, None), (["Ingredient"], "a", 2), ([], 2.5, 3)])
+        result.keys.return_value = ["labels", "mixed", "nullable"]
+        self.session.run.return_value = result
+        with patch.object(self.service, 'connect', return_value=True), \
+             patch('services.graph_service.pd', None):
+            cols = self.service.query_columns("MATCH (n) RETURN labels(n) AS labels, n.x AS mixed, n.y AS nullable")
+        self.assertEqual(cols["labels"].dtype, object)
+        self.assertEqual(list(cols["labels"]), [["Product", "Item"], ["Ingredient"], []])
+        self.assertEqual(list(cols["mixed"]), [1, "a", 2.5])
+        self.assertEqual(list(cols["nullable"]), [None, 2, 3])
+
+    def test_plain_lists_without_numpy(self):
+        with patch.object(self.service, 'connect', return_value=True), \
+             patch('services.graph_service.pd', None), patch('services.graph_service.np', None):
+            cols = self.service.query_columns("RETURN 1")
+        self.assertEqual(cols, {"label": ["Product", "Ingredient"], "degree": [3, 7]})
+
+    def test_frame_requires_pandas(self):
+        with patch.object(self.service, 'connect', return_value=True), \
+             patch('services.graph_service.pd', None):
+            with self.assertRaises(ImportError):
+                self.service.query_columns("RETURN 1", as_frame=True)
+
+
+class TestSessionScope(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        record = MagicMock()
+        record.data.return_value = {"c": 1}
+        self.session.run.side_effect = lambda *a, **k: fake_result([record])
+        self.tx = self.session.begin_transaction.return_value
+        self.tx.run.side_effect = lambda *a, **k: fake_result([record])
+
+    def test_statements_share_one_session(self):
+        from neo4j import READ_ACCESS
+        with patch.object(self.service, 'connect', return_value=True):
+            with self.service.session_scope(read_only=True) as s:
+                self.assertEqual(s.send_query("MATCH (n) RETURN count(n) AS c"), [{"c": 1}])
+                s.send_query("MATCH (n:A) RETURN count(n) AS c")
+                s.send_query("MATCH (n:B) RETURN count(n) AS c")
+        self.mock_driver.session.assert_called_once_with(default_access_mode=READ_ACCESS)
+        self.assertEqual(self.session.run.call_count, 3)
+
+    def test_transaction_commits_and_invalidates_once(self):
+        self.service.query_cache.put("MATCH (n) RETURN n", None, [1])
+        with patch.object(self.service, 'connect', return_value=True):
+            with self.service.transaction_scope() as tx:
+                tx.send_query("MERGE (n:A {id: 1})")
+                # Uncommitted writes must not clear or feed the shared cache yet
+                self.assertEqual(len(self.service.query_cache), 1)
+                tx.send_query("MATCH (n) RETURN count(n) AS c", cache=True)
+        self.tx.commit.assert_called_once()
+        self.tx.rollback.assert_not_called()
+        self.assertEqual(len(self.service.query_cache), 0)
+
+    def test_transaction_rolls_back_on_failure(self):
+        self.tx.run.side_effect = Exception("constraint violation")
+        with patch.object(self.service, 'connect', return_value=True):
+            with self.service.transaction_scope() as tx:
+                result = tx.send_query("CREATE (n:A {id: 1})")
+        self.assertEqual(result["status"], "error")
+        self.tx.rollback.assert_called_once()
+        self.tx.commit.assert_not_called()
+
+    def test_unreachable_database_yields_none(self):
+        with patch.object(self.service, 'connect', return_value=False):
+            with self.service.session_scope() as s:
+                self.assertIsNone(s)
+
+
+class TestStreamQuery(GraphServiceTestCase):
+    def _records(self, n):
+        def gen():
+            for i in range(n):
+                record = MagicMock()
+                record.data.return_value = {"i": i}
+                yield record
+        records = gen()
+        return fake_result(records)
+
+    def test_yields_lazily_with_fetch_size(self):
+        self.session.run.return_value = self._records(3)
+        with patch.object(self.service, 'connect', return_value=True):
+            stream = self.service.stream_query("MATCH (n) RETURN n", fetch_size=50)
+            self.mock_driver.session.assert_not_called()  # nothing runs until iterated
+            self.assertEqual(list(stream), [{"i": 0}, {"i": 1}, {"i": 2}])
+        self.mock_driver.session.assert_called_once_with(fetch_size=50)
+
+    def test_early_close_releases_session(self):
+        self.session.run.return_value = self._records(1000)
+        with patch.object(self.service, 'connect', return_value=True):
+            stream = self.service.stream_query("MATCH (n) RETURN n")
+            self.assertEqual(next(stream), {"i": 0})
+            stream.close()
+        self.mock_driver.session.return_value.__exit__.assert_called_once()
+
+
+class TestExecuteImport(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        counters = MagicMock(nodes_created=3, relationships_created=0, properties_set=6)
+        record = MagicMock()
+        record.data.return_value = {"rows": 3}
+        self.result = fake_result([record], counters=counters)
+
+    def test_periodic_commit_runs_auto_commit(self):
+        self.session.run.return_value = self.result
+        with patch.object(self.service, 'connect', return_value=True):
+            out = self.service.execute_import("LOAD CSV FROM $u AS row CALL (row) { CREATE (:A) } IN TRANSACTIONS OF $batch_size ROWS RETURN count(*) AS rows")
+        self.assertEqual(out["records"], [{"rows": 3}])
+        self.assertEqual(out["counters"]["nodes_created"], 3)
+        self.session.execute_write.assert_not_called()
+
+    def test_plain_import_runs_in_managed_transaction(self):
+        tx = MagicMock()
+        tx.run.return_value = self.result
+        self.session.execute_write.side_effect = lambda work: work(tx)
+        with patch.object(self.service, 'connect', return_value=True):
+            out = self.service.execute_import("LOAD CSV FROM $u AS row CREATE (:A)")
+        self.assertEqual(out["counters"]["properties_set"], 6)
+        self.session.run.assert_not_called()
+
+
+class TestSlowQueryLog(unittest.TestCase):
+    def setUp(self):
+        self.debug_dir = tempfile.mkdtemp()
+        self.log = SlowQueryLog()
+        self.log.configure(100, self.debug_dir)
+
+    def entries(self):
+        path = os.path.join(self.debug_dir, "slow_queries.jsonl")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_only_statements_over_threshold_are_logged(self):
+        self.log.observe("RETURN 1", None, MagicMock(result_available_after=5, result_consumed_after=5, query_type="r"))
+        self.log.observe("MATCH (n) WHERE n.id = 7 RETURN n", {"id": 7},
+                         MagicMock(result_available_after=80, result_consumed_after=40, query_type="r"))
+
+        entries = self.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["runtime_ms"], 120)
+        self.assertEqual(entries[0]["params"], {"id": 7})
+        self.assertEqual(entries[0]["fingerprint"], fingerprint_cypher("MATCH (n) WHERE n.id = 7 RETURN n"))
+
+    def test_batches_are_summarized_and_only_reads_are_profiled(self):
+        self.log.profile = True
+        profiler = MagicMock(return_value={"operatorType": "ProduceResults", "dbHits": 0, "rows": 3, "args": {},
+                                           "children": [{"operatorType": "AllNodesScan", "dbHits": 40, "rows": 3, "args": {}}]})
+        slow = dict(result_available_after=500, result_consumed_after=0)
+
+        self.log.observe("UNWIND $rows AS row CREATE (:N)", {"rows": [{"id": i} for i in range(50)]},
+                         MagicMock(query_type="w", **slow), profiler=profiler)
+        self.log.observe("MATCH (n) RETURN n", None, MagicMock(query_type="r", **slow), profiler=profiler)
+
+        write, read = self.entries()
+        self.assertTrue(write["params"]["rows"].startswith("<50 items"))
+        self.assertNotIn("profile", write)
+        self.assertEqual(read["profile"]["total_db_hits"], 40)
+        self.assertEqual([o["operator"] for o in read["profile"]["operators"]], ["ProduceResults", "AllNodesScan"])
+        profiler.assert_called_once_with("MATCH (n) RETURN n", None)
+
+    def test_managed_retries_are_observed_once(self):
+        service = GraphService()
+        service.driver = MagicMock()
+        service.slow_query_log = MagicMock()
+        session = service.driver.session.return_value.__enter__.return_value
+        tx = MagicMock()
+        tx.run.side_effect = lambda *a: fake_result([])
+
+        def retrying_write(work, *args):
+            work(tx, *args)  # first attempt, rolled back by the driver
+            return work(tx, *args)
+        session.execute_write.side_effect = retrying_write
+        with patch.object(service, 'connect', return_value=True):
+            service.execute_write("MERGE (n:A {id: 1})")
+            service.execute_import("MERGE (n:A {id: 1})")
+        self.assertEqual(tx.run.call_count, 4)
+        self.assertEqual(service.slow_query_log.observe.call_count, 2)
+
+    def test_write_statements_are_never_profiled(self):
+        self.log.profile = True
+        profiler = MagicMock()
+        # The statement text is checked too, not only the reported query type
+        self.log.observe("MATCH (n:Gone) DETACH DELETE n", None,
+                         MagicMock(query_type="r", result_available_after=500, result_consumed_after=0),
+                         profiler=profiler)
+        profiler.assert_not_called()
+
+    def test_service_routes_statements_through_the_log(self):
+        service = GraphService()
+        service.driver = MagicMock()
+        service.slow_query_log = MagicMock()
+        service.driver.session.return_value.__enter__.return_value.run.return_value = fake_result([])
+        with patch.object(service, 'connect', return_value=True):
+            service.send_query("RETURN $x", {"x": 1})
+        service.slow_query_log.observe.assert_called_once()
+        self.assertEqual(service.slow_query_log.observe.call_args[0][:2], ("RETURN $x", {"x": 1}))
+
+    def test_summarize_profile_without_plan(self):
+        self.assertEqual(summarize_profile(None), {"total_db_hits": 0, "operators": []})
+
+
+class TestAsyncGraphService(unittest.IsolatedAsyncioTestCase):
+    async def test_send_queries_overlaps_within_limit(self):
+        service = AsyncGraphService(max_connection_pool_size=4)
+        in_flight = {"now": 0, "peak": 0}
+
+        async def fake_send(cypher, params=None):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return [{"q": cypher, "p": params}]
+
+        with patch.object(service, 'connect', AsyncMock(return_value=True)), \
+             patch.object(service, 'send_query', side_effect=fake_send):
+            queries = [f"RETURN {i}" for i in range(6)] + [("RETURN $x", {"x": 1})]
+            results = await service.send_queries(queries, max_concurrency=3)
+
+        self.assertEqual(results[0], [{"q": "RETURN 0", "p": None}])
+        self.assertEqual(results[-1], [{"q": "RETURN $x", "p": {"x": 1}}])
+        self.assertEqual(in_flight["peak"], 3)
+
+    async def test_send_queries_without_connection(self):
+        service = AsyncGraphService()
+        with patch.object(service, 'connect', AsyncMock(return_value=False)):
+            self.assertEqual(await service.send_queries(["RETURN 1", "RETURN 2"]), [None, None])
+
+
+    async def test_async_writes_invalidate_the_blocking_cache(self):
+        sync_service = GraphService()
+        sync_service.query_cache.put("MATCH (n) RETURN n", None, [{"n": 1}])
+        service = AsyncGraphService(sync_service=sync_service)
+        session = MagicMock(execute_write=AsyncMock(return_value=MagicMock(counters=None)))
+        service.driver = MagicMock()
+        service.driver.session.return_value.__aenter__.return_value = session
+        with patch.object(service, 'connect', AsyncMock(return_value=True)):
+            await service.write_batches("MERGE (n:A {id: row.id})", [{"id": 1}])
+        self.assertIsNone(sync_service.query_cache.get("MATCH (n) RETURN n"))
+
+    async def test_reconnect_on_new_loop_closes_previous_driver(self):
+        service = AsyncGraphService()
+        stale = MagicMock(close=AsyncMock())
+        service.driver, service._loop = stale, object()
+        fresh = MagicMock(verify_connectivity=AsyncMock())
+        with patch('services.graph_service.AsyncGraphDatabase.driver', return_value=fresh):
+            self.assertTrue(await service.connect())
+        stale.close.assert_awaited_once()
+        self.assertIs(service.driver, fresh)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from core.llm_query_cache import LLMQueryCache
+from builder_case import BuilderTestCase
+
+
+RULE = {"label": "Product", "source_file": "products.csv", "unique_column_name": "id"}
+
+
+class TestLLMQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+
+    def test_key_changes_with_rule_task_and_model(self):
+        key = LLMQueryCache.make_key(RULE, "Import Nodes", "m1")
+        self.assertEqual(key, LLMQueryCache.make_key(dict(reversed(list(RULE.items()))), "Import Nodes", "m1"))
+        self.assertNotEqual(key, LLMQueryCache.make_key({**RULE, "unique_column_name": "sku"}, "Import Nodes", "m1"))
+        self.assertNotEqual(key, LLMQueryCache.make_key(RULE, "Import Nodes", "m2"))
+
+    def test_entries_persist_and_replace_stale_versions(self):
+        cache = LLMQueryCache(self.base)
+        cache.put("k1", "Q1", "m1", "Import Nodes", "node:Product")
+        cache.put("k2", "Q2", "m1", "Import Nodes", "node:Product")
+        cache.mark_success("k2")
+
+        reloaded = LLMQueryCache(self.base)
+        self.assertIsNone(reloaded.get("k1"))
+        self.assertEqual(reloaded.get("k2")["query"], "Q2")
+        self.assertEqual(reloaded.get("k2")["success_count"], 1)
+        self.assertIsNotNone(reloaded.get("k2")["last_success"])
+
+
+class TestBuilderUsesCache(BuilderTestCase):
+
+    def test_second_build_reuses_generated_query(self):
+        with patch.object(self.builder, '_generate', return_value=("```cypher\nLOAD CSV ...\n```", "gemini-x")) as gen:
+            first = self.builder._generate_llm_query("Import Nodes with Label Product", RULE)
+            second = self.builder._generate_llm_query("Import Nodes with Label Product", RULE)
+        self.assertEqual(first, second)
+        self.assertEqual(gen.call_count, 1)
+
+    def test_force_regenerate_by_label(self):
+        self.builder.regenerate_llm = {"Product"}
+        with patch.object(self.builder, '_generate', return_value=("Q", "gemini-x")) as gen:
+            self.builder._generate_llm_query("Import Nodes with Label Product", RULE)
+            self.builder._generate_llm_query("Import Nodes with Label Product", RULE)
+        self.assertEqual(gen.call_count, 2)
+
+
+    def test_llm_strategy_generates_rules_concurrently(self):
+        self.builder.global_strategy = 'L'
+        self.builder.llm_concurrency = 3
+        nodes = [{"label": f"L{i}", "source_file": f"f{i}.csv", "unique_column_name": "id"} for i in range(3)]
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def generate(prompt, function_name=None):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+            return "MERGE (n:X)", "gemini-x"
+
+        with patch.object(self.builder, '_generate', side_effect=generate) as gen:
+            self.builder.prefetch_llm_queries(nodes, [])
+            queries = [self.builder._llm_query(self.builder._llm_task(n), n) for n in nodes]
+        self.assertEqual(queries, ["MERGE (n:X)"] * 3)
+        self.assertEqual(gen.call_count, 3)
+        self.assertEqual(peak[0], 3)
+
+
+    def test_failed_prepare_cancels_pending_generations(self):
+        self.builder.global_strategy = 'L'
+        self.builder.llm_concurrency = 1
+        nodes = [{"label": f"L{i}", "source_file": f"f{i}.csv", "unique_column_name": "id"} for i in range(3)]
+        release = threading.Event()
+
+        def generate(prompt, function_name=None):
+            release.wait(1)
+            return "MERGE (n:X)", "gemini-x"
+
+        with patch.object(self.builder, '_generate', side_effect=generate) as gen, \
+             patch.object(self.builder, 'prepare_node_import', side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.builder.prepare_imports(nodes, [])
+            release.set()
+            time.sleep(0.1)
+        # At most the generation already running when the prepare failed
+        self.assertLessEqual(gen.call_count, 1)
+        self.assertEqual(self.builder._llm_futures, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from core.query_audit import audit_plan, scanned_keys
+
+
+def op(name, children=(), rows=None, details=None):
+    args = {}
+    if rows is not None:
+        args["EstimatedRows"] = rows
+    if details is not None:
+        args["Details"] = details
+    return {"operatorType": f"{name}@neo4j", "args": args, "children": list(children)}
+
+
+class TestQueryAudit(unittest.TestCase):
+
+    def test_index_backed_merge_is_low_risk(self):
+        plan = op("ProduceResults", [op("Merge", [op("NodeUniqueIndexSeek", rows=1.0, details="UNIQUE n:Product(id)"),
+                                                  op("LoadCSV", rows=1000.0)])], rows=1000.0)
+        self.assertEqual(audit_plan(plan, {("Product", "id")}),
+                         {"estimated_rows": 1000.0, "eager": 0, "missing_indexes": [], "risk": "LOW"})
+
+    def test_label_scans_and_eager_are_high_risk(self):
+        scan = op("Filter", [op("NodeByLabelScan", rows=50000.0, details="target:Ingredient")],
+                  details="target.name = row[$target_column]")
+        plan = op("ProduceResults", [op("EagerAggregation", [op("Apply", [op("LoadCSV", rows=10.0), scan])])])
+
+        self.assertEqual(scanned_keys(plan), {("Ingredient", "name")})
+        audit = audit_plan(plan, {("Ingredient", "ingredients")})
+        self.assertEqual(audit["risk"], "HIGH")
+        self.assertEqual(audit["eager"], 1)
+        self.assertEqual(audit["missing_indexes"], ["Ingredient.name"])
+        self.assertEqual(audit["estimated_rows"], 50000.0)
+
+    def test_planned_constraint_covers_scan_and_large_estimates_are_medium(self):
+        scan = op("Filter", [op("NodeByLabelScan", details="n:Product")], details="n.id = row[$key_column]")
+        plan = op("ProduceResults", [scan], rows=2_000_000.0)
+        self.assertEqual(audit_plan(plan, {("Product", "id")})["risk"], "MEDIUM")
+        self.assertEqual(audit_plan(None)["risk"], "LOW")
+
+
+if __name__ == '__main__':
+    unittest.main()
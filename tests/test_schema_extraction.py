@@ -21,6 +21,20 @@ class TestSchemaExtraction(unittest.TestCase):
                 # In our code, we try schema, if it returns "value", we use it.
                 # If send_query returns list of dicts.
     
+    def test_schema_hides_provenance_properties(self):
+        meta = {"Product": {"type": "node", "properties": {"id": {"type": "STRING"}, "_kg_rules": {"type": "LIST"}},
+                            "relationships": {"CONTAINS": {"properties": {"_kg_rules": {"type": "LIST"}}}}}}
+        with patch.object(self.service, 'connect', return_value=True), \
+             patch.object(self.service, 'send_query', return_value=[{"value": meta}]):
+            schema = self.service.get_schema_visualization()
+        self.assertEqual(schema["Product"]["properties"], {"id": {"type": "STRING"}})
+        self.assertEqual(schema["Product"]["relationships"]["CONTAINS"]["properties"], {})
+
+        rows = [{"label": "Product", "property": "id"}, {"label": "Product", "property": "_kg_rules"}]
+        with patch.object(self.service, 'connect', return_value=True), \
+             patch.object(self.service, 'send_query', side_effect=[[], rows]):
+            self.assertEqual(self.service.get_schema_visualization(), rows[:1])
+
     def test_validate_cypher_valid(self):
         with patch.object(self.service, 'connect', return_value=True):
             session_mock = MagicMock()
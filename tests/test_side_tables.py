@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from core.side_tables import normalize_column, prune_side_tables, side_table_dir, split_values
+from builder_case import BuilderTestCase
+
+RECIPES = "id,title,ingredients\nr1,Soup,\" salt , water\"\nr2,Tea,\"water,,tea\"\nr2,Tea,water\n"
+
+
+class TestSideTables(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.dir, "recipes.csv")
+        with open(self.source, "w") as f:
+            f.write(RECIPES)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read().splitlines()
+
+    def test_split_values_matches_cypher_trim(self):
+        self.assertEqual(split_values(" salt , ,water", ","), ["salt", "water"])
+        self.assertEqual(split_values(None, ","), [])
+
+    def test_values_and_links_are_deduplicated_and_cached(self):
+        out_dir = side_table_dir(self.dir, "ab" * 32)
+        values, links, cached = normalize_column(self.source, "ingredients", out_dir, "name", ["id"])
+        self.assertFalse(cached)
+        self.assertEqual(self.read(values), ["name", "salt", "water", "tea"])
+        self.assertEqual(self.read(links["id"]), ["id,name", "r1,salt", "r1,water", "r2,water", "r2,tea"])
+
+        self.assertTrue(normalize_column(self.source, "ingredients", out_dir, "name", ["id"])[2])
+        prune_side_tables(self.dir, keep=[])
+        self.assertFalse(os.path.exists(out_dir))
+
+
+class TestBuilderNormalization(BuilderTestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.ctx.data_dir)
+        with open(os.path.join(self.ctx.data_dir, "recipes.csv"), "w") as f:
+            f.write(RECIPES)
+
+    def test_split_rules_read_side_tables(self):
+        ingredient = {"label": "Ingredient", "unique_column_name": "name", "source_file": "recipes.csv",
+                      "transformation_rule": "Split ingredients by comma"}
+        recipe = {"label": "Recipe", "unique_column_name": "id", "source_file": "recipes.csv"}
+        contains = {"relationship_type": "CONTAINS", "from_node_label": "Recipe", "to_node_label": "Ingredient",
+                    "from_node_column": "id", "to_node_column": "ingredients"}
+        self.builder.normalize_sources([recipe, ingredient], [contains])
+
+        query, params = self.builder._get_heuristic_node_query(ingredient, "recipes.csv")
+        self.assertNotIn("split(", query)
+        self.assertTrue(params["file_url"].startswith("file:///.kg_normalized/"))
+        query, params = self.builder._get_heuristic_relationship_query(contains, "recipes.csv")
+        self.assertEqual(params["target_column"], "name")
+        self.assertTrue(params["file_url"].endswith("recipes.ingredients.name.id.links.csv"))
+        # The recipe rule still reads its own file
+        self.assertEqual(self.builder._get_heuristic_node_query(recipe, "recipes.csv")[1]["file_url"],
+                         "file:///recipes.csv")
+
+    def test_streams_read_side_tables_by_their_stored_path(self):
+        # A relative data directory, as without a context ('data')
+        self.builder.data_dir = os.path.relpath(self.ctx.data_dir)
+        self.builder.ingest_mode = 'stream'
+        ingredient = {"label": "Ingredient", "unique_column_name": "name", "source_file": "recipes.csv",
+                      "transformation_rule": "Split ingredients by comma"}
+        self.builder.normalize_sources([ingredient], [])
+
+        stream = self.builder._heuristic_stream(ingredient, "recipes.csv")
+        self.assertTrue(os.path.exists(stream["path"]), stream["path"])
+        self.assertIn(".kg_normalized", stream["path"])
+
+    def test_sources_keep_their_subdirectory(self):
+        data_dir = self.ctx.data_dir
+        os.makedirs(os.path.join(data_dir, "2024"))
+        with open(os.path.join(data_dir, "2024", "recipes.csv"), "w") as f:
+            f.write(RECIPES)
+
+        self.assertEqual(self.builder._source_path("2024/recipes.csv"), os.path.join(data_dir, "2024", "recipes.csv"))
+        self.assertEqual(self.builder._load_csv_filename("2024/recipes.csv"), "2024/recipes.csv")
+        # Paths that do not resolve inside the data directory fall back to the flat layout
+        self.assertEqual(self.builder._source_path("data/recipes.csv"), os.path.join(data_dir, "recipes.csv"))
+        self.assertEqual(self.builder._load_csv_filename("../recipes.csv"), "recipes.csv")
+
+
+if __name__ == '__main__':
+    unittest.main()